@@ -1,14 +1,28 @@
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import transaction
 from rest_framework import serializers
-from jobs.models import JobApplication, Jobs
+from jobs.candidates import InvalidCursor, decode_cursor
+from jobs.duplicates import find_duplicates, fingerprint_fields
+from jobs.filters import DEFAULT_RADIUS_KM
+from jobs.models import JobApplication, Jobs, Notification, SavedSearch
+from jobs import notifications
+from users.locations import location_gazetteer
 from users.models import Skill, EmployerProfile
+from users.skill_tagger import skill_tagger
+from api.fields import BulkPrimaryKeyRelatedField
+from api.m2m import sync_m2m
 
 
 class JobSerializer(serializers.ModelSerializer):
     """Job Serializer"""
 
-    required_skills = serializers.PrimaryKeyRelatedField(
+    required_skills = BulkPrimaryKeyRelatedField(
         queryset=Skill.objects.all(), many=True
     )
+    # Also require the skills the description names
+    auto_tag_skills = serializers.BooleanField(write_only=True, default=False)
 
     class Meta:
         model = Jobs
@@ -24,26 +38,77 @@ class JobSerializer(serializers.ModelSerializer):
             "experience_level",
             "posted_date",
             "is_active",
+            "auto_tag_skills",
+            "duplicate_of",
         ]
+        read_only_fields = ["duplicate_of"]
+
+    def validate(self, attrs):
+        if self.instance is not None:
+            return attrs
+        fields = fingerprint_fields(attrs["job_title"], attrs["description"])
+        request = self.context.get("request")
+        if request is None:
+            return {**attrs, **fields}
+        # Reject reposts of the employer's own active jobs, flag copies of
+        # other employers' jobs
+        employer_id = (
+            EmployerProfile.objects.filter(user=request.user)
+            .values_list("pk", flat=True)
+            .first()
+        )
+        roots = []
+        for job_id, job_employer_id, duplicate_of_id, _ in find_duplicates(fields):
+            if job_employer_id == employer_id:
+                raise serializers.ValidationError(
+                    f"This job duplicates your active job {job_id}."
+                )
+            roots.append(duplicate_of_id or job_id)
+        return {**attrs, **fields, "duplicate_of_id": min(roots, default=None)}
 
     def create(self, validated_data):
         request = self.context.get("request")
         employer = EmployerProfile.objects.get(user=request.user)
         required_skills = validated_data.pop("required_skills")
-        job = Jobs.objects.create(employer=employer, **validated_data)
-        job.required_skills.set(required_skills)
-        job.save()
+        if validated_data.pop("auto_tag_skills"):
+            required_skills = [
+                *required_skills,
+                *skill_tagger.skill_ids(validated_data["description"]),
+            ]
+        # Job alerts are percolated on commit and need the skills
+        with transaction.atomic():
+            job = Jobs.objects.create(employer=employer, **validated_data)
+            sync_m2m(job, "required_skills", required_skills, current_ids=())
 
         return job
 
     def update(self, instance, validated_data):
-        required_skills = validated_data.pop("required_skills", [])
+        # Skills omitted from a partial update are left untouched
+        required_skills = validated_data.pop("required_skills", None)
+        auto_tag_skills = validated_data.pop("auto_tag_skills", False)
+
+        if "job_title" in validated_data or "description" in validated_data:
+            validated_data.update(
+                fingerprint_fields(
+                    validated_data.get("job_title", instance.job_title),
+                    validated_data.get("description", instance.description),
+                )
+            )
 
         for key, val in validated_data.items():
             setattr(instance, key, val)
 
-        instance.required_skills.set(required_skills)
-        instance.save()
+        if validated_data:
+            instance.save(update_fields=[*validated_data, "updated_at"])
+        if auto_tag_skills:
+            if required_skills is None:
+                required_skills = instance.required_skills.values_list("pk", flat=True)
+            required_skills = [
+                *required_skills,
+                *skill_tagger.skill_ids(instance.description),
+            ]
+        if required_skills is not None:
+            sync_m2m(instance, "required_skills", required_skills)
         return instance
 
 
@@ -59,3 +124,115 @@ class JobApplicationSerializer(serializers.ModelSerializer):
             "status",
             "applied_date",
         ]
+
+
+class JobRecommendationQuerySerializer(serializers.Serializer):
+    limit = serializers.IntegerField(
+        min_value=1, max_value=settings.JOB_RECOMMENDATIONS["TOP_K"], default=20
+    )
+
+
+class SimilarJobsQuerySerializer(serializers.Serializer):
+    limit = serializers.IntegerField(min_value=1, max_value=50, default=10)
+
+
+class CandidateSearchQuerySerializer(serializers.Serializer):
+    cursor = serializers.CharField(required=False)
+    limit = serializers.IntegerField(min_value=1, max_value=100, default=20)
+
+    def validate_cursor(self, value):
+        try:
+            decode_cursor(value)
+        except InvalidCursor as e:
+            raise serializers.ValidationError(str(e))
+        return value
+
+
+class NotificationSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Notification
+        fields = ["id", "message", "is_read", "created_at"]
+
+
+class NotificationQuerySerializer(serializers.Serializer):
+    cursor = serializers.CharField(required=False)
+    limit = serializers.IntegerField(min_value=1, max_value=100, default=20)
+    unread_only = serializers.BooleanField(default=False)
+
+    def validate_cursor(self, value):
+        try:
+            notifications.decode_cursor(value)
+        except InvalidCursor as e:
+            raise serializers.ValidationError(str(e))
+        return value
+
+
+class NotificationReadSerializer(serializers.Serializer):
+    """Notifications to mark read, all unread ones when ``ids`` is omitted"""
+
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=1000,
+        required=False,
+    )
+
+
+class JobFilterSerializer(serializers.Serializer):
+    """Job listing filters, see jobs.filters"""
+
+    location = serializers.CharField(max_length=100, required=False)
+    job_type = serializers.ChoiceField(choices=Jobs.JOB_TYPE_CHOICES, required=False)
+    experience_level = serializers.ChoiceField(
+        choices=Jobs.EXPERIENCE_LEVEL_CHOICES, required=False
+    )
+    min_salary = serializers.DecimalField(
+        max_digits=10, decimal_places=2, min_value=Decimal(0), required=False
+    )
+    skills = BulkPrimaryKeyRelatedField(
+        queryset=Skill.objects.all(), many=True, required=False
+    )
+    near = serializers.CharField(max_length=100, required=False)
+    radius_km = serializers.FloatField(
+        min_value=0, max_value=500, default=DEFAULT_RADIUS_KM
+    )
+
+    def validate_near(self, value):
+        place = location_gazetteer.geocode(value)
+        if place is None:
+            raise serializers.ValidationError("Unknown location.")
+        return place
+
+
+class SavedSearchSerializer(serializers.ModelSerializer):
+    """Saved search with the same criteria as JobFilterSerializer"""
+
+    skills = BulkPrimaryKeyRelatedField(
+        queryset=Skill.objects.all(), many=True, required=False
+    )
+
+    class Meta:
+        model = SavedSearch
+        fields = [
+            "id",
+            "name",
+            "location",
+            "job_type",
+            "experience_level",
+            "min_salary",
+            "skills",
+            "alerts_enabled",
+            "created_at",
+        ]
+        read_only_fields = ["created_at"]
+        extra_kwargs = {"min_salary": {"min_value": Decimal(0)}}
+
+    def validate_location(self, value):
+        return value.strip()
+
+    def create(self, validated_data):
+        skills = validated_data.pop("skills", [])
+        with transaction.atomic():
+            saved_search = SavedSearch.objects.create(**validated_data)
+            saved_search.skills.set(skills)
+        return saved_search
@@ -5,12 +5,51 @@ from . import views
 urlpatterns = [
     # Jobs
     path("job/", views.JobCreateRetrieveView.as_view(), name="job"),
+    path(
+        "job/recommended/",
+        views.JobRecommendationView.as_view(),
+        name="job_recommendations",
+    ),
     path("employer/job/", views.RetrieveEmployerJob.as_view(), name="employer_job"),
     path(
         "job/<int:job_id>/",
         views.JobRetrieveUpdateDeleteView.as_view(),
         name="job_details",
     ),
+    path(
+        "job/<int:job_id>/similar/",
+        views.SimilarJobsView.as_view(),
+        name="similar_jobs",
+    ),
+    path(
+        "job/<int:job_id>/candidates/",
+        views.JobCandidateSearchView.as_view(),
+        name="job_candidates",
+    ),
+    path(
+        "job/<int:job_id>/resumes.zip",
+        views.JobResumesArchiveView.as_view(),
+        name="job_resumes_archive",
+    ),
+    # SavedSearch
+    path("saved-search/", views.SavedSearchView.as_view(), name="saved_search"),
+    path(
+        "saved-search/<int:saved_search_id>/",
+        views.SavedSearchView.as_view(),
+        name="saved_search_details",
+    ),
+    # Notification
+    path("notifications/", views.NotificationView.as_view(), name="notifications"),
+    path(
+        "notifications/read/",
+        views.NotificationReadView.as_view(),
+        name="notifications_read",
+    ),
+    path(
+        "notifications/unread-count/",
+        views.NotificationUnreadCountView.as_view(),
+        name="notifications_unread_count",
+    ),
     # JobApplication
     path(
         "job-application/", views.JobApplicationView.as_view(), name="job_application"
@@ -1,7 +1,18 @@
 from rest_framework.views import APIView
 from django.core.exceptions import ObjectDoesNotExist, MultipleObjectsReturned
-from jobs.models import Jobs, JobApplication
-from .serializers import JobApplicationSerializer, JobSerializer
+from jobs.models import Jobs, JobApplication, JobRecommendation, SavedSearch
+from .serializers import (
+    CandidateSearchQuerySerializer,
+    JobApplicationSerializer,
+    JobFilterSerializer,
+    JobRecommendationQuerySerializer,
+    JobSerializer,
+    NotificationQuerySerializer,
+    NotificationReadSerializer,
+    NotificationSerializer,
+    SavedSearchSerializer,
+    SimilarJobsQuerySerializer,
+)
 from rest_framework import status
 from users.models import EmployerProfile, ApplicantProfile
 from rest_framework.permissions import IsAuthenticated
@@ -10,13 +21,27 @@ from rest_framework_simplejwt.authentication import JWTAuthentication
 from .permissions import HasEmployerProfilePermission
 from rest_framework.exceptions import PermissionDenied
 from api.utils import ApiResponse
+from api.throttling import (
+    JobApplicationRateThrottle,
+    JobCreateRateThrottle,
+    ThrottleBeforeAuthMixin,
+)
 from jobs.utils import JobApplicationAuditLogs
+from jobs import archives
+from jobs.candidates import rank_candidates
+from jobs.filters import filter_jobs
+from jobs.notifications import list_notifications, mark_read, unread_count
+from jobs.recommendations import job_recommender, score_at
+from jobs.similarity import similar_jobs
+from django.utils import timezone
+from django.http import StreamingHttpResponse
 
 
-class JobCreateRetrieveView(APIView):
+class JobCreateRetrieveView(ThrottleBeforeAuthMixin, APIView):
     """JobView"""
 
     authentication_classes = [JWTAuthentication]
+    throttle_classes = [JobCreateRateThrottle]
 
     @permission_classes([IsAuthenticated, HasEmployerProfilePermission])
     def post(self, request):
@@ -38,7 +63,12 @@ class JobCreateRetrieveView(APIView):
 
     def get(self, request):
         try:
-            jobs = Jobs.objects.filter(is_active=True).all()
+            filters = JobFilterSerializer(data=request.query_params)
+            if not filters.is_valid():
+                return ApiResponse.serializer_error(serializer_errors=filters.errors)
+            jobs = filter_jobs(
+                Jobs.objects.filter(is_active=True), filters.validated_data
+            )
             serializer = JobSerializer(jobs, many=True)
             return ApiResponse.success(
                 data=serializer.data,
@@ -53,6 +83,104 @@ class JobCreateRetrieveView(APIView):
             )
 
 
+class JobRecommendationView(APIView):
+    """
+    Active jobs ranked by how well they match the applicant's skills, read
+    from the precomputed JobRecommendation table
+    """
+
+    permission_classes = [IsAuthenticated]
+    authentication_classes = [JWTAuthentication]
+
+    def get(self, request):
+        try:
+            serializer = JobRecommendationQuerySerializer(data=request.query_params)
+            if not serializer.is_valid():
+                return ApiResponse.serializer_error(serializer_errors=serializer.errors)
+            applicant = ApplicantProfile.objects.only("id").get(user=request.user)
+            recommendations = (
+                JobRecommendation.objects.filter(
+                    applicant=applicant, job__is_active=True
+                )
+                .select_related("job")
+                .prefetch_related("job__required_skills")
+                .order_by("-score", "-job_id")[: serializer.validated_data["limit"]]
+            )
+            now = timezone.now().timestamp()
+            data = [
+                {
+                    **JobSerializer(recommendation.job).data,
+                    "score": round(
+                        score_at(
+                            recommendation.score, now, job_recommender.half_life_days
+                        ),
+                        4,
+                    ),
+                    "matched_skills": recommendation.matched_skills,
+                }
+                for recommendation in recommendations
+            ]
+            return ApiResponse.success(
+                data=data,
+                message="Recommended jobs retrieved successfully.",
+                status_code=status.HTTP_200_OK,
+            )
+        except ApplicantProfile.DoesNotExist:
+            return ApiResponse.error(
+                message="Applicant profile not found.",
+                status_code=status.HTTP_404_NOT_FOUND,
+            )
+        except Exception as e:
+            return ApiResponse.error(
+                errors=str(e),
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+
+class SimilarJobsView(APIView):
+    """Active jobs requiring similar skills, by estimated Jaccard similarity"""
+
+    permission_classes = [IsAuthenticated]
+    authentication_classes = [JWTAuthentication]
+
+    def get(self, request, job_id):
+        try:
+            serializer = SimilarJobsQuerySerializer(data=request.query_params)
+            if not serializer.is_valid():
+                return ApiResponse.serializer_error(serializer_errors=serializer.errors)
+            if not Jobs.objects.filter(id=job_id, is_active=True).exists():
+                return ApiResponse.error(
+                    message="Job not found.",
+                    status_code=status.HTTP_404_NOT_FOUND,
+                )
+            similar = similar_jobs.similar(
+                job_id, limit=serializer.validated_data["limit"]
+            )
+            jobs = (
+                Jobs.objects.filter(is_active=True)
+                .prefetch_related("required_skills")
+                .in_bulk([similar_id for similar_id, _ in similar])
+            )
+            data = [
+                {
+                    **JobSerializer(jobs[similar_id]).data,
+                    "similarity": round(similarity, 4),
+                }
+                for similar_id, similarity in similar
+                if similar_id in jobs
+            ]
+            return ApiResponse.success(
+                data=data,
+                message="Similar jobs retrieved successfully.",
+                status_code=status.HTTP_200_OK,
+            )
+        except Exception as e:
+            return ApiResponse.error(
+                errors=str(e),
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+
 class JobRetrieveUpdateDeleteView(APIView):
     """Job Detail View"""
 
@@ -140,6 +268,77 @@ class JobRetrieveUpdateDeleteView(APIView):
             )
 
 
+class JobResumesArchiveView(APIView):
+    """
+    Download every applicant's resume for one of the employer's jobs as a
+    ZIP archive with a CSV manifest, streamed as it is built.
+    """
+
+    permission_classes = [IsAuthenticated, HasEmployerProfilePermission]
+    authentication_classes = [JWTAuthentication]
+
+    def get(self, request, job_id):
+        try:
+            job = Jobs.objects.get(employer__user=request.user, id=job_id)
+            applications = archives.applications_for_archive(job)
+            storage = ApplicantProfile._meta.get_field("resume_file").storage
+            response = StreamingHttpResponse(
+                archives.stream_resume_archive(applications, storage),
+                content_type="application/zip",
+            )
+            response["Content-Disposition"] = (
+                f'attachment; filename="job-{job.id}-resumes.zip"'
+            )
+            return response
+        except Jobs.DoesNotExist:
+            return ApiResponse.error(
+                message="Job not found.",
+                status_code=status.HTTP_404_NOT_FOUND,
+            )
+        except Exception as e:
+            return ApiResponse.error(
+                errors=str(e),
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+
+class JobCandidateSearchView(APIView):
+    """
+    Applicants with a complete profile ranked by how many of the job's
+    required skills they have, paged with a cursor
+    """
+
+    permission_classes = [IsAuthenticated, HasEmployerProfilePermission]
+    authentication_classes = [JWTAuthentication]
+
+    def get(self, request, job_id):
+        try:
+            serializer = CandidateSearchQuerySerializer(data=request.query_params)
+            if not serializer.is_valid():
+                return ApiResponse.serializer_error(serializer_errors=serializer.errors)
+            job = Jobs.objects.get(employer__user=request.user, id=job_id)
+            candidates, next_cursor = rank_candidates(
+                job,
+                cursor=serializer.validated_data.get("cursor"),
+                limit=serializer.validated_data["limit"],
+            )
+            return ApiResponse.success(
+                data={"results": candidates, "next_cursor": next_cursor},
+                message="Candidates retrieved successfully.",
+                status_code=status.HTTP_200_OK,
+            )
+        except Jobs.DoesNotExist:
+            return ApiResponse.error(
+                message="Job not found.",
+                status_code=status.HTTP_404_NOT_FOUND,
+            )
+        except Exception as e:
+            return ApiResponse.error(
+                errors=str(e),
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+
 class RetrieveEmployerJob(APIView):
     """Retrieve Employer job only"""
 
@@ -164,11 +363,12 @@ class RetrieveEmployerJob(APIView):
             )
 
 
-class JobApplicationView(APIView):
+class JobApplicationView(ThrottleBeforeAuthMixin, APIView):
     "JobApplicationCreateRetrieveView"
 
     permission_classes = [IsAuthenticated]
     authentication_classes = [JWTAuthentication]
+    throttle_classes = [JobApplicationRateThrottle]
 
     def post(self, request):
         try:
@@ -234,3 +434,140 @@ class JobApplicationView(APIView):
                 errors=str(e),
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
+
+
+class SavedSearchView(APIView):
+    """List and create the user's saved searches"""
+
+    permission_classes = [IsAuthenticated]
+    authentication_classes = [JWTAuthentication]
+
+    def get(self, request):
+        try:
+            saved_searches = (
+                SavedSearch.objects.filter(user=request.user)
+                .prefetch_related("skills")
+                .order_by("-created_at")
+            )
+            return ApiResponse.success(
+                data=SavedSearchSerializer(saved_searches, many=True).data,
+                message="Saved searches retrieved successfully.",
+                status_code=status.HTTP_200_OK,
+            )
+        except Exception as e:
+            return ApiResponse.error(
+                errors=str(e),
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+    def post(self, request):
+        try:
+            serializer = SavedSearchSerializer(data=request.data)
+            if serializer.is_valid():
+                serializer.save(user=request.user)
+                return ApiResponse.success(
+                    data=serializer.data,
+                    message="Search saved.",
+                    status_code=status.HTTP_201_CREATED,
+                )
+            else:
+                return ApiResponse.serializer_error(serializer_errors=serializer.errors)
+        except Exception as e:
+            return ApiResponse.error(
+                errors=str(e),
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+    def delete(self, request, saved_search_id):
+        try:
+            SavedSearch.objects.get(user=request.user, id=saved_search_id).delete()
+            return ApiResponse.success(
+                message="Saved search deleted.",
+                status_code=status.HTTP_200_OK,
+            )
+        except SavedSearch.DoesNotExist:
+            return ApiResponse.error(
+                message="Saved search not found.",
+                status_code=status.HTTP_404_NOT_FOUND,
+            )
+        except Exception as e:
+            return ApiResponse.error(
+                errors=str(e),
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+
+class NotificationView(APIView):
+    """The user's notifications, newest first, paged with a cursor"""
+
+    permission_classes = [IsAuthenticated]
+    authentication_classes = [JWTAuthentication]
+
+    def get(self, request):
+        try:
+            serializer = NotificationQuerySerializer(data=request.query_params)
+            if not serializer.is_valid():
+                return ApiResponse.serializer_error(serializer_errors=serializer.errors)
+            notifications, next_cursor = list_notifications(
+                request.user,
+                cursor=serializer.validated_data.get("cursor"),
+                limit=serializer.validated_data["limit"],
+                unread_only=serializer.validated_data["unread_only"],
+            )
+            return ApiResponse.success(
+                data={
+                    "results": NotificationSerializer(notifications, many=True).data,
+                    "next_cursor": next_cursor,
+                },
+                message="Notifications retrieved successfully.",
+                status_code=status.HTTP_200_OK,
+            )
+        except Exception as e:
+            return ApiResponse.error(
+                errors=str(e),
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+
+class NotificationReadView(APIView):
+    """Mark the user's notifications read"""
+
+    permission_classes = [IsAuthenticated]
+    authentication_classes = [JWTAuthentication]
+
+    def post(self, request):
+        try:
+            serializer = NotificationReadSerializer(data=request.data)
+            if not serializer.is_valid():
+                return ApiResponse.serializer_error(serializer_errors=serializer.errors)
+            read = mark_read(request.user, serializer.validated_data.get("ids"))
+            return ApiResponse.success(
+                data={"read": read, "unread_count": unread_count(request.user)},
+                message="Notifications marked read.",
+                status_code=status.HTTP_200_OK,
+            )
+        except Exception as e:
+            return ApiResponse.error(
+                errors=str(e),
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+
+class NotificationUnreadCountView(APIView):
+    """Number of unread notifications, read from the user's counter"""
+
+    permission_classes = [IsAuthenticated]
+    authentication_classes = [JWTAuthentication]
+
+    def get(self, request):
+        try:
+            return ApiResponse.success(
+                data={"unread_count": unread_count(request.user)},
+                message="Unread notifications counted.",
+                status_code=status.HTTP_200_OK,
+            )
+        except Exception as e:
+            return ApiResponse.error(
+                errors=str(e),
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
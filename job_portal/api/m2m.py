@@ -0,0 +1,64 @@
+from django.db import router, transaction
+from django.db.models.signals import m2m_changed
+
+
+def sync_m2m(instance, field_name, objs, current_ids=None):
+    """
+    Make the many-to-many ``field_name`` of ``instance`` hold exactly ``objs``.
+
+    The added and removed ids are computed in memory against the current
+    rows, which are read once (or taken from ``current_ids`` / the prefetch
+    cache when available), and written with at most one bulk INSERT and one
+    DELETE on the through table. ``m2m_changed`` is sent for both, like
+    ``add()`` and ``remove()`` would. Returns ``(added_ids, removed_ids)``.
+    """
+    manager = getattr(instance, field_name)
+    through = manager.through
+    source_attname = through._meta.get_field(manager.source_field_name).attname
+    target_attname = through._meta.get_field(manager.target_field_name).attname
+
+    new_ids = {getattr(obj, "pk", obj) for obj in objs}
+    if current_ids is None:
+        prefetched = getattr(instance, "_prefetched_objects_cache", {}).get(
+            manager.prefetch_cache_name
+        )
+        if prefetched is not None:
+            current_ids = {obj.pk for obj in prefetched}
+        else:
+            current_ids = set(
+                through.objects.filter(**{source_attname: instance.pk}).values_list(
+                    target_attname, flat=True
+                )
+            )
+    added = new_ids - set(current_ids)
+    removed = set(current_ids) - new_ids
+    if not added and not removed:
+        return added, removed
+
+    using = router.db_for_write(through, instance=instance)
+    signal_kwargs = {
+        "sender": through,
+        "instance": instance,
+        "reverse": manager.reverse,
+        "model": manager.model,
+        "using": using,
+    }
+    with transaction.atomic(using=using, savepoint=False):
+        if removed:
+            m2m_changed.send(action="pre_remove", pk_set=removed, **signal_kwargs)
+            through.objects.using(using).filter(
+                **{source_attname: instance.pk, f"{target_attname}__in": removed}
+            ).delete()
+            m2m_changed.send(action="post_remove", pk_set=removed, **signal_kwargs)
+        if added:
+            m2m_changed.send(action="pre_add", pk_set=added, **signal_kwargs)
+            through.objects.using(using).bulk_create(
+                [
+                    through(**{source_attname: instance.pk, target_attname: pk})
+                    for pk in added
+                ]
+            )
+            m2m_changed.send(action="post_add", pk_set=added, **signal_kwargs)
+
+    manager._remove_prefetched_objects()
+    return added, removed
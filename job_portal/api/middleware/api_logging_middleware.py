@@ -1,6 +1,11 @@
 import logging
 import time
 
+# Only small text bodies are logged; reading anything else would pull whole
+# uploads into memory before the view gets to stream them.
+LOGGED_CONTENT_TYPES = ("application/json", "application/x-www-form-urlencoded")
+MAX_LOGGED_BODY_SIZE = 10 * 1024
+
 
 class APILoggingMiddleware:
     """
@@ -17,7 +22,7 @@ class APILoggingMiddleware:
 
         # Log request details
         self.logger.info(
-            f"API Request: {request.method} {request.path} | Body: {request.body.decode('utf-8', 'ignore')}"
+            f"API Request: {request.method} {request.path} | Body: {self.describe_body(request)}"
         )
 
         # Get the response
@@ -38,3 +43,18 @@ class APILoggingMiddleware:
         )
 
         return response
+
+    @staticmethod
+    def describe_body(request):
+        try:
+            size = int(request.META.get("CONTENT_LENGTH") or 0)
+        except ValueError:
+            size = 0
+        if not size:
+            return ""
+        if (
+            request.content_type not in LOGGED_CONTENT_TYPES
+            or size > MAX_LOGGED_BODY_SIZE
+        ):
+            return f"<{size} bytes of {request.content_type or 'unknown type'}>"
+        return request.body.decode("utf-8", "ignore")
@@ -0,0 +1,25 @@
+from rest_framework import serializers
+
+from users.fields import canonicalize_skill_name
+
+
+class SkillNameField(serializers.CharField):
+    """Skill name in its canonical form"""
+
+    def to_internal_value(self, data):
+        return canonicalize_skill_name(super().to_internal_value(data))
+
+
+class SkillResolveSerializer(serializers.Serializer):
+    names = serializers.ListField(
+        child=SkillNameField(max_length=50), allow_empty=False, max_length=100
+    )
+
+
+class SkillAutocompleteSerializer(serializers.Serializer):
+    q = serializers.CharField(max_length=50, trim_whitespace=False)
+    limit = serializers.IntegerField(min_value=1, max_value=50, default=10)
+
+
+class SkillTagSerializer(serializers.Serializer):
+    text = serializers.CharField(max_length=20000)
@@ -0,0 +1,14 @@
+from . import views
+from django.urls import path
+
+
+urlpatterns = [
+    path("", views.SkillCatalogView.as_view(), name="skill_catalog"),
+    path("resolve/", views.SkillResolveView.as_view(), name="skill_resolve"),
+    path(
+        "autocomplete/",
+        views.SkillAutocompleteView.as_view(),
+        name="skill_autocomplete",
+    ),
+    path("tag/", views.SkillTagView.as_view(), name="skill_tag"),
+]
@@ -0,0 +1,110 @@
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from users.skill_tagger import skill_tagger
+from users.skills import skill_autocomplete, skill_catalog
+from api.utils import ApiResponse
+from .serializers import (
+    SkillAutocompleteSerializer,
+    SkillResolveSerializer,
+    SkillTagSerializer,
+)
+
+
+class SkillCatalogView(APIView):
+    """All skills, served from the in-process catalog snapshot"""
+
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        try:
+            snapshot = skill_catalog.snapshot()
+            etags = parse_etags(request.headers.get("If-None-Match", ""))
+            if "*" in etags or snapshot.etag in etags:
+                response = Response(status=status.HTTP_304_NOT_MODIFIED)
+            else:
+                response = ApiResponse.success(
+                    data=snapshot.skills,
+                    message="Skills retrieved successfully.",
+                )
+            response["ETag"] = snapshot.etag
+            response["Cache-Control"] = "no-cache"
+            return response
+        except Exception as e:
+            return ApiResponse.error(
+                errors=str(e),
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+
+class SkillResolveView(APIView):
+    """Resolve skill names to ids, creating the missing skills"""
+
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        try:
+            serializer = SkillResolveSerializer(data=request.data)
+            if not serializer.is_valid():
+                return ApiResponse.serializer_error(serializer_errors=serializer.errors)
+            skills = skill_catalog.resolve(serializer.validated_data["names"])
+            return ApiResponse.success(
+                data=skills, message="Skills resolved successfully."
+            )
+        except Exception as e:
+            return ApiResponse.error(
+                errors=str(e),
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+
+class SkillAutocompleteView(APIView):
+    """Skills matching a typed prefix, most popular first"""
+
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        try:
+            serializer = SkillAutocompleteSerializer(data=request.query_params)
+            if not serializer.is_valid():
+                return ApiResponse.serializer_error(serializer_errors=serializer.errors)
+            skills = skill_autocomplete.complete(
+                serializer.validated_data["q"], serializer.validated_data["limit"]
+            )
+            return ApiResponse.success(
+                data=skills, message="Skills retrieved successfully."
+            )
+        except Exception as e:
+            return ApiResponse.error(
+                errors=str(e),
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+
+class SkillTagView(APIView):
+    """Skills named in a text, e.g. a job description being written"""
+
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        try:
+            serializer = SkillTagSerializer(data=request.data)
+            if not serializer.is_valid():
+                return ApiResponse.serializer_error(serializer_errors=serializer.errors)
+            skills = skill_tagger.suggest(serializer.validated_data["text"])
+            return ApiResponse.success(
+                data=skills, message="Skills suggested successfully."
+            )
+        except Exception as e:
+            return ApiResponse.error(
+                errors=str(e),
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
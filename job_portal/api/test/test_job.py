@@ -1,12 +1,50 @@
+import csv
+import io
+import os
+import random
+import tempfile
+import zipfile
+from concurrent.futures import Future
+from datetime import timedelta
 from unittest.mock import patch
 
+from api.jobs.serializers import JobSerializer
+from api.users.serializers import ApplicantProfileSerializer
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
 from faker import Faker
-from jobs.models import JobApplication, Jobs
+from jobs.alerts import saved_search_percolator
+from jobs.archives import ArchiveApplications, stream_resume_archive
+from jobs.duplicates import MASK, cluster_fingerprints, hamming, simhash
+from jobs.filters import filter_jobs
+from jobs.notifications import create_notifications, unread_count
+from jobs.models import (
+    JobApplication,
+    JobRecommendation,
+    Jobs,
+    Notification,
+    SavedSearch,
+)
+from jobs.recommendations import (
+    JobMatrix,
+    RecommendationRefresher,
+    job_recommender,
+    refresh_applicants,
+    refresh_job,
+)
+from jobs.similarity import SimilarJobIndex, minhash, similar_jobs
+from users.locations import haversine_km, location_gazetteer, locations_within
 from rest_framework import status
 from rest_framework.exceptions import PermissionDenied
 from rest_framework.test import APITestCase
-from users.models import ApplicantProfile, EmployerProfile, Skill, User
+from rest_framework_simplejwt.tokens import RefreshToken
+from users.models import ApplicantProfile, EmployerProfile, Location, Skill, User
 
 fake = Faker()
 
@@ -133,7 +171,9 @@ class JobTestSetup(APITestCase):
         skill_objects = [
             Skill(name=name) for name in skill_names
         ]  # Create skill instances
-        Skill.objects.bulk_create(skill_objects)  # Save to the database
+        Skill.objects.bulk_create(
+            skill_objects, ignore_conflicts=True
+        )  # Save to the database, names are unique
         return list(
             Skill.objects.filter(name__in=skill_names).values_list("id", flat=True)
         )  # Fetch IDs
@@ -340,7 +380,9 @@ class JobRetrieveUpdateDeleteViewTest(APITestCase):
         skill_objects = [
             Skill(name=name) for name in skill_names
         ]  # Create skill instances
-        Skill.objects.bulk_create(skill_objects)  # Save to the database
+        Skill.objects.bulk_create(
+            skill_objects, ignore_conflicts=True
+        )  # Save to the database, names are unique
         return list(
             Skill.objects.filter(name__in=skill_names).values_list("id", flat=True)
         )  # Fetch IDs
@@ -635,3 +677,1367 @@ class JobRetrieveUpdateDeleteViewTest(APITestCase):
             f"{self.job_application}{job_application_response.data.get('data')[0].get('id')}/"
         )
         self.assertEqual(response.status_code, status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class JobSkillsValidationTest(APITestCase):
+    """Skills are validated in bulk"""
+
+    def setUp(self):
+        self.skills = Skill.objects.bulk_create(
+            [Skill(name=f"skill-{i}") for i in range(30)]
+        )
+        self.skill_ids = list(Skill.objects.values_list("id", flat=True))
+        self.job_data = {
+            "job_title": "Software Engineer",
+            "description": "Python and Django",
+            "location": "New York, NY",
+            "salary_min": 70000,
+            "salary_max": 120000,
+            "job_type": "FT",
+            "experience_level": "mid",
+            "required_skills": self.skill_ids,
+        }
+
+    def test_thirty_skills_validated_with_one_query(self):
+        serializer = JobSerializer(data=self.job_data)
+        with self.assertNumQueries(1):
+            self.assertTrue(serializer.is_valid(), serializer.errors)
+        self.assertEqual(
+            [skill.id for skill in serializer.validated_data["required_skills"]],
+            self.skill_ids,
+        )
+
+    def test_missing_skill_ids_reported(self):
+        missing = max(self.skill_ids) + 1
+        serializer = JobSerializer(
+            data={**self.job_data, "required_skills": [self.skill_ids[0], missing]}
+        )
+        with self.assertNumQueries(1):
+            self.assertFalse(serializer.is_valid())
+        self.assertEqual(
+            str(serializer.errors["required_skills"][0]),
+            f"Invalid pk(s) {missing} - objects do not exist.",
+        )
+
+    def test_applicant_profile_skills_validated_with_one_query(self):
+        serializer = ApplicantProfileSerializer(
+            data={"skills": self.skill_ids}, partial=True
+        )
+        with self.assertNumQueries(1):
+            self.assertTrue(serializer.is_valid(), serializer.errors)
+
+    def test_invalid_skill_id_type(self):
+        serializer = JobSerializer(data={**self.job_data, "required_skills": ["x"]})
+        self.assertFalse(serializer.is_valid())
+        self.assertIn("required_skills", serializer.errors)
+
+
+class JobSkillsUpdateTest(APITestCase):
+    """Skill updates only write the difference"""
+
+    def setUp(self):
+        user = User.objects.create(username=fake.user_name(), is_employer=True)
+        employer = EmployerProfile.objects.create(
+            user=user,
+            company_name=fake.company(),
+            company_website=fake.url(),
+            location="New York",
+            description="",
+        )
+        self.skills = [Skill.objects.create(name=f"skill-{i}") for i in range(4)]
+        self.job = Jobs.objects.create(
+            employer=employer,
+            job_title="Software Engineer",
+            description="Python and Django",
+            location="New York, NY",
+            salary_min=70000,
+            salary_max=120000,
+            job_type="FT",
+            experience_level="mid",
+        )
+        self.job.required_skills.set(self.skills[:3])
+
+    def through_statements(self, queries, verb):
+        table = connection.ops.quote_name(Jobs.required_skills.through._meta.db_table)
+        return [
+            query["sql"]
+            for query in queries.captured_queries
+            if query["sql"].startswith(verb) and table in query["sql"]
+        ]
+
+    def test_partial_update_without_skills_keeps_them(self):
+        serializer = JobSerializer(
+            self.job, data={"job_title": "Senior Engineer"}, partial=True
+        )
+        self.assertTrue(serializer.is_valid())
+        with CaptureQueriesContext(connection) as queries:
+            serializer.save()
+        self.assertEqual(len(queries), 1)
+        self.assertIn("job_title", queries.captured_queries[0]["sql"])
+        self.assertNotIn("description", queries.captured_queries[0]["sql"])
+        self.assertEqual(self.job.required_skills.count(), 3)
+
+    def test_skill_update_writes_only_the_difference(self):
+        new_skills = [self.skills[0].id, self.skills[1].id, self.skills[3].id]
+        serializer = JobSerializer(
+            self.job, data={"required_skills": new_skills}, partial=True
+        )
+        self.assertTrue(serializer.is_valid())
+        with CaptureQueriesContext(connection) as queries:
+            serializer.save()
+        self.assertEqual(len(self.through_statements(queries, "INSERT")), 1)
+        self.assertEqual(len(self.through_statements(queries, "DELETE")), 1)
+        self.assertEqual(
+            set(self.job.required_skills.values_list("id", flat=True)),
+            set(new_skills),
+        )
+
+    def test_unchanged_skills_write_nothing(self):
+        serializer = JobSerializer(
+            self.job,
+            data={"required_skills": [skill.id for skill in self.skills[:3]]},
+            partial=True,
+        )
+        self.assertTrue(serializer.is_valid())
+        with CaptureQueriesContext(connection) as queries:
+            serializer.save()
+        self.assertFalse(self.through_statements(queries, "INSERT"))
+        self.assertFalse(self.through_statements(queries, "DELETE"))
+
+
+class JobResumesArchiveTest(APITestCase):
+    """Streaming ZIP of a job's resumes"""
+
+    def setUp(self):
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        settings_override = override_settings(MEDIA_ROOT=media_root.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.employer_user = User.objects.create(
+            username=fake.user_name(), is_employer=True
+        )
+        employer = EmployerProfile.objects.create(
+            user=self.employer_user,
+            company_name=fake.company(),
+            company_website=fake.url(),
+            location="New York",
+            description="",
+        )
+        self.job = Jobs.objects.create(
+            employer=employer,
+            job_title="Software Engineer",
+            description="Python and Django",
+            location="New York, NY",
+            salary_min=70000,
+            salary_max=120000,
+            job_type="FT",
+            experience_level="mid",
+        )
+        self.url = reverse("job_resumes_archive", args=[self.job.id])
+        token = RefreshToken.for_user(self.employer_user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def apply(self, first_name, content):
+        user = User.objects.create(
+            username=fake.user_name(),
+            first_name=first_name,
+            last_name="Doe",
+            is_applicant=True,
+        )
+        with patch("users.signals.resume_text_pipeline.submit"):
+            applicant = ApplicantProfile.objects.create(
+                user=user,
+                phone_number="1245125412",
+                address="Street",
+                resume_file=SimpleUploadedFile("cv.pdf", content, "application/pdf"),
+            )
+        return JobApplication.objects.create(applicant=applicant, job_listing=self.job)
+
+    def test_archive_contains_resumes_and_manifest(self):
+        resumes = [b"%PDF-1.4\n" + os.urandom(150 * 1024) for _ in range(2)]
+        first = self.apply("Jane", resumes[0])
+        second = self.apply("John", resumes[1])
+        second.status = "shortlisted"
+        second.save()
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/zip")
+        chunks = list(response.streaming_content)
+        # Streamed block by block, never buffered whole
+        self.assertLessEqual(max(map(len, chunks)), 64 * 1024 + 1024)
+
+        archive = zipfile.ZipFile(io.BytesIO(b"".join(chunks)))
+        self.assertIsNone(archive.testzip())
+        names = [
+            f"resumes/{first.id}-jane-doe.pdf",
+            f"resumes/{second.id}-john-doe.pdf",
+        ]
+        self.assertEqual(archive.namelist(), [*names, "applicants.csv"])
+        for name, content in zip(names, resumes):
+            self.assertEqual(archive.getinfo(name).compress_type, zipfile.ZIP_STORED)
+            self.assertEqual(archive.read(name), content)
+
+        rows = list(
+            csv.DictReader(io.StringIO(archive.read("applicants.csv").decode()))
+        )
+        self.assertEqual([row["applicant"] for row in rows], ["Jane Doe", "John Doe"])
+        self.assertEqual([row["status"] for row in rows], ["applied", "shortlisted"])
+        self.assertEqual([row["resume"] for row in rows], names)
+
+    def test_missing_resume_reported_in_manifest(self):
+        application = self.apply("Jane", b"%PDF-1.4 gone")
+        os.remove(application.applicant.resume_file.path)
+
+        response = self.client.get(self.url)
+        archive = zipfile.ZipFile(io.BytesIO(b"".join(response.streaming_content)))
+        self.assertEqual(archive.namelist(), ["applicants.csv"])
+        rows = list(
+            csv.DictReader(io.StringIO(archive.read("applicants.csv").decode()))
+        )
+        self.assertEqual(rows[0]["resume"], "")
+
+    def test_applications_read_in_chunks(self):
+        applications = [self.apply(name, b"%PDF-1.4 cv") for name in "ABC"]
+        storage = ApplicantProfile._meta.get_field("resume_file").storage
+        stream = stream_resume_archive(
+            ArchiveApplications(self.job, chunk_size=2), storage
+        )
+        chunks = [next(stream)]
+        # Applied while the first chunk is streamed, read with the second
+        applications.append(self.apply("D", b"%PDF-1.4 late"))
+        archive = zipfile.ZipFile(io.BytesIO(b"".join([*chunks, *stream])))
+        rows = list(
+            csv.DictReader(io.StringIO(archive.read("applicants.csv").decode()))
+        )
+        self.assertEqual(
+            [int(row["application_id"]) for row in rows],
+            [application.id for application in applications],
+        )
+        self.assertEqual(
+            archive.namelist(), [*(row["resume"] for row in rows), "applicants.csv"]
+        )
+
+    def test_other_employers_job_not_found(self):
+        other = User.objects.create(username=fake.user_name(), is_employer=True)
+        EmployerProfile.objects.create(
+            user=other,
+            company_name=fake.company(),
+            company_website=fake.url(),
+            location="New York",
+            description="",
+        )
+        token = RefreshToken.for_user(other).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class JobRecommendationTest(APITestCase):
+    """Jobs ranked by skill overlap"""
+
+    def setUp(self):
+        # The matrix outlives the rolled back data of earlier tests
+        job_recommender.invalidate()
+        user = User.objects.create(username=fake.user_name(), is_employer=True)
+        self.employer = EmployerProfile.objects.create(
+            user=user,
+            company_name=fake.company(),
+            company_website=fake.url(),
+            location="New York",
+            description="",
+        )
+        self.skills = [Skill.objects.create(name=f"skill-{i}") for i in range(6)]
+        self.applicant_user = User.objects.create(
+            username=fake.user_name(), is_applicant=True
+        )
+        self.applicant = ApplicantProfile.objects.create(
+            user=self.applicant_user, phone_number="1245125412", address="Street"
+        )
+        self.applicant.skills.set(self.skills[:3])
+        token = RefreshToken.for_user(self.applicant_user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def create_job(self, skills, title="Software Engineer", days_old=0, **fields):
+        with self.captureOnCommitCallbacks(execute=True):
+            job = Jobs.objects.create(
+                employer=self.employer,
+                job_title=title,
+                description="Python and Django",
+                location="New York, NY",
+                salary_min=70000,
+                salary_max=120000,
+                job_type="FT",
+                experience_level="mid",
+                **fields,
+            )
+            if days_old:
+                Jobs.objects.filter(pk=job.pk).update(
+                    posted_date=job.posted_date - timedelta(days=days_old)
+                )
+                job_recommender.invalidate()
+            job.required_skills.set(skills)
+        return job
+
+    def create_applicant(self, skills):
+        user = User.objects.create(username=fake.user_name(), is_applicant=True)
+        applicant = ApplicantProfile.objects.create(
+            user=user, phone_number="1245125412", address="Street"
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            applicant.skills.set(skills)
+        return applicant
+
+    def table(self, applicant):
+        return list(
+            JobRecommendation.objects.filter(applicant=applicant)
+            .order_by("-score", "-job_id")
+            .values_list("job_id", flat=True)
+        )
+
+    def test_rank_by_coverage_and_recency(self):
+        full = self.create_job(self.skills[:2], "Full match")
+        half = self.create_job([self.skills[0], self.skills[4]], "Half match")
+        old_full = self.create_job(self.skills[1:3], "Old full match", days_old=60)
+        self.create_job(self.skills[4:], "No match")
+        self.create_job(self.skills[:1], "Inactive", is_active=False)
+
+        recommendations = job_recommender.recommend(self.applicant)
+        self.assertEqual(
+            [r.job_id for r in recommendations], [full.id, half.id, old_full.id]
+        )
+        self.assertAlmostEqual(recommendations[0].score, 1, places=3)
+        # Two half-lives old
+        self.assertAlmostEqual(recommendations[2].score, 0.25, places=3)
+
+        JobApplication.objects.create(applicant=self.applicant, job_listing=full)
+        self.assertEqual(
+            [r.job_id for r in job_recommender.recommend(self.applicant, limit=1)],
+            [half.id],
+        )
+
+    def test_skill_changes_picked_up(self):
+        job = self.create_job(self.skills[4:])
+        self.assertEqual(job_recommender.recommend(self.applicant), [])
+        job.required_skills.add(self.skills[0])
+        self.assertEqual(
+            [r.job_id for r in job_recommender.recommend(self.applicant)], [job.id]
+        )
+
+    def test_top_k_matches_full_sort(self):
+        rng = random.Random(7)
+        job_ids = list(range(1, 2001))
+        posted = [rng.uniform(0, 90 * 86400) for _ in job_ids]
+        pairs = [
+            (job_id, skill_id)
+            for job_id in job_ids
+            for skill_id in rng.sample(range(1, 60), rng.randint(1, 6))
+        ]
+        matrix = JobMatrix(job_ids, posted, pairs)
+        applicant_skills = rng.sample(range(1, 60), 8)
+
+        required = {}
+        for job_id, skill_id in pairs:
+            required.setdefault(job_id, set()).add(skill_id)
+        now = 90 * 86400
+        expected = sorted(
+            (
+                -len(skills & set(applicant_skills))
+                / len(skills)
+                * 2 ** (-(now - posted[job_id - 1]) / 86400 / 30),
+                job_id,
+            )
+            for job_id, skills in required.items()
+            if skills & set(applicant_skills)
+        )
+        ranked = matrix.rank(applicant_skills, 25, now=now)
+        self.assertEqual(
+            [r.job_id for r in ranked], [job_id for _, job_id in expected[:25]]
+        )
+
+    def test_recommendation_endpoint(self):
+        job = self.create_job(self.skills[:2])
+        response = self.client.get(reverse("job_recommendations"), {"limit": 5})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["data"]), 1)
+        self.assertEqual(response.data["data"][0]["id"], job.id)
+        self.assertEqual(response.data["data"][0]["matched_skills"], 2)
+        self.assertAlmostEqual(response.data["data"][0]["score"], 1, places=3)
+
+        with self.assertNumQueries(4):
+            # User, profile, recommendations joined with jobs, prefetched skills
+            self.client.get(reverse("job_recommendations"))
+
+        response = self.client.get(reverse("job_recommendations"), {"limit": 0})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_recommendation_endpoint_requires_applicant_profile(self):
+        user = User.objects.create(username=fake.user_name(), is_applicant=True)
+        token = RefreshToken.for_user(user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        response = self.client.get(reverse("job_recommendations"))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_table_follows_job_changes(self):
+        other = self.create_applicant(self.skills[4:])
+        job = self.create_job(self.skills[:2])
+        self.assertEqual(self.table(self.applicant), [job.id])
+        self.assertEqual(self.table(other), [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            job.required_skills.set([self.skills[4]])
+        self.assertEqual(self.table(self.applicant), [])
+        self.assertEqual(self.table(other), [job.id])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            job.is_active = False
+            job.save(update_fields=["is_active"])
+        self.assertEqual(self.table(other), [])
+
+    @override_settings(
+        CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+    )
+    def test_job_refresh_ignores_stale_matrix(self):
+        cache.clear()
+        job = self.create_job(self.skills[:2])
+        stale = job_recommender.matrix()
+        job.required_skills.set(self.skills[:1] + self.skills[4:])
+        # Another process still holds the matrix from before the change
+        job_recommender._value = stale
+        refresh_job(job.id)
+        recommendation = JobRecommendation.objects.get(applicant=self.applicant)
+        self.assertEqual(recommendation.matched_skills, 1)
+
+    def test_table_follows_applicant_changes(self):
+        first = self.create_job(self.skills[:1])
+        second = self.create_job(self.skills[4:5])
+        self.assertEqual(self.table(self.applicant), [first.id])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.applicant.skills.add(self.skills[4])
+        self.assertEqual(self.table(self.applicant), [second.id, first.id])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            JobApplication.objects.create(applicant=self.applicant, job_listing=second)
+        self.assertEqual(self.table(self.applicant), [first.id])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            first.delete()
+        self.assertEqual(self.table(self.applicant), [])
+
+    def test_table_keeps_top_k(self):
+        with patch.object(job_recommender, "top_k", 2):
+            third = self.create_job(self.skills[:1] + self.skills[3:6])
+            second = self.create_job(self.skills[:1] + self.skills[4:5])
+            first = self.create_job(self.skills[:1])
+            self.assertEqual(self.table(self.applicant), [first.id, second.id])
+
+            # Dropping out of the top K lets the next best job back in
+            with self.captureOnCommitCallbacks(execute=True):
+                first.required_skills.set(self.skills[3:4])
+            self.assertEqual(self.table(self.applicant), [second.id, third.id])
+
+    def test_incremental_updates_match_rebuild(self):
+        rng = random.Random(3)
+        applicants = [self.applicant] + [
+            self.create_applicant(rng.sample(self.skills, 3)) for _ in range(5)
+        ]
+        jobs = [
+            self.create_job(rng.sample(self.skills, rng.randint(1, 4)), days_old=i)
+            for i in range(8)
+        ]
+        with self.captureOnCommitCallbacks(execute=True):
+            jobs[0].required_skills.set(self.skills[5:])
+            jobs[1].delete()
+            applicants[2].skills.remove(*self.skills[:3])
+            JobApplication.objects.create(applicant=applicants[3], job_listing=jobs[4])
+        incremental = {a.pk: self.table(a) for a in applicants}
+
+        refresh_applicants([a.pk for a in applicants])
+        self.assertEqual({a.pk: self.table(a) for a in applicants}, incremental)
+
+        JobRecommendation.objects.all().delete()
+        call_command("rebuild_job_recommendations", workers=0, stdout=io.StringIO())
+        self.assertEqual({a.pk: self.table(a) for a in applicants}, incremental)
+
+    def test_refresher_coalesces_batches(self):
+        submitted = []
+
+        class Executor:
+            def submit(self, func, *args):
+                future = Future()
+                submitted.append((args, future))
+                return future
+
+        refresher = RecommendationRefresher(max_workers=1)
+        refresher._executor = Executor()
+        refresher.submit(job_ids=[1])
+        refresher.submit(profile_ids=[3, 2])
+        refresher.submit(job_ids=[1], profile_ids=[2])
+        self.assertEqual([args for args, _ in submitted], [([1], [])])
+
+        # The changes collected meanwhile go out as one batch
+        submitted[0][1].set_result(None)
+        self.assertEqual([args for args, _ in submitted][1:], [([1], [2, 3])])
+        submitted[1][1].set_result(None)
+        self.assertEqual(len(submitted), 2)
+
+        refresher.submit(profile_ids=[4])
+        self.assertEqual(submitted[2][0], ([], [4]))
+
+
+class CandidateSearchTest(APITestCase):
+    """Applicants ranked by the job's required skills they have"""
+
+    def setUp(self):
+        user = User.objects.create(username=fake.user_name(), is_employer=True)
+        employer = EmployerProfile.objects.create(
+            user=user,
+            company_name=fake.company(),
+            company_website=fake.url(),
+            location="New York",
+            description="",
+        )
+        self.skills = [Skill.objects.create(name=f"skill-{i}") for i in range(4)]
+        self.job = Jobs.objects.create(
+            employer=employer,
+            job_title="Software Engineer",
+            description="Python and Django",
+            location="New York, NY",
+            salary_min=70000,
+            salary_max=120000,
+            job_type="FT",
+            experience_level="mid",
+        )
+        self.job.required_skills.set(self.skills[:3])
+        self.url = reverse("job_candidates", args=[self.job.id])
+        token = RefreshToken.for_user(user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def create_applicant(self, skills, profile_complete=True):
+        user = User.objects.create(username=fake.user_name(), is_applicant=True)
+        applicant = ApplicantProfile.objects.create(
+            user=user,
+            phone_number="1245125412",
+            address="Street",
+            profile_complete=profile_complete,
+        )
+        applicant.skills.set(skills)
+        return applicant
+
+    def test_candidates_ranked_by_matched_skills(self):
+        two = self.create_applicant(self.skills[1:4])
+        three = self.create_applicant(self.skills[:3])
+        one = self.create_applicant(self.skills[2:])
+        self.create_applicant(self.skills[:3], profile_complete=False)
+        self.create_applicant(self.skills[3:])
+        JobApplication.objects.create(applicant=one, job_listing=self.job)
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = response.data["data"]["results"]
+        self.assertEqual(
+            [(r["applicant_id"], r["matched_skills"]) for r in results],
+            [(three.id, 3), (two.id, 2), (one.id, 1)],
+        )
+        self.assertEqual(results[1]["coverage"], 0.6667)
+        self.assertEqual([r["applied"] for r in results], [False, False, True])
+        self.assertIsNone(response.data["data"]["next_cursor"])
+
+    def test_keyset_pagination(self):
+        applicants = [self.create_applicant(self.skills[: 1 + i % 3]) for i in range(7)]
+        expected = sorted(applicants, key=lambda a: (-a.skills.count(), a.id))
+
+        seen, cursor = [], None
+        while True:
+            params = {"limit": 3, **({"cursor": cursor} if cursor else {})}
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            aggregates = [q for q in queries if "COUNT(" in q["sql"]]
+            self.assertEqual(len(aggregates), 1)
+            seen += [r["applicant_id"] for r in response.data["data"]["results"]]
+            cursor = response.data["data"]["next_cursor"]
+            if cursor is None:
+                break
+        self.assertEqual(seen, [a.id for a in expected])
+
+    def test_invalid_cursor(self):
+        response = self.client.get(self.url, {"cursor": "not-a-cursor"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_other_employers_job_not_found(self):
+        other = User.objects.create(username=fake.user_name(), is_employer=True)
+        EmployerProfile.objects.create(
+            user=other,
+            company_name=fake.company(),
+            company_website=fake.url(),
+            location="New York",
+            description="",
+        )
+        token = RefreshToken.for_user(other).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        self.assertEqual(
+            self.client.get(self.url).status_code, status.HTTP_404_NOT_FOUND
+        )
+
+
+class SavedSearchTest(APITestCase):
+    """Saved searches, job listing filters and job alerts"""
+
+    def setUp(self):
+        self.employer_user = User.objects.create(
+            username=fake.user_name(), is_employer=True
+        )
+        self.employer = EmployerProfile.objects.create(
+            user=self.employer_user,
+            company_name="Acme",
+            company_website=fake.url(),
+            location="New York",
+            description="",
+        )
+        self.skills = [Skill.objects.create(name=f"skill-{i}") for i in range(4)]
+        self.user = User.objects.create(username=fake.user_name(), is_applicant=True)
+        self.authenticate(self.user)
+
+    def authenticate(self, user):
+        token = RefreshToken.for_user(user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def create_job(self, skills=(), **fields):
+        data = {
+            "job_title": "Software Engineer",
+            "description": "Python and Django",
+            "location": "New York, NY",
+            "salary_min": 70000,
+            "salary_max": 120000,
+            "job_type": "FT",
+            "experience_level": "mid",
+            **fields,
+        }
+        job = Jobs.objects.create(employer=self.employer, **data)
+        job.required_skills.set(skills)
+        return job
+
+    def create_search(self, user=None, skills=(), **criteria):
+        search = SavedSearch.objects.create(
+            user=user or self.user, name="My search", **criteria
+        )
+        search.skills.set(skills)
+        return search
+
+    def test_save_and_list_searches(self):
+        response = self.client.post(
+            reverse("saved_search"),
+            data={
+                "name": "Remote Python",
+                "location": " new york, ny ",
+                "job_type": "FT",
+                "min_salary": "100000",
+                "skills": [self.skills[0].id],
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        search = SavedSearch.objects.get(user=self.user)
+        self.assertEqual(search.location, "new york, ny")
+        self.assertEqual(list(search.skills.all()), [self.skills[0]])
+
+        response = self.client.get(reverse("saved_search"))
+        self.assertEqual(len(response.data["data"]), 1)
+        self.assertEqual(response.data["data"][0]["skills"], [self.skills[0].id])
+
+        response = self.client.delete(reverse("saved_search_details", args=[search.id]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(SavedSearch.objects.exists())
+
+    def test_job_listing_filters(self):
+        match = self.create_job(self.skills[:2])
+        self.create_job(self.skills[:2], location="Boston")
+        self.create_job(self.skills[:1])
+        self.create_job(self.skills[:2], salary_max=80000)
+
+        response = self.client.get(
+            reverse("job"),
+            {
+                "location": "NEW YORK, NY",
+                "min_salary": 100000,
+                "skills": [self.skills[0].id, self.skills[1].id],
+            },
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([job["id"] for job in response.data["data"]], [match.id])
+
+        response = self.client.get(reverse("job"), {"job_type": "XX"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_new_job_notifies_matching_searches(self):
+        other = User.objects.create(username=fake.user_name(), is_applicant=True)
+        self.create_search(location="new york, ny", skills=self.skills[:1])
+        self.create_search(min_salary=100000)
+        self.create_search(user=other, job_type="PT")
+        self.create_search(user=self.employer_user)
+
+        self.authenticate(self.employer_user)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                reverse("job"),
+                data={
+                    "job_title": "Software Engineer",
+                    "description": "Python and Django",
+                    "location": "New York, NY",
+                    "salary_min": 70000,
+                    "salary_max": 120000,
+                    "job_type": "FT",
+                    "experience_level": "mid",
+                    "required_skills": [self.skills[0].id, self.skills[2].id],
+                },
+                format="json",
+            )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        # Two matching searches, one notification; the poster is not notified
+        notifications = Notification.objects.all()
+        self.assertEqual([n.user for n in notifications], [self.user])
+        self.assertIn("Software Engineer at Acme", notifications[0].message)
+        self.assertEqual(unread_count(self.user), 1)
+
+    def test_failed_alerts_do_not_fail_the_job(self):
+        self.create_search()
+        self.authenticate(self.employer_user)
+        with patch("jobs.alerts.percolate_job", side_effect=RuntimeError("boom")):
+            with self.assertLogs("jobs.alerts", "ERROR"):
+                with self.captureOnCommitCallbacks(execute=True) as callbacks:
+                    response = self.client.post(
+                        reverse("job"),
+                        data={
+                            "job_title": "Software Engineer",
+                            "description": "Python and Django",
+                            "location": "New York, NY",
+                            "salary_min": 70000,
+                            "salary_max": 120000,
+                            "job_type": "FT",
+                            "experience_level": "mid",
+                            "required_skills": [self.skills[0].id],
+                        },
+                        format="json",
+                    )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        # The similar jobs refresh queued after the alerts still ran
+        self.assertGreater(len(callbacks), 1)
+        job = Jobs.objects.get()
+        self.assertIsNotNone(job.skill_signature)
+        self.assertFalse(Notification.objects.exists())
+
+    def test_percolator_agrees_with_listing_filters(self):
+        rng = random.Random(5)
+        searches = [
+            self.create_search(
+                location=rng.choice(["", "New York, NY", "boston"]),
+                job_type=rng.choice(["", "FT", "PT"]),
+                experience_level=rng.choice(["", "mid", "senior"]),
+                min_salary=rng.choice([None, 60000, 100000, 150000]),
+                skills=rng.sample(self.skills, rng.randint(0, 2)),
+            )
+            for _ in range(60)
+        ]
+        index = saved_search_percolator.index()
+        self.assertEqual(index.size, len(searches))
+        for _ in range(10):
+            skills = rng.sample(self.skills, rng.randint(0, 3))
+            job = self.create_job(
+                skills,
+                location=rng.choice(["New York, NY", "Boston"]),
+                job_type=rng.choice(["FT", "PT"]),
+                experience_level=rng.choice(["mid", "senior"]),
+                salary_max=rng.choice([80000, 120000]),
+            )
+            # Search locations were geocoded when the index was built
+            with patch("jobs.filters.location_key") as location_key:
+                matched = {
+                    entry.search_id
+                    for entry in index.match(job, [skill.id for skill in skills])
+                }
+            location_key.assert_not_called()
+            expected = {
+                search.id
+                for search in searches
+                if filter_jobs(
+                    Jobs.objects.filter(pk=job.pk),
+                    {
+                        "location": search.location,
+                        "job_type": search.job_type,
+                        "experience_level": search.experience_level,
+                        "min_salary": search.min_salary,
+                        "skills": list(search.skills.all()),
+                    },
+                ).exists()
+            }
+            self.assertEqual(matched, expected)
+
+
+class SimilarJobsTest(APITestCase):
+    """Similar jobs from MinHash signatures of the required skills"""
+
+    def setUp(self):
+        # The index outlives the rolled back data of earlier tests
+        similar_jobs.invalidate()
+        user = User.objects.create(username=fake.user_name(), is_employer=True)
+        self.employer = EmployerProfile.objects.create(
+            user=user,
+            company_name=fake.company(),
+            company_website=fake.url(),
+            location="New York",
+            description="",
+        )
+        self.skills = [Skill.objects.create(name=f"skill-{i}") for i in range(8)]
+        token = RefreshToken.for_user(user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def create_job(self, skills):
+        with self.captureOnCommitCallbacks(execute=True):
+            job = Jobs.objects.create(
+                employer=self.employer,
+                job_title="Software Engineer",
+                description="Python and Django",
+                location="New York, NY",
+                salary_min=70000,
+                salary_max=120000,
+                job_type="FT",
+                experience_level="mid",
+            )
+            job.required_skills.set(skills)
+        return job
+
+    def similar(self, job):
+        response = self.client.get(reverse("similar_jobs", args=[job.id]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [(item["id"], item["similarity"]) for item in response.data["data"]]
+
+    def test_similar_jobs(self):
+        job = self.create_job(self.skills[:6])
+        close = self.create_job(self.skills[:5])
+        other = self.create_job(self.skills[6:])
+        job.refresh_from_db()
+        self.assertEqual(
+            bytes(job.skill_signature),
+            minhash([skill.id for skill in self.skills[:6]]).tobytes(),
+        )
+
+        [(similar_id, similarity)] = self.similar(job)
+        self.assertEqual(similar_id, close.id)
+        self.assertAlmostEqual(similarity, 5 / 6, delta=0.2)
+        self.assertEqual(self.similar(other), [])
+
+        # Jobs created before the signature column are signed by the command
+        Jobs.objects.update(skill_signature=None)
+        similar_jobs.invalidate()
+        self.assertEqual(self.similar(job), [])
+        call_command("rebuild_job_signatures", stdout=io.StringIO())
+        self.assertEqual(self.similar(job), [(close.id, similarity)])
+
+        # Changes are applied to the index in place once committed
+        with self.captureOnCommitCallbacks(execute=True):
+            other.required_skills.set(self.skills[:6])
+            close.is_active = False
+            close.save()
+        self.assertEqual(self.similar(job), [(other.id, 1.0)])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            other.delete()
+        self.assertEqual(self.similar(job), [])
+
+        response = self.client.get(reverse("similar_jobs", args=[close.id]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_requires_authentication(self):
+        job = self.create_job(self.skills[:6])
+        self.client.credentials()
+        response = self.client.get(reverse("similar_jobs", args=[job.id]))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_recall_against_exact_jaccard(self):
+        rng = random.Random(0)
+        catalog = []
+        for _ in range(300):
+            skills = set(rng.sample(range(1, 500), rng.randint(4, 12)))
+            catalog.append(skills)
+            for _ in range(2):
+                variant = set(skills)
+                for _ in range(rng.randint(1, 3)):
+                    variant.discard(rng.choice(sorted(variant)))
+                    variant.add(rng.randint(1, 499))
+                catalog.append(variant)
+        index = SimilarJobIndex(
+            (job_id, minhash(skills)) for job_id, skills in enumerate(catalog)
+        )
+
+        expected = found = 0
+        errors = []
+        for job_id, skills in enumerate(catalog):
+            retrieved = dict(index.similar(job_id))
+            for other_id, other in enumerate(catalog):
+                jaccard = len(skills & other) / len(skills | other)
+                if other_id == job_id or jaccard < 0.5:
+                    continue
+                expected += 1
+                if other_id in retrieved:
+                    found += 1
+                    errors.append(abs(retrieved[other_id] - jaccard))
+        self.assertGreater(expected, 500)
+        self.assertGreaterEqual(found / expected, 0.9)
+        self.assertLess(sum(errors) / len(errors), 0.1)
+
+
+class JobLocationTest(APITestCase):
+    """Geocoded job locations and radius search"""
+
+    def setUp(self):
+        call_command("load_gazetteer", stdout=io.StringIO())
+        # Later tests must not geocode to the rolled back places
+        self.addCleanup(location_gazetteer.invalidate)
+        self.user = User.objects.create(username=fake.user_name(), is_employer=True)
+        self.employer = EmployerProfile.objects.create(
+            user=self.user,
+            company_name="Acme",
+            company_website=fake.url(),
+            location="NYC",
+            description="",
+        )
+
+    def place(self, name, region_code):
+        return Location.objects.get(name=name, region_code=region_code)
+
+    def create_job(self, location):
+        return Jobs.objects.create(
+            employer=self.employer,
+            job_title="Software Engineer",
+            description="Python and Django",
+            location=location,
+            salary_min=70000,
+            salary_max=120000,
+            job_type="FT",
+            experience_level="mid",
+        )
+
+    def listed(self, **params):
+        response = self.client.get(reverse("job"), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return {job["id"] for job in response.data["data"]}
+
+    def test_load_gazetteer_upserts(self):
+        count = Location.objects.count()
+        new_york = self.place("New York", "NY")
+        Location.objects.filter(pk=new_york.pk).update(population=1)
+        index = saved_search_percolator.index()
+        out = io.StringIO()
+        call_command("load_gazetteer", stdout=out)
+        self.assertIn("0 new, 1 updated", out.getvalue())
+        # Saved searches are bucketed by geocoded location
+        self.assertIsNot(saved_search_percolator.index(), index)
+        self.assertEqual(Location.objects.count(), count)
+        self.assertGreater(self.place("New York", "NY").population, 1)
+
+    def test_geocoding(self):
+        new_york = self.place("New York", "NY")
+        for text in ["NYC", "New York, NY", "new york", " New York, NY, USA "]:
+            self.assertEqual(location_gazetteer.geocode(text).id, new_york.id, text)
+        self.assertEqual(location_gazetteer.geocode("London").country_code, "GB")
+        self.assertEqual(location_gazetteer.geocode("London, ON").country_code, "CA")
+        self.assertEqual(location_gazetteer.geocode("Montréal, QC").name, "Montreal")
+        self.assertEqual(
+            location_gazetteer.geocode("Bangalore, India").name, "Bengaluru"
+        )
+        self.assertIsNone(location_gazetteer.geocode("London, TX"))
+        self.assertIsNone(location_gazetteer.geocode("Remote"))
+
+        self.employer.refresh_from_db()
+        self.assertEqual(self.employer.location_ref, new_york)
+        job = self.create_job("Boston, MA")
+        job.location = "Portland, ME"
+        job.save(update_fields=["location"])
+        job.refresh_from_db()
+        self.assertEqual(job.location_ref, self.place("Portland", "ME"))
+
+    def test_location_filter_matches_place(self):
+        new_york = [self.create_job(text).id for text in ["NYC", "New York, NY"]]
+        self.create_job("Boston, MA")
+        remote = self.create_job("Remote").id
+        self.assertEqual(self.listed(location="new york"), set(new_york))
+        self.assertEqual(self.listed(location="REMOTE"), {remote})
+
+    def test_radius_search(self):
+        nearby = [
+            self.create_job(text).id
+            for text in ["New York, NY", "Jersey City, NJ", "Hoboken", "Newark, NJ"]
+        ]
+        self.create_job("Stamford, CT")
+        self.create_job("Remote")
+        self.assertEqual(self.listed(near="NYC"), set(nearby))
+        self.assertEqual(len(self.listed(near="NYC", radius_km=60)), 5)
+
+        response = self.client.get(reverse("job"), {"near": "Atlantis"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_radius_matches_haversine(self):
+        places = list(Location.objects.values_list("id", "latitude", "longitude"))
+        rng = random.Random(3)
+        centers = [(-89.9, 0), (60, 179.9), (-36.8, -179.5), (40.7, -74.0)]
+        centers += [(rng.uniform(-80, 80), rng.uniform(-180, 180)) for _ in range(20)]
+        for latitude, longitude in centers:
+            radius = rng.choice([25, 500, 2000, 5000])
+            expected = {
+                location_id
+                for location_id, lat, lon in places
+                if haversine_km(latitude, longitude, lat, lon) <= radius
+            }
+            self.assertEqual(
+                set(locations_within(latitude, longitude, radius)), expected
+            )
+        # The box wraps around the antimeridian
+        self.assertIn(
+            self.place("Auckland", "AUK").id, locations_within(-36.8485, -179.0, 600)
+        )
+
+    def test_backfill(self):
+        job = self.create_job("Hyderabad")
+        Jobs.objects.update(location_ref=None)
+        EmployerProfile.objects.update(location_ref=None)
+        call_command("backfill_locations", stdout=io.StringIO())
+        job.refresh_from_db()
+        self.employer.refresh_from_db()
+        self.assertEqual(job.location_ref, self.place("Hyderabad", "TG"))
+        self.assertEqual(self.employer.location_ref, self.place("New York", "NY"))
+
+
+class JobSkillTaggingTest(APITestCase):
+    """Skills attached from job descriptions"""
+
+    def setUp(self):
+        self.user = User.objects.create(username=fake.user_name(), is_employer=True)
+        self.employer = EmployerProfile.objects.create(
+            user=self.user,
+            company_name="Acme",
+            company_website=fake.url(),
+            location="New York",
+            description="",
+        )
+        self.python = Skill.objects.create(name="Python")
+        self.django_skill = Skill.objects.create(name="Django")
+        self.sql = Skill.objects.create(name="SQL")
+        token = RefreshToken.for_user(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def job_data(self, **fields):
+        return {
+            "job_title": "Backend Engineer",
+            "description": "Python and Django services backed by SQL.",
+            "location": "New York, NY",
+            "salary_min": 70000,
+            "salary_max": 120000,
+            "job_type": "FT",
+            "experience_level": "mid",
+            "required_skills": [self.python.id],
+            **fields,
+        }
+
+    def test_auto_tag_on_create_and_update(self):
+        response = self.client.post(reverse("job"), self.job_data(), format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        plain = Jobs.objects.get()
+        self.assertEqual(list(plain.required_skills.all()), [self.python])
+
+        response = self.client.post(
+            reverse("job"),
+            self.job_data(
+                job_title="Data Engineer",
+                description="SQL pipelines, with Python and Django tooling.",
+                auto_tag_skills=True,
+            ),
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        tagged = Jobs.objects.exclude(pk=plain.pk).get()
+        self.assertEqual(
+            set(tagged.required_skills.all()),
+            {self.python, self.django_skill, self.sql},
+        )
+
+        # A partial update keeps the current skills and adds the named ones
+        serializer = JobSerializer(
+            plain,
+            data={"description": "Django and SQL", "auto_tag_skills": True},
+            partial=True,
+        )
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        serializer.save()
+        self.assertEqual(
+            set(plain.required_skills.all()),
+            {self.python, self.django_skill, self.sql},
+        )
+
+    def test_backfill_command(self):
+        fields = self.job_data()
+        fields.pop("required_skills")
+        job = Jobs.objects.create(employer=self.employer, **fields)
+        job.required_skills.set([self.python])
+        out = io.StringIO()
+        call_command("tag_job_skills", workers=0, stdout=out)
+        self.assertIn("2 skills missing from 1 jobs", out.getvalue())
+        self.assertEqual(list(job.required_skills.all()), [self.python])
+
+        call_command("tag_job_skills", workers=0, attach=True, stdout=out)
+        self.assertEqual(
+            set(job.required_skills.all()), {self.python, self.django_skill, self.sql}
+        )
+        job.refresh_from_db()
+        self.assertEqual(
+            bytes(job.skill_signature),
+            minhash([self.python.id, self.django_skill.id, self.sql.id]).tobytes(),
+        )
+
+
+class JobDuplicateTest(APITestCase):
+    """Near-duplicate postings by SimHash"""
+
+    description = (
+        "We are looking for a skilled software engineer to join our team. The "
+        "ideal candidate will be proficient in Python, Django, and web "
+        "development, and will review pull requests from their peers."
+    )
+
+    def setUp(self):
+        self.employers = []
+        for i in range(2):
+            user = User.objects.create(username=fake.user_name(), is_employer=True)
+            self.employers.append(
+                EmployerProfile.objects.create(
+                    user=user,
+                    company_name=f"Company {i}",
+                    company_website=fake.url(),
+                    location="New York",
+                    description="",
+                )
+            )
+        self.skill = Skill.objects.create(name="Python")
+
+    def post_job(self, employer, **fields):
+        token = RefreshToken.for_user(employer.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        data = {
+            "job_title": "Software Engineer",
+            "description": self.description,
+            "location": "New York, NY",
+            "salary_min": 70000,
+            "salary_max": 120000,
+            "job_type": "FT",
+            "experience_level": "mid",
+            "required_skills": [self.skill.id],
+            **fields,
+        }
+        return self.client.post(reverse("job"), data, format="json")
+
+    def test_simhash_distance(self):
+        original = simhash("Software Engineer", self.description)
+        edited = simhash(
+            "Software Engineer", self.description.replace("skilled", "talented")
+        )
+        other = simhash("Store Manager", "Run a busy retail store and its staff.")
+        self.assertEqual(simhash("", "  "), None)
+        self.assertEqual(
+            simhash("SOFTWARE ENGINEER", self.description.upper()), original
+        )
+        self.assertLessEqual(hamming(original, edited), 3)
+        self.assertGreater(hamming(original, other), 3)
+
+    def test_duplicates_rejected_or_flagged_on_create(self):
+        response = self.post_job(self.employers[0])
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        original = Jobs.objects.get()
+        self.assertIsNotNone(original.simhash)
+        self.assertIsNone(original.duplicate_of)
+
+        # The same employer reposting is rejected
+        response = self.post_job(
+            self.employers[0],
+            description=self.description.replace("skilled", "talented"),
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Jobs.objects.count(), 1)
+
+        # Another employer's copy is flagged
+        response = self.post_job(self.employers[1])
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        copy = Jobs.objects.exclude(pk=original.pk).get()
+        self.assertEqual(copy.duplicate_of, original)
+
+        # Closed jobs may be posted again
+        Jobs.objects.update(is_active=False)
+        response = self.post_job(self.employers[0])
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_fingerprint_follows_updates(self):
+        self.post_job(self.employers[0])
+        job = Jobs.objects.get()
+        serializer = JobSerializer(
+            job, data={"description": "Run a busy retail store."}, partial=True
+        )
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        serializer.save()
+        job.refresh_from_db()
+        self.assertEqual(
+            job.simhash & MASK, simhash("Software Engineer", "Run a busy retail store.")
+        )
+
+    def test_cluster_matches_pairwise_comparison(self):
+        rng = random.Random(7)
+        fingerprints = {}
+        for job_id in range(1, 401):
+            if job_id > 100 and rng.random() < 0.5:
+                fingerprint = fingerprints[rng.randrange(1, job_id)]
+                for bit in rng.sample(range(64), rng.randrange(4)):
+                    fingerprint ^= 1 << bit
+            else:
+                fingerprint = rng.getrandbits(64)
+            fingerprints[job_id] = fingerprint
+
+        parent = {job_id: job_id for job_id in fingerprints}
+
+        def find(job_id):
+            while parent[job_id] != job_id:
+                job_id = parent[job_id]
+            return job_id
+
+        for a in fingerprints:
+            for b in fingerprints:
+                if a < b and hamming(fingerprints[a], fingerprints[b]) <= 3:
+                    root_a, root_b = find(a), find(b)
+                    parent[max(root_a, root_b)] = min(root_a, root_b)
+        expected = {job_id: find(job_id) for job_id in fingerprints}
+        expected = {job_id: root for job_id, root in expected.items() if job_id != root}
+        self.assertTrue(expected)
+        self.assertEqual(cluster_fingerprints(fingerprints), expected)
+
+    def test_cluster_command(self):
+        jobs = [
+            Jobs.objects.create(
+                employer=self.employers[i % 2],
+                job_title="Software Engineer",
+                description=description,
+                location="New York, NY",
+                salary_min=70000,
+                salary_max=120000,
+                job_type="FT",
+                experience_level="mid",
+            )
+            for i, description in enumerate(
+                [
+                    self.description,
+                    "Run a busy retail store and its staff.",
+                    self.description.replace("skilled", "talented"),
+                    self.description,
+                ]
+            )
+        ]
+        Jobs.objects.filter(pk=jobs[1].pk).update(duplicate_of=jobs[0])
+
+        out = io.StringIO()
+        call_command("cluster_duplicate_jobs", dry_run=True, stdout=out)
+        self.assertIn("Would flag 2 and clear 1 jobs.", out.getvalue())
+        self.assertEqual(Jobs.objects.filter(simhash__isnull=True).count(), 0)
+
+        call_command("cluster_duplicate_jobs", stdout=out)
+        self.assertEqual(
+            dict(Jobs.objects.values_list("pk", "duplicate_of")),
+            {
+                jobs[0].pk: None,
+                jobs[1].pk: None,
+                jobs[2].pk: jobs[0].pk,
+                jobs[3].pk: jobs[0].pk,
+            },
+        )
+
+
+class NotificationTest(APITestCase):
+    """Notification list, mark read and unread count"""
+
+    def setUp(self):
+        self.user = User.objects.create(username=fake.user_name(), is_applicant=True)
+        self.other = User.objects.create(username=fake.user_name(), is_applicant=True)
+        token = RefreshToken.for_user(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def notify(self, user, count):
+        return create_notifications(
+            Notification(user=user, message=f"Message {i}") for i in range(count)
+        )
+
+    def test_unread_count_read_from_counter(self):
+        self.notify(self.user, 3)
+        self.notify(self.other, 1)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("notifications_unread_count"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["data"]["unread_count"], 3)
+        self.assertFalse(
+            any("COUNT(" in query["sql"].upper() for query in queries.captured_queries)
+        )
+
+    def test_mark_read(self):
+        notifications = self.notify(self.user, 3)
+        other = self.notify(self.other, 1)
+        url = reverse("notifications_read")
+
+        response = self.client.post(
+            url, {"ids": [notifications[0].id, other[0].id]}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["data"], {"read": 1, "unread_count": 2})
+
+        # Reading again does not count twice
+        response = self.client.post(url, {"ids": [notifications[0].id]}, format="json")
+        self.assertEqual(response.data["data"], {"read": 0, "unread_count": 2})
+
+        response = self.client.post(url, {}, format="json")
+        self.assertEqual(response.data["data"], {"read": 2, "unread_count": 0})
+        self.assertEqual(unread_count(self.other), 1)
+        self.assertFalse(Notification.objects.filter(user=self.user, is_read=False))
+
+        response = self.client.post(url, {"ids": []}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_keyset_pagination(self):
+        notifications = self.notify(self.user, 25)
+        self.notify(self.other, 5)
+        # Ties on created_at are broken by id
+        now = timezone.now()
+        for i, notification in enumerate(notifications):
+            Notification.objects.filter(pk=notification.pk).update(
+                created_at=now - timedelta(minutes=i // 3), is_read=i % 4 == 0
+            )
+        expected = list(
+            Notification.objects.filter(user=self.user)
+            .order_by("-created_at", "-id")
+            .values_list("id", "is_read")
+        )
+
+        for params, ids in (
+            ({}, [pk for pk, _ in expected]),
+            ({"unread_only": True}, [pk for pk, is_read in expected if not is_read]),
+        ):
+            seen, cursor = [], None
+            while True:
+                query = {**params, "limit": 7}
+                if cursor:
+                    query["cursor"] = cursor
+                response = self.client.get(reverse("notifications"), query)
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                seen += [n["id"] for n in response.data["data"]["results"]]
+                cursor = response.data["data"]["next_cursor"]
+                if cursor is None:
+                    break
+            self.assertEqual(seen, ids)
+
+        response = self.client.get(reverse("notifications"), {"cursor": "bogus"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
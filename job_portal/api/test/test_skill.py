@@ -0,0 +1,279 @@
+import random
+import re
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+from users.models import ApplicantProfile, Skill, SkillAlias, User
+from users.skill_tagger import SkillAutomaton, skill_tagger
+from users.skills import skill_autocomplete, skill_catalog
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+)
+class SkillCatalogTestSetup(APITestCase):
+    def setUp(self):
+        cache.clear()
+        # The snapshot outlives the rolled back test transactions
+        skill_catalog.invalidate()
+        self.catalog_url = reverse("skill_catalog")
+        self.resolve_url = reverse("skill_resolve")
+        self.python, self.django_skill = Skill.objects.bulk_create(
+            [Skill(name="Python"), Skill(name="Django")]
+        )
+
+    def authenticate(self):
+        user = User.objects.create_user(username="applicant", password="secret-pass")
+        token = RefreshToken.for_user(user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def test_catalog_not_modified_without_queries(self):
+        response = self.client.get(self.catalog_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data["data"],
+            [
+                {"id": self.python.id, "name": "Python"},
+                {"id": self.django_skill.id, "name": "Django"},
+            ],
+        )
+        etag = response["ETag"]
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.catalog_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+
+    def test_etag_changes_on_skill_write(self):
+        etag = self.client.get(self.catalog_url)["ETag"]
+        Skill.objects.create(name="Go")
+        response = self.client.get(self.catalog_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertIn("Go", [skill["name"] for skill in response.data["data"]])
+
+    def test_invalidate_bumps_shared_version(self):
+        snapshot = skill_catalog.snapshot()
+        version = skill_catalog.version()
+        skill_catalog.invalidate()
+        self.assertEqual(skill_catalog.version(), version + 1)
+        self.assertIsNot(skill_catalog.snapshot(), snapshot)
+
+        # Evicted counter starts over instead of failing the write
+        cache.delete(skill_catalog.cache_key)
+        with patch.object(cache, "add", return_value=False):
+            self.assertEqual(skill_catalog.bump_version(), 1)
+        self.assertEqual(skill_catalog.version(), 1)
+
+    def test_normalized_name_is_unique(self):
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Skill.objects.create(name="  PYTHON ")
+
+    def test_resolve_creates_missing_skills_once(self):
+        self.authenticate()
+        names = ["python", " Machine   Learning ", "PYTHON", "machine learning"]
+        with self.assertNumQueries(4):
+            # user lookup, catalog snapshot, insert and read back
+            response = self.client.post(
+                self.resolve_url, data={"names": names}, format="json"
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        created = Skill.objects.get(normalized_name="machine learning")
+        self.assertEqual(created.name, "Machine Learning")
+        self.assertEqual(
+            response.data["data"],
+            [
+                {"id": self.python.id, "name": "Python"},
+                {"id": created.id, "name": "Machine Learning"},
+            ],
+        )
+
+        with self.assertNumQueries(2):
+            response = self.client.post(
+                self.resolve_url, data={"names": names}, format="json"
+            )
+        self.assertEqual(len(response.data["data"]), 2)
+        self.assertEqual(Skill.objects.count(), 3)
+
+    def test_resolve_validation(self):
+        response = self.client.post(
+            self.resolve_url, data={"names": ["python"]}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        self.authenticate()
+        response = self.client.post(
+            self.resolve_url,
+            data={"names": [f"skill {i}" for i in range(101)]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.post(self.resolve_url, data={"names": []}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+)
+class SkillAutocompleteTestSetup(APITestCase):
+    def setUp(self):
+        cache.clear()
+        skill_autocomplete.invalidate()
+        self.autocomplete_url = reverse("skill_autocomplete")
+        self.python, self.pytorch, self.pyramid, self.ml = Skill.objects.bulk_create(
+            [
+                Skill(name="Python"),
+                Skill(name="PyTorch"),
+                Skill(name="Pyramid"),
+                Skill(name="Machine Learning"),
+            ]
+        )
+        for i, skills in enumerate([[self.pytorch], [self.pytorch, self.python]]):
+            user = User.objects.create_user(username=f"applicant{i}", password="x")
+            profile = ApplicantProfile.objects.create(
+                user=user, phone_number="1245125412", address="Street"
+            )
+            profile.skills.set(skills)
+
+    def complete(self, q, **params):
+        response = self.client.get(self.autocomplete_url, {"q": q, **params})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [skill["name"] for skill in response.data["data"]]
+
+    def test_prefix_ranked_by_popularity(self):
+        self.assertEqual(self.complete("PYT"), ["PyTorch", "Python"])
+        self.assertEqual(self.complete("py", limit=2), ["PyTorch", "Python"])
+        self.assertEqual(self.complete("learn"), ["Machine Learning"])
+        self.assertEqual(self.complete("rust"), [])
+
+    def test_served_from_memory(self):
+        self.complete("py")
+        with self.assertNumQueries(0):
+            self.assertEqual(self.complete("pyr"), ["Pyramid"])
+
+    def test_incremental_updates(self):
+        self.complete("py")
+        self.pyramid.applicants.add(*ApplicantProfile.objects.all())
+        # two applicants now list Pyramid, as many as PyTorch
+        with self.assertNumQueries(0):
+            self.assertEqual(self.complete("py"), ["Pyramid", "PyTorch", "Python"])
+
+        self.pyramid.name = "Rust"
+        self.pyramid.save()
+        Skill.objects.create(name="Pydantic")
+        with self.assertNumQueries(0):
+            self.assertEqual(self.complete("py"), ["PyTorch", "Python", "Pydantic"])
+            self.assertEqual(self.complete("ru"), ["Rust"])
+
+        self.pytorch.delete()
+        self.assertEqual(self.complete("pyt"), ["Python"])
+
+    def test_catalog_version_change_rebuilds(self):
+        self.complete("py")
+        skill_catalog.resolve(["Pygame"])
+        self.assertIn("Pygame", self.complete("pyg"))
+
+
+def naive_tags(names, text):
+    """Every whole word occurrence of every name, leftmost-longest"""
+    text = " ".join(text.split()).casefold()
+    matches = []
+    for skill_id, name in names:
+        pattern = re.escape(" ".join(name.split()).casefold())
+        for match in re.finditer(f"(?=({pattern}))", text):
+            start, end = match.start(1), match.end(1)
+            if (start and text[start - 1 : start + 1].replace("_", "a").isalnum()) or (
+                end < len(text) and text[end - 1 : end + 1].replace("_", "a").isalnum()
+            ):
+                continue
+            matches.append((start, end, skill_id))
+    selected, position = [], 0
+    for start, end, skill_id in sorted(matches, key=lambda m: (m[0], -m[1])):
+        if start >= position:
+            selected.append(skill_id)
+            position = end
+    return list(dict.fromkeys(selected))
+
+
+class SkillTaggerTestSetup(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.python = Skill.objects.create(name="Python")
+        self.cpp = Skill.objects.create(name="C++")
+        self.c = Skill.objects.create(name="C")
+        self.go = Skill.objects.create(name="Go")
+        self.ml = Skill.objects.create(name="Machine  Learning")
+        self.js = Skill.objects.create(name="JavaScript")
+        self.java = Skill.objects.create(name="Java")
+        SkillAlias.objects.create(skill=self.js, name="JS")
+
+    def test_tagging(self):
+        text = (
+            "We need good C++ and Python engineers. JS, java and some\n"
+            "machine learning; C is a plus. Go-getters welcome!"
+        )
+        self.assertEqual(
+            skill_tagger.skill_ids(text),
+            [
+                self.cpp.id,
+                self.python.id,
+                self.js.id,
+                self.java.id,
+                self.ml.id,
+                self.c.id,
+                self.go.id,
+            ],
+        )
+        self.assertEqual(skill_tagger.skill_ids("Pythonista, Javanese, CSS"), [])
+
+    def test_automaton_matches_naive_scan(self):
+        rng = random.Random(7)
+        alphabet = "ab c+.#"
+        names = list(
+            enumerate(
+                {
+                    "".join(
+                        rng.choice(alphabet) for _ in range(rng.randint(1, 4))
+                    ).strip()
+                    or "a"
+                    for _ in range(60)
+                }
+            )
+        )
+        automaton = SkillAutomaton(names)
+        for _ in range(300):
+            text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 40)))
+            self.assertEqual(automaton.skill_ids(text), naive_tags(names, text), text)
+
+    def test_rebuilt_when_skills_change(self):
+        self.assertEqual(skill_tagger.skill_ids("Rust and Golang"), [])
+        rust = Skill.objects.create(name="Rust")
+        SkillAlias.objects.create(skill=self.go, name="golang")
+        self.assertEqual(
+            skill_tagger.skill_ids("Rust and Golang"), [rust.id, self.go.id]
+        )
+
+    def test_tag_endpoint(self):
+        response = self.client.post(reverse("skill_tag"), {"text": "Python"})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        user = User.objects.create_user(username="employer", password="secret-pass")
+        token = RefreshToken.for_user(user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        response = self.client.post(
+            reverse("skill_tag"), {"text": "Senior JS developer, Python a plus"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data["data"],
+            [
+                {"id": self.js.id, "name": "JavaScript"},
+                {"id": self.python.id, "name": "Python"},
+            ],
+        )
@@ -1,10 +1,45 @@
+import fcntl
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import Future
+from datetime import timedelta
+from io import BytesIO, StringIO
 from unittest.mock import patch
 
+from django.conf import settings
+from django.core.cache import cache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import IntegrityError, connection, transaction
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils.http import http_date
 from django.urls import reverse
+from django.utils import timezone
 from faker import Faker
 from rest_framework import status
-from rest_framework.test import APIClient, APITestCase
-from users.models import Skill
+from rest_framework.test import APIClient, APIRequestFactory, APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+from api.middleware.api_logging_middleware import APILoggingMiddleware
+from api.throttling import JobApplicationRateThrottle, LoginRateThrottle
+from jobs.models import JobApplication, Jobs
+from users import profile_cache, uploads
+from users.hashing import HashingPoolSaturated, PasswordHashingService
+from users.last_login import LastLoginWriter
+from users.models import (
+    ApplicantProfile,
+    EmployerProfile,
+    ResumeText,
+    ResumeUploadSession,
+    Skill,
+    User,
+)
+from users.resume_text import process_resume
+from users.storage import digest_from_name
 
 fake = Faker()
 
@@ -930,3 +965,942 @@ class EmployerProfileTestSetup(APITestCase):
         )
         self.assertEqual(response.status_code, status.HTTP_500_INTERNAL_SERVER_ERROR)
         self.assertEqual(response.data["status"], "error")
+
+
+class PasswordHashingTestSetup(APITestCase):
+    def setUp(self):
+        self.register_url = reverse("register")
+        self.login_url = reverse("login")
+        self.user_data = {
+            "first_name": fake.first_name(),
+            "last_name": fake.last_name(),
+            "username": fake.user_name(),
+            "password": fake.password(),
+            "email": fake.email(),
+            "user_type": "Applicant",
+        }
+
+    def test_inline_service_hashes_and_verifies(self):
+        """Inline service produces hashes the default hasher accepts"""
+        service = PasswordHashingService(max_workers=0, max_pending=2)
+        encoded = service.make_password("s3cret-pass")
+        self.assertTrue(service.check_password("s3cret-pass", encoded))
+        self.assertFalse(service.check_password("wrong-pass", encoded))
+        stats = service.stats()
+        self.assertEqual(stats["completed"], 3)
+        self.assertEqual(stats["pending"], 0)
+
+    def test_saturated_service_rejects_immediately(self):
+        """Timed out jobs hold their slot until done; more jobs are rejected"""
+        service = PasswordHashingService(max_workers=1, max_pending=1)
+        self.addCleanup(service.shutdown)
+        # Start the worker so the next job runs rather than waits in the queue
+        service._run(time.sleep, 0)
+        service.timeout = 0.05
+        with self.assertRaises(HashingPoolSaturated):
+            service._run(time.sleep, 1)
+        stats = service.stats()
+        self.assertEqual(stats["timed_out"], 1)
+        self.assertEqual(stats["pending"], 1)
+        self.assertEqual(stats["saturation"], 1.0)
+
+        with self.assertRaises(HashingPoolSaturated):
+            service.make_password("s3cret-pass")
+        self.assertEqual(service.stats()["rejected"], 1)
+
+        deadline = time.monotonic() + 30
+        while service.stats()["pending"] and time.monotonic() < deadline:
+            time.sleep(0.05)
+        stats = service.stats()
+        self.assertEqual(stats["pending"], 0)
+        # The warm-up job; the timed out one is not counted again
+        self.assertEqual(stats["completed"], 1)
+        self.assertEqual(stats["timed_out"], 1)
+
+    def test_timed_out_jobs_release_their_slot_once(self):
+        """Cancelled and late finishing jobs free their slot as timed out"""
+        queued, running = Future(), Future()
+        running.set_running_or_notify_cancel()
+        futures = iter([queued, running])
+
+        class Executor:
+            def submit(self, func, *args):
+                return next(futures)
+
+        service = PasswordHashingService(max_workers=1, max_pending=2, timeout=0.01)
+        service._executor = Executor()
+        with self.assertRaises(HashingPoolSaturated):
+            service.make_password("s3cret-pass")
+        self.assertTrue(queued.cancelled())
+        stats = service.stats()
+        self.assertEqual(stats["pending"], 0)
+        self.assertEqual(stats["timed_out"], 1)
+        self.assertEqual(stats["cancelled"], 0)
+
+        with self.assertRaises(HashingPoolSaturated):
+            service.make_password("s3cret-pass")
+        self.assertEqual(service.stats()["pending"], 1)
+        running.set_result("encoded")
+        stats = service.stats()
+        self.assertEqual(stats["pending"], 0)
+        self.assertEqual(stats["timed_out"], 2)
+        self.assertEqual(stats["completed"], 0)
+        self.assertEqual(stats["submitted"], 2)
+
+    @patch("users.hashing.hashing_service.make_password")
+    def test_register_when_pool_saturated(self, mock_make_password):
+        """Registration is shed with 503 when hashing is saturated"""
+        mock_make_password.side_effect = HashingPoolSaturated()
+        response = self.client.post(self.register_url, data=self.user_data)
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(response["Retry-After"], "1")
+
+    def test_login_when_pool_saturated(self):
+        """Login is shed with 503 when hashing is saturated"""
+        response = self.client.post(self.register_url, data=self.user_data)
+        self.assertEqual(response.status_code, 201)
+        with patch("users.hashing.hashing_service.check_password") as mock_check:
+            mock_check.side_effect = HashingPoolSaturated()
+            response = self.client.post(
+                self.login_url,
+                data={
+                    "username": self.user_data["username"],
+                    "password": self.user_data["password"],
+                },
+            )
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+
+
+class ImportUsersCommandTestSetup(APITestCase):
+    def test_import_users_from_csv(self):
+        """Valid rows are bulk inserted with profiles, invalid rows reported"""
+        python = Skill.objects.create(name="Python")
+        rows = (
+            "username,email,first_name,last_name,password,user_type,"
+            "phone_number,address,skills,company_name,company_website,location,"
+            "description\n"
+            "imp_alice,alice@example.com,Alice,A,Secret-pass-1,Applicant,"
+            "1234567890,1 Road,python,,,,\n"
+            "imp_bob,bob@example.com,Bob,B,Secret-pass-2,Employer,,,,Acme,"
+            "https://acme.example.com,New York,Widgets\n"
+            "imp_carl,carl@example.com,Carl,C,Secret-pass-3,Applicant,123,"
+            "1 Road,,,,,\n"
+        )
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False) as f:
+            f.write(rows)
+        self.addCleanup(os.remove, f.name)
+
+        stdout, stderr = StringIO(), StringIO()
+        call_command("import_users", f.name, workers=1, stdout=stdout, stderr=stderr)
+
+        alice = User.objects.get(username="imp_alice")
+        self.assertTrue(alice.is_applicant)
+        self.assertTrue(alice.check_password("Secret-pass-1"))
+        self.assertEqual(list(alice.applicant_profile.skills.all()), [python])
+        self.assertTrue(EmployerProfile.objects.filter(user__username="imp_bob"))
+        self.assertFalse(User.objects.filter(username="imp_carl").exists())
+        self.assertIn("line 4", stderr.getvalue())
+        self.assertIn("2 imported, 1 rejected", stdout.getvalue())
+
+
+class RegisterWithProfileTestSetup(APITestCase):
+    def setUp(self):
+        self.url = reverse("register_with_profile")
+        self.employer_profile_url = reverse("employer_profile")
+        self.applicant_profile_url = reverse("applicant_profile")
+        self.user_data = {
+            "first_name": fake.first_name(),
+            "last_name": fake.last_name(),
+            "username": fake.user_name(),
+            "password": fake.password(),
+            "email": fake.email(),
+        }
+
+    def test_register_employer_with_profile(self):
+        """User and profile are inserted once each and tokens returned"""
+        data = {
+            **self.user_data,
+            "user_type": "Employer",
+            "company_name": fake.company(),
+            "company_website": fake.url(),
+            "location": fake.city(),
+            "description": fake.address(),
+        }
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(self.url, data=data)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        statements = [query["sql"] for query in queries.captured_queries]
+        self.assertFalse([sql for sql in statements if sql.startswith("UPDATE")])
+        for table in ("users_user", "users_employerprofile"):
+            prefix = f"INSERT INTO {connection.ops.quote_name(table)}"
+            inserts = [sql for sql in statements if sql.startswith(prefix)]
+            self.assertEqual(len(inserts), 1, table)
+
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {response.data['data']['access']}"
+        )
+        response = self.client.get(self.employer_profile_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["data"]["company_name"], data["company_name"])
+
+    def test_register_applicant_with_profile(self):
+        """Applicant profile is created with its skills"""
+        skills = Skill.objects.bulk_create([Skill(name="python"), Skill(name="go")])
+        data = {
+            **self.user_data,
+            "user_type": "Applicant",
+            "phone_number": "1245125412",
+            "address": fake.address(),
+            "skills": [skill.id for skill in skills],
+            "resume_file": SimpleUploadedFile(
+                "resume.pdf", b"%PDF-1.4 resume", content_type="application/pdf"
+            ),
+        }
+        response = self.client.post(self.url, data=data, format="multipart")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        user = User.objects.get(username=self.user_data["username"])
+        self.assertTrue(user.is_applicant)
+        self.assertEqual(user.applicant_profile.skills.count(), 2)
+
+    def test_register_with_invalid_profile_creates_nothing(self):
+        """Profile errors are reported and no user is created"""
+        data = {
+            **self.user_data,
+            "user_type": "Employer",
+            "company_name": fake.company(),
+            "company_website": "invalid_url",
+        }
+        response = self.client.post(self.url, data=data)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("company_website", response.data["errors"])
+        self.assertIn("location", response.data["errors"])
+        self.assertFalse(
+            User.objects.filter(username=self.user_data["username"]).exists()
+        )
+
+
+THROTTLE_TEST_SETTINGS = {
+    "CACHES": {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+    "REST_FRAMEWORK": {
+        **settings.REST_FRAMEWORK,
+        "DEFAULT_THROTTLE_RATES": {"login": "2/min", "register": "1/min"},
+    },
+}
+
+
+@override_settings(**THROTTLE_TEST_SETTINGS)
+class ThrottlingTestSetup(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.login_url = reverse("login")
+        self.register_url = reverse("register")
+        self.credentials = {"username": "nobody", "password": "wrong-pass"}
+
+    def test_login_throttled_without_queries(self):
+        """Requests over the quota are rejected before any DB work"""
+        for _ in range(2):
+            response = self.client.post(self.login_url, data=self.credentials)
+            self.assertEqual(response.status_code, 401)
+
+        with self.assertNumQueries(0):
+            response = self.client.post(self.login_url, data=self.credentials)
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(response.data["status"], "error")
+        self.assertIn("Retry-After", response)
+
+    def test_quota_is_per_ip(self):
+        """Another client IP has its own quota"""
+        data = {"username": fake.user_name(), "user_type": "Applicant"}
+        self.client.post(self.register_url, data=data)
+        response = self.client.post(self.register_url, data=data)
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+        response = self.client.post(
+            self.register_url, data=data, REMOTE_ADDR="10.0.0.2"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_forwarded_for_not_trusted(self):
+        """A client cannot pick a fresh quota through X-Forwarded-For"""
+        data = {"username": fake.user_name(), "user_type": "Applicant"}
+        self.client.post(self.register_url, data=data, HTTP_X_FORWARDED_FOR="1.1.1.1")
+        response = self.client.post(
+            self.register_url, data=data, HTTP_X_FORWARDED_FOR="2.2.2.2"
+        )
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    def test_concurrent_requests_share_the_quota(self):
+        """Parallel requests cannot all slip under the limit"""
+        barrier = threading.Barrier(10)
+        allowed = []
+
+        def attempt():
+            request = APIRequestFactory().post("/", REMOTE_ADDR="10.0.0.3")
+            throttle = LoginRateThrottle()
+            barrier.wait()
+            allowed.append(throttle.allow_request(request, None))
+
+        def slow_get(cache, *args, **kwargs):
+            # Widen the gap between reading a count and acting on it
+            time.sleep(0.01)
+            return get(cache, *args, **kwargs)
+
+        get = LocMemCache.get
+        with patch("api.throttling.time.time", return_value=6000.0), patch.object(
+            LocMemCache, "get", slow_get
+        ):
+            threads = [threading.Thread(target=attempt) for _ in range(10)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(allowed.count(True), 2)
+        self.assertEqual(allowed.count(False), 8)
+
+    def test_user_throttle_identifies_token_user(self):
+        """Per-user quotas key on the token's user id"""
+        user = User.objects.create(username=fake.user_name())
+        token = RefreshToken.for_user(user).access_token
+        request = APIRequestFactory().post("/", HTTP_AUTHORIZATION=f"Bearer {token}")
+        throttle = JobApplicationRateThrottle()
+        self.assertEqual(throttle.get_ident_key(request, None), f"user:{user.id}")
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+)
+class ProfileCacheTestSetup(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.applicant_profile_url = reverse("applicant_profile")
+        self.employer_profile_url = reverse("employer_profile")
+
+    def register(self, data):
+        user_data = {
+            "first_name": fake.first_name(),
+            "last_name": fake.last_name(),
+            "username": fake.user_name(),
+            "password": fake.password(),
+            "email": fake.email(),
+        }
+        response = self.client.post(
+            reverse("register_with_profile"),
+            data={**user_data, **data},
+            format="multipart",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {response.data['data']['access']}"
+        )
+        return User.objects.get(username=user_data["username"])
+
+    def test_employer_profile_served_from_cache_and_invalidated_on_put(self):
+        """A cache hit only costs the token user lookup"""
+        self.register(
+            {
+                "user_type": "Employer",
+                "company_name": "Acme",
+                "company_website": fake.url(),
+                "location": fake.city(),
+                "description": fake.address(),
+            }
+        )
+        self.client.get(self.employer_profile_url)
+        with self.assertNumQueries(1):
+            response = self.client.get(self.employer_profile_url)
+        self.assertEqual(response.data["data"]["company_name"], "Acme")
+
+        self.client.put(self.employer_profile_url, data={"company_name": "Globex"})
+        response = self.client.get(self.employer_profile_url)
+        self.assertEqual(response.data["data"]["company_name"], "Globex")
+
+    def test_stale_load_not_served_after_invalidation(self):
+        """A GET that loaded before a PUT cannot store its copy for later"""
+        data, version = profile_cache.get_cached_profile(profile_cache.EMPLOYER, 7)
+        self.assertIsNone(data)
+        profile_cache.invalidate_profile(profile_cache.EMPLOYER, 7)
+        profile_cache.set_cached_profile(
+            profile_cache.EMPLOYER, 7, {"company_name": "Acme"}, version
+        )
+        data, version = profile_cache.get_cached_profile(profile_cache.EMPLOYER, 7)
+        self.assertIsNone(data)
+
+        profile_cache.set_cached_profile(
+            profile_cache.EMPLOYER, 7, {"company_name": "Globex"}, version
+        )
+        self.assertEqual(
+            profile_cache.get_cached_profile(profile_cache.EMPLOYER, 7),
+            ({"company_name": "Globex"}, version),
+        )
+
+    def test_applicant_profile_invalidated_on_skills_change(self):
+        """Skills changed outside the view are not served stale"""
+        python, django_skill = Skill.objects.bulk_create(
+            [Skill(name="python"), Skill(name="django")]
+        )
+        user = self.register(
+            {
+                "user_type": "Applicant",
+                "phone_number": "1245125412",
+                "address": fake.address(),
+                "skills": [python.id],
+                "resume_file": SimpleUploadedFile(
+                    "resume.pdf", b"%PDF-1.4 resume", content_type="application/pdf"
+                ),
+            }
+        )
+        response = self.client.get(self.applicant_profile_url)
+        self.assertEqual(response.data["data"]["skills"], [python.id])
+
+        django_skill.applicants.add(user.applicant_profile)
+        response = self.client.get(self.applicant_profile_url)
+        self.assertEqual(
+            sorted(response.data["data"]["skills"]), [python.id, django_skill.id]
+        )
+
+
+class LastLoginWriterTestSetup(APITestCase):
+    def test_login_records_last_login(self):
+        """Token logins still set last_login"""
+        user = User.objects.create_user(username=fake.user_name(), password="Pass-123x")
+        response = self.client.post(
+            reverse("login"), data={"username": user.username, "password": "Pass-123x"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        user.refresh_from_db()
+        self.assertIsNotNone(user.last_login)
+
+    def test_pending_logins_flushed_in_one_update(self):
+        """Repeated logins coalesce and are written by a single UPDATE"""
+        first = User.objects.create(username=fake.user_name())
+        second = User.objects.create(username=fake.user_name())
+        writer = LastLoginWriter(flush_interval=3600)
+        writer._start = lambda: None
+        earlier = timezone.now() - timedelta(minutes=5)
+        later = timezone.now()
+        writer.record(first.pk, earlier)
+        writer.record(first.pk, later)
+        writer.record(second.pk, earlier)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(writer.flush(), 2)
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual(first.last_login, later)
+        self.assertEqual(second.last_login, earlier)
+        self.assertEqual(writer.flush(), 0)
+
+
+class EmailLookupTestSetup(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="email_user", email="Jane.Doe@Example.com", password="Pass-123x"
+        )
+
+    def test_email_normalized_on_save(self):
+        self.assertEqual(self.user.email_normalized, "jane.doe@example.com")
+        self.user.email = "JANE@example.org"
+        self.user.save(update_fields=["email"])
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.email_normalized, "jane@example.org")
+        # Blank emails are stored as NULL and never collide
+        User.objects.create_user(username="no_email_1")
+        User.objects.create_user(username="no_email_2")
+
+    def test_register_with_duplicate_email(self):
+        response = self.client.post(
+            reverse("register"),
+            data={
+                "first_name": fake.first_name(),
+                "last_name": fake.last_name(),
+                "username": fake.user_name(),
+                "password": fake.password(),
+                "email": " JANE.DOE@example.COM",
+                "user_type": "Applicant",
+            },
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("email", response.data["errors"])
+
+    def test_login_with_email(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(
+                reverse("login"),
+                data={"username": "jane.doe@EXAMPLE.com", "password": "Pass-123x"},
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("access", response.data)
+        lookups = [q["sql"] for q in queries if q["sql"].startswith("SELECT")]
+        self.assertEqual(len(lookups), 1)
+
+        response = self.client.post(
+            reverse("login"),
+            data={"username": "jane.doe@example.com", "password": "wrong"},
+        )
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_username_match_wins_over_email(self):
+        other = User.objects.create_user(
+            username="jane.doe@example.com", password="Other-123x"
+        )
+        response = self.client.post(
+            reverse("login"),
+            data={"username": "jane.doe@example.com", "password": "Other-123x"},
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(RefreshToken(response.data["refresh"])["user_id"], other.pk)
+
+    def test_backfill_email_normalized(self):
+        second = User.objects.create_user(username="second", email="Second@x.com")
+        duplicate = User.objects.create_user(username="dup", email="dup@x.com")
+        User.objects.update(email_normalized=None)
+        User.objects.filter(pk=duplicate.pk).update(email="jane.doe@EXAMPLE.com")
+
+        stdout, stderr = StringIO(), StringIO()
+        call_command(
+            "backfill_email_normalized", chunk_size=2, stdout=stdout, stderr=stderr
+        )
+        self.assertEqual(
+            dict(User.objects.values_list("username", "email_normalized")),
+            {
+                "email_user": "jane.doe@example.com",
+                "second": "second@x.com",
+                "dup": None,
+            },
+        )
+        self.assertIn(f"User {duplicate.pk}", stderr.getvalue())
+        self.assertIn("2 updated, 1 conflicts", stdout.getvalue())
+
+        # Saving the duplicate keeps it empty instead of hitting the index
+        duplicate = User.objects.get(pk=duplicate.pk)
+        duplicate.set_password("new-password")
+        duplicate.save()
+        duplicate.first_name = "Jane"
+        duplicate.save(update_fields=["first_name", "email"])
+        duplicate.refresh_from_db()
+        self.assertIsNone(duplicate.email_normalized)
+        self.assertTrue(duplicate.check_password("new-password"))
+
+        # Changing it to another user's email is still rejected
+        for user in (duplicate, User.objects.create_user(username="blank")):
+            user.email = "SECOND@x.com"
+            with self.assertRaises(IntegrityError), transaction.atomic():
+                user.save()
+
+
+class ResumeUploadTestSetup(APITestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        settings_override = override_settings(
+            RESUME_UPLOAD_TEMP_DIR=temp_dir.name, RESUME_MAX_SIZE=512 * 1024
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.user = User.objects.create_user(
+            username=fake.user_name(), password="Pass-123x", is_applicant=True
+        )
+        token = RefreshToken.for_user(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        # Spans several 64 KiB blocks
+        self.content = b"%PDF-1.4\n" + os.urandom(200 * 1024)
+
+    def start_upload(self, size=None, filename="resume.pdf"):
+        response = self.client.post(
+            reverse("resume_upload_create"),
+            data={"filename": filename, "size": size or len(self.content)},
+        )
+        return response
+
+    def put_chunk(self, upload_id, start, end):
+        return self.client.put(
+            reverse("resume_upload", args=[upload_id]),
+            data=self.content[start : end + 1],
+            content_type="application/octet-stream",
+            HTTP_CONTENT_RANGE=f"bytes {start}-{end}/{len(self.content)}",
+        )
+
+    def create_profile(self, **data):
+        return ApplicantProfile.objects.create(
+            user=self.user, phone_number="1245125412", address="Street", **data
+        )
+
+    def test_chunked_upload_attached_to_profile(self):
+        profile = self.create_profile()
+        upload_id = self.start_upload().data["data"]["id"]
+        middle = 100 * 1024
+
+        response = self.put_chunk(upload_id, 0, middle - 1)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["data"]["received"], middle)
+
+        # A retried chunk from the wrong offset tells the client where to resume
+        response = self.put_chunk(upload_id, 0, middle - 1)
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response.data["errors"], {"received": middle})
+
+        response = self.put_chunk(upload_id, middle, len(self.content) - 1)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["data"]["status"], "completed")
+
+        profile.refresh_from_db()
+        with profile.resume_file.open("rb") as f:
+            self.assertEqual(f.read(), self.content)
+        self.assertEqual(os.listdir(settings.RESUME_UPLOAD_TEMP_DIR), [])
+        self.assertFalse(ResumeUploadSession.objects.exists())
+
+    def test_dropped_connection_resumes_from_received_bytes(self):
+        response = self.start_upload()
+        session = ResumeUploadSession.objects.get(pk=response.data["data"]["id"])
+        # Only 70 KiB of the announced chunk arrive
+        written = uploads.write_chunk(
+            session,
+            BytesIO(self.content[: 70 * 1024]),
+            f"bytes 0-{len(self.content) - 1}/{len(self.content)}",
+        )
+        self.assertEqual(written, 70 * 1024)
+
+        response = self.client.get(reverse("resume_upload", args=[session.pk]))
+        self.assertEqual(response.data["data"]["received"], 70 * 1024)
+        response = self.put_chunk(session.pk, 70 * 1024, len(self.content) - 1)
+        self.assertEqual(response.data["data"]["status"], "completed")
+
+        # Without a profile the upload is attached when the profile is created
+        response = self.client.post(
+            reverse("applicant_profile"),
+            data={
+                "phone_number": "1245125412",
+                "address": fake.address(),
+                "skills": [],
+                "resume_upload": session.pk,
+            },
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        with self.user.applicant_profile.resume_file.open("rb") as f:
+            self.assertEqual(f.read(), self.content)
+
+    def test_concurrent_writer_rejected(self):
+        upload_id = self.start_upload().data["data"]["id"]
+        middle = 100 * 1024
+        self.put_chunk(upload_id, 0, middle - 1)
+        session = ResumeUploadSession.objects.get(pk=upload_id)
+
+        # A request still streaming the next chunk holds the part file
+        with open(uploads.part_path(session), "r+b") as part:
+            fcntl.flock(part, fcntl.LOCK_EX)
+            response = self.put_chunk(upload_id, middle, len(self.content) - 1)
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response.data["errors"], {"received": middle})
+        self.assertEqual(os.path.getsize(uploads.part_path(session)), middle)
+
+        response = self.put_chunk(upload_id, middle, len(self.content) - 1)
+        self.assertEqual(response.data["data"]["status"], "completed")
+
+    def test_non_pdf_rejected_on_first_chunk(self):
+        self.content = b"MZ\x90\x00" + self.content[4:]
+        upload_id = self.start_upload().data["data"]["id"]
+        response = self.put_chunk(upload_id, 0, 1023)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        session = ResumeUploadSession.objects.get(pk=upload_id)
+        self.assertEqual(session.status, "failed")
+        self.assertEqual(os.listdir(settings.RESUME_UPLOAD_TEMP_DIR), [])
+
+    def test_upload_limits(self):
+        response = self.start_upload(size=512 * 1024 + 1)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.start_upload(filename="resume.exe")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        upload_id = self.start_upload().data["data"]["id"]
+        response = self.client.put(
+            reverse("resume_upload", args=[upload_id]),
+            data=b"%PDF-",
+            content_type="application/octet-stream",
+            HTTP_CONTENT_RANGE="bytes 0-4/5",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_binary_bodies_not_read_by_logging_middleware(self):
+        request = APIRequestFactory().put(
+            "/", data=self.content, content_type="application/octet-stream"
+        )
+        self.assertEqual(
+            APILoggingMiddleware.describe_body(request),
+            f"<{len(self.content)} bytes of application/octet-stream>",
+        )
+        self.assertFalse(request._read_started)
+
+
+class ContentAddressedStorageTestSetup(APITestCase):
+    def setUp(self):
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        settings_override = override_settings(
+            MEDIA_ROOT=media_root.name, FILE_UPLOAD_MAX_MEMORY_SIZE=1024
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.content = b"%PDF-1.4\n" + os.urandom(4096)
+        self.digest = hashlib.sha256(self.content).hexdigest()
+
+    def create_profile(self, content, content_type="application/pdf"):
+        user = User.objects.create_user(username=fake.user_name(), is_applicant=True)
+        return ApplicantProfile.objects.create(
+            user=user,
+            phone_number="1245125412",
+            address="Street",
+            resume_file=SimpleUploadedFile("CV Final.PDF", content, content_type),
+        )
+
+    def blob_files(self):
+        return sorted(
+            os.path.relpath(os.path.join(root, name), settings.MEDIA_ROOT)
+            for root, _, names in os.walk(settings.MEDIA_ROOT)
+            for name in names
+        )
+
+    def test_identical_uploads_stored_once(self):
+        # Spooled to disk while hashing, above FILE_UPLOAD_MAX_MEMORY_SIZE
+        first = self.create_profile(self.content)
+        second = self.create_profile(self.content)
+        name = f"resumes/{self.digest[:2]}/{self.digest}.pdf"
+        self.assertEqual(first.resume_file.name, name)
+        self.assertEqual(second.resume_file.name, name)
+        self.assertEqual(digest_from_name(name), self.digest)
+        self.assertEqual(self.blob_files(), [name])
+
+        # Small files are hashed in memory before anything is written
+        small = self.create_profile(b"%PDF-1.4 small")
+        self.assertEqual(len(self.blob_files()), 2)
+        with small.resume_file.open("rb") as f:
+            self.assertEqual(f.read(), b"%PDF-1.4 small")
+
+    def test_gc_deletes_unreferenced_blobs(self):
+        kept = self.create_profile(self.content)
+        orphan = self.create_profile(b"%PDF-1.4 replaced")
+        orphan_name = orphan.resume_file.name
+        orphan.resume_file = kept.resume_file.name
+        orphan.save()
+
+        stdout = StringIO()
+        call_command("gc_resumes", grace_hours=0, dry_run=True, stdout=stdout)
+        self.assertIn("2 blobs, 1 referenced by 2 profiles", stdout.getvalue())
+        self.assertIn(orphan_name, self.blob_files())
+
+        call_command("gc_resumes", grace_hours=1, stdout=StringIO())
+        self.assertIn(orphan_name, self.blob_files())
+
+        call_command("gc_resumes", grace_hours=0, stdout=StringIO())
+        self.assertEqual(self.blob_files(), [kept.resume_file.name])
+
+
+class ResumeTextTestSetup(APITestCase):
+    def setUp(self):
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        settings_override = override_settings(MEDIA_ROOT=media_root.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        extractor = patch(
+            "users.resume_text.extract_pdf_text",
+            return_value=("Python developer", 2),
+        )
+        self.extract = extractor.start()
+        self.addCleanup(extractor.stop)
+
+    def create_profile(self, content=b"%PDF-1.4 resume"):
+        user = User.objects.create_user(username=fake.user_name(), is_applicant=True)
+        with self.captureOnCommitCallbacks(execute=True):
+            return ApplicantProfile.objects.create(
+                user=user,
+                phone_number="1245125412",
+                address="Street",
+                resume_file=SimpleUploadedFile("cv.pdf", content, "application/pdf"),
+            )
+
+    def test_text_extracted_after_upload(self):
+        profile = self.create_profile()
+        resume_text = ResumeText.objects.get(profile=profile)
+        self.assertEqual(resume_text.status, ResumeText.STATUS_EXTRACTED)
+        self.assertEqual(resume_text.text, "Python developer")
+        self.assertEqual(resume_text.page_count, 2)
+        self.assertEqual(
+            resume_text.sha256, hashlib.sha256(b"%PDF-1.4 resume").hexdigest()
+        )
+
+    def test_unchanged_resume_not_extracted_again(self):
+        profile = self.create_profile()
+        self.assertEqual(process_resume(profile.pk), "skipped")
+        # Same file uploaded by someone else reuses the text
+        other = self.create_profile()
+        self.assertEqual(other.resume_text.text, "Python developer")
+        self.assertEqual(self.extract.call_count, 1)
+
+        self.assertEqual(process_resume(profile.pk, force=True), "extracted")
+        self.assertEqual(self.extract.call_count, 2)
+
+    def test_failed_extraction_recorded(self):
+        self.extract.side_effect = ValueError("broken xref table")
+        profile = self.create_profile()
+        resume_text = ResumeText.objects.get(profile=profile)
+        self.assertEqual(resume_text.status, ResumeText.STATUS_FAILED)
+        self.assertEqual(resume_text.error, "broken xref table")
+
+    def test_backfill_command(self):
+        with patch("users.signals.resume_text_pipeline.submit"):
+            first = self.create_profile()
+            self.create_profile(b"%PDF-1.4 other")
+        ResumeText.objects.create(
+            profile=first,
+            sha256=digest_from_name(first.resume_file.name),
+            status=ResumeText.STATUS_EXTRACTED,
+        )
+
+        stdout = StringIO()
+        call_command("extract_resume_text", workers=0, stdout=stdout)
+        self.assertIn("{'skipped': 1, 'extracted': 1}", stdout.getvalue())
+        self.assertEqual(self.extract.call_count, 1)
+
+
+@override_settings(RESUME_DOWNLOAD={"MODE": "django"})
+class ResumeDownloadTestSetup(APITestCase):
+    def setUp(self):
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        settings_override = override_settings(MEDIA_ROOT=media_root.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.content = b"%PDF-1.4\n" + os.urandom(100 * 1024)
+        self.applicant = User.objects.create_user(
+            username=fake.user_name(), is_applicant=True
+        )
+        with patch("users.signals.resume_text_pipeline.submit"):
+            self.profile = ApplicantProfile.objects.create(
+                user=self.applicant,
+                phone_number="1245125412",
+                address="Street",
+                resume_file=SimpleUploadedFile(
+                    "cv.pdf", self.content, "application/pdf"
+                ),
+            )
+        self.etag = f'"{hashlib.sha256(self.content).hexdigest()}"'
+        self.url = reverse("applicant_resume_download", args=[self.profile.pk])
+
+    def authenticate(self, user):
+        token = RefreshToken.for_user(user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def create_employer(self):
+        user = User.objects.create_user(username=fake.user_name(), is_employer=True)
+        employer = EmployerProfile.objects.create(
+            user=user,
+            company_name="Acme",
+            company_website="https://acme.example.com",
+            location="New York, NY",
+            description="Software",
+        )
+        job = Jobs.objects.create(
+            employer=employer,
+            job_title="Software Engineer",
+            description="Python and Django",
+            location="New York, NY",
+            salary_min=70000,
+            salary_max=120000,
+            job_type="FT",
+            experience_level="mid",
+        )
+        return user, job
+
+    def test_owner_downloads_full_resume(self):
+        self.authenticate(self.applicant)
+        response = self.client.get(reverse("resume_download"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(b"".join(response.streaming_content), self.content)
+        self.assertEqual(response["Content-Length"], str(len(self.content)))
+        self.assertEqual(response["Accept-Ranges"], "bytes")
+        self.assertEqual(response["ETag"], self.etag)
+        self.assertEqual(
+            response["Content-Disposition"], 'inline; filename="resume.pdf"'
+        )
+
+    def test_employer_access_requires_application(self):
+        employer, job = self.create_employer()
+        self.authenticate(employer)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        JobApplication.objects.create(applicant=self.profile, job_listing=job)
+        JobApplication.objects.create(applicant=self.profile, job_listing=job)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(b"".join(response.streaming_content), self.content)
+
+        # Other employers and anonymous users get nothing
+        other, _ = self.create_employer()
+        self.authenticate(other)
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+        self.client.credentials()
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+
+    def test_range_requests(self):
+        self.authenticate(self.applicant)
+        response = self.client.get(self.url, HTTP_RANGE="bytes=1000-1999")
+        self.assertEqual(response.status_code, status.HTTP_206_PARTIAL_CONTENT)
+        self.assertEqual(b"".join(response.streaming_content), self.content[1000:2000])
+        self.assertEqual(response["Content-Length"], "1000")
+        self.assertEqual(
+            response["Content-Range"], f"bytes 1000-1999/{len(self.content)}"
+        )
+
+        response = self.client.get(self.url, HTTP_RANGE="bytes=-100")
+        self.assertEqual(b"".join(response.streaming_content), self.content[-100:])
+
+        response = self.client.get(self.url, HTTP_RANGE="bytes=99999999-")
+        self.assertEqual(
+            response.status_code, status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE
+        )
+        self.assertEqual(response["Content-Range"], f"bytes */{len(self.content)}")
+
+        # Malformed and multi-range headers get the whole file
+        response = self.client.get(self.url, HTTP_RANGE="bytes=0-1,5-9")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_conditional_requests(self):
+        self.authenticate(self.applicant)
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=self.etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], self.etag)
+
+        last_modified = self.client.get(self.url)["Last-Modified"]
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        # If-Range only honours the range while the resume is unchanged
+        response = self.client.get(
+            self.url, HTTP_RANGE="bytes=0-9", HTTP_IF_RANGE=self.etag
+        )
+        self.assertEqual(response.status_code, status.HTTP_206_PARTIAL_CONTENT)
+        response = self.client.get(
+            self.url, HTTP_RANGE="bytes=0-9", HTTP_IF_RANGE='"stale"'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.client.get(
+            self.url, HTTP_RANGE="bytes=0-9", HTTP_IF_RANGE=http_date(0)
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    @override_settings(
+        RESUME_DOWNLOAD={"MODE": "x-accel", "X_ACCEL_PREFIX": "/protected/"}
+    )
+    def test_x_accel_redirect_mode(self):
+        self.authenticate(self.applicant)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response["X-Accel-Redirect"], f"/protected/{self.profile.resume_file.name}"
+        )
+        self.assertEqual(response.content, b"")
@@ -0,0 +1,175 @@
+import time
+
+from django.core.cache import caches
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+
+class SlidingWindowThrottle(BaseThrottle):
+    """
+    Sliding window counter throttle backed by a shared cache.
+
+    Each identity keeps one counter per fixed window in the cache, so every
+    worker process sees the same counts. The request rate is estimated as
+    the current window's count plus the previous window's count weighted by
+    how much of it still overlaps the sliding window. A request is counted
+    before it is checked and taken off again when rejected, so concurrent
+    requests cannot all see room for themselves.
+
+    Subclasses set ``scope`` (looked up in ``DEFAULT_THROTTLE_RATES``),
+    optionally ``methods`` and implement ``get_ident_key``. A scope without a
+    configured rate is not throttled.
+    """
+
+    scope = None
+    methods = None
+    cache_alias = "default"
+
+    def __init__(self):
+        self.rate = api_settings.DEFAULT_THROTTLE_RATES.get(self.scope)
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        self.wait_seconds = None
+
+    @staticmethod
+    def parse_rate(rate):
+        """'<requests>/<period>' where period starts with s, m, h or d"""
+        if rate is None:
+            return None, None
+        num, period = rate.split("/")
+        duration = {"s": 1, "m": 60, "h": 3600, "d": 86400}[period[0]]
+        return int(num), duration
+
+    def get_ident_key(self, request, view):
+        raise NotImplementedError(".get_ident_key() must be overridden")
+
+    def allow_request(self, request, view):
+        if self.num_requests is None:
+            return True
+        if self.methods is not None and request.method not in self.methods:
+            return True
+        ident = self.get_ident_key(request, view)
+        if ident is None:
+            return True
+
+        cache = caches[self.cache_alias]
+        now = time.time()
+        window = int(now // self.duration)
+        key = f"throttle:{self.scope}:{ident}:{window}"
+        previous_key = f"throttle:{self.scope}:{ident}:{window - 1}"
+        # Keep the counter for two windows so it can serve as the previous one.
+        cache.add(key, 0, timeout=self.duration * 2)
+        try:
+            current = cache.incr(key)
+        except ValueError:
+            # Evicted between add() and incr()
+            cache.set(key, 1, timeout=self.duration * 2)
+            current = 1
+        previous = cache.get(previous_key, 0)
+        elapsed = (now % self.duration) / self.duration
+
+        if previous * (1 - elapsed) + current > self.num_requests:
+            try:
+                cache.decr(key)
+            except ValueError:
+                pass
+            self.wait_seconds = self._wait(current - 1, previous, elapsed)
+            return False
+        return True
+
+    def _wait(self, current, previous, elapsed):
+        remaining = self.duration * (1 - elapsed)
+        if current >= self.num_requests or not previous:
+            return remaining
+        # Time until the decaying previous window leaves room for one request.
+        needed = 1 - (self.num_requests - current) / previous
+        return max((needed - elapsed) * self.duration, 1)
+
+    def wait(self):
+        return self.wait_seconds
+
+
+class IPRateThrottle(SlidingWindowThrottle):
+    """Throttle by client IP address"""
+
+    def get_ident_key(self, request, view):
+        return f"ip:{self.get_ident(request)}"
+
+
+class UserRateThrottle(SlidingWindowThrottle):
+    """
+    Throttle by the user id in the access token, falling back to the client
+    IP. The token is validated without touching the database, so the check
+    can run before authentication.
+    """
+
+    authentication = JWTAuthentication()
+
+    def get_token_user_id(self, request):
+        header = self.authentication.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.authentication.get_raw_token(header)
+        if raw_token is None:
+            return None
+        try:
+            token = self.authentication.get_validated_token(raw_token)
+        except (InvalidToken, TokenError):
+            return None
+        return token.get(jwt_settings.USER_ID_CLAIM)
+
+    def get_ident_key(self, request, view):
+        user_id = self.get_token_user_id(request)
+        if user_id is None:
+            return f"ip:{self.get_ident(request)}"
+        return f"user:{user_id}"
+
+
+class EmployerRateThrottle(UserRateThrottle):
+    """
+    Throttle per employer. An employer profile is one-to-one with its user,
+    so the token's user id identifies the employer.
+    """
+
+    def get_ident_key(self, request, view):
+        user_id = self.get_token_user_id(request)
+        if user_id is None:
+            return f"ip:{self.get_ident(request)}"
+        return f"employer:{user_id}"
+
+
+class LoginRateThrottle(IPRateThrottle):
+    scope = "login"
+
+
+class RegisterRateThrottle(IPRateThrottle):
+    scope = "register"
+
+
+class JobCreateRateThrottle(EmployerRateThrottle):
+    scope = "job_create"
+    methods = ("POST",)
+
+
+class JobApplicationRateThrottle(UserRateThrottle):
+    scope = "job_application"
+    methods = ("POST",)
+
+
+class ThrottleBeforeAuthMixin:
+    """
+    Runs the view's throttles before authentication and permission checks,
+    so rejected requests cost neither a user lookup nor any other query.
+    """
+
+    def initial(self, request, *args, **kwargs):
+        self.check_throttles(request)
+        super().initial(request, *args, **kwargs)
+
+    def check_throttles(self, request):
+        if getattr(request, "_throttles_checked", False):
+            return
+        request._throttles_checked = True
+        super().check_throttles(request)
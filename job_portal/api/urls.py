@@ -1,15 +1,16 @@
 from django.urls import path, include
 from rest_framework_simplejwt.views import (
-    TokenObtainPairView,
     TokenRefreshView,
     TokenVerifyView,
 )
+from api.users.views import LoginView
 
 
 urlpatterns = [
     path("user/", include("api.users.urls")),
     path("jobs/", include("api.jobs.urls")),
-    path("token/", TokenObtainPairView.as_view(), name="token_obtain_pair"),
+    path("skills/", include("api.skills.urls")),
+    path("token/", LoginView.as_view(), name="token_obtain_pair"),
     path("token/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
     path("token/verify/", TokenVerifyView.as_view(), name="token_verify"),
 ]
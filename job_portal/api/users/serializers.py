@@ -1,6 +1,20 @@
 from rest_framework import serializers
-from users.models import EmployerProfile, User, ApplicantProfile, Skill
-from django.contrib.auth.hashers import make_password
+from django.conf import settings
+from users.models import (
+    EmployerProfile,
+    User,
+    ApplicantProfile,
+    ResumeUploadSession,
+    Skill,
+)
+from api.fields import BulkPrimaryKeyRelatedField
+from api.m2m import sync_m2m
+from django.db import transaction
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from users.fields import normalize_email
+from users.hashing import hashing_service
+from users.last_login import last_login_writer
+from users import uploads
 import re
 
 
@@ -14,6 +28,13 @@ class UserRegisterSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("Invalid User Type")
         return value
 
+    def validate_email(self, value):
+        """Emails are unique regardless of case"""
+        email = normalize_email(value)
+        if email and User.objects.filter(email_normalized=email).exists():
+            raise serializers.ValidationError("A user with this email already exists.")
+        return value
+
     class Meta:
         model = User
         fields = [
@@ -25,22 +46,20 @@ class UserRegisterSerializer(serializers.ModelSerializer):
             "user_type",
         ]
 
-    def create(self, validated_data):
+    def build_user(self, validated_data):
+        """Unsaved user with the hashed password and role flag already set"""
         user_type = validated_data.pop("user_type")
         password = validated_data.pop("password")
-        user = User.objects.create(
-            password=make_password(password),
+        return User(
+            password=hashing_service.make_password(password),
+            is_applicant=user_type == "Applicant",
+            is_employer=user_type == "Employer",
             **validated_data,
         )
 
-        if user_type == "Applicant":
-            user.is_applicant = True
-        elif user_type == "Employer":
-            user.is_employer = True
-        else:
-            raise serializers.ValidationError("Invalid User Type")
-        user.save()
-
+    def create(self, validated_data):
+        user = self.build_user(validated_data)
+        user.save(force_insert=True)
         return user
 
 
@@ -48,7 +67,14 @@ class ApplicantProfileSerializer(serializers.ModelSerializer):
     """ApplicantProfileSerializer"""
 
     user = UserRegisterSerializer(read_only=True)
-    skills = serializers.PrimaryKeyRelatedField(queryset=Skill.objects.all(), many=True)
+    skills = BulkPrimaryKeyRelatedField(queryset=Skill.objects.all(), many=True)
+    resume_upload = serializers.PrimaryKeyRelatedField(
+        queryset=ResumeUploadSession.objects.filter(
+            status=ResumeUploadSession.STATUS_COMPLETED
+        ),
+        write_only=True,
+        required=False,
+    )
 
     class Meta:
         model = ApplicantProfile
@@ -58,17 +84,37 @@ class ApplicantProfileSerializer(serializers.ModelSerializer):
             "phone_number",
             "address",
             "resume_file",
+            "resume_upload",
             "skills",
             "profile_complete",
         ]
 
+    def get_fields(self):
+        fields = super().get_fields()
+        # A finished chunked upload stands in for the multipart file
+        data = getattr(self, "initial_data", None)
+        if hasattr(data, "get") and data.get("resume_upload"):
+            fields["resume_file"].required = False
+        return fields
+
     def validate_resume_file(self, value):
-        if value.content_type != "application/pdf":
+        head = value.read(len(uploads.PDF_MAGIC))
+        value.seek(0)
+        if value.content_type != "application/pdf" or not head.startswith(
+            uploads.PDF_MAGIC
+        ):
             raise serializers.ValidationError(
                 "Only PDF files are allowed for the resume."
             )
         return value
 
+    def validate_resume_upload(self, value):
+        """Only the uploader can attach a finished upload"""
+        request = self.context.get("request")
+        if request is None or value.user_id != request.user.id:
+            raise serializers.ValidationError("Invalid upload.")
+        return value
+
     def validate_phone_number(self, value):
         if not re.match(r"^\d{10}$", str(value)):
             raise serializers.ValidationError("Phone number must be exactly 10 digits.")
@@ -77,25 +123,55 @@ class ApplicantProfileSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         skills_data = validated_data.pop("skills")
         user = validated_data.pop("user")
+        resume_upload = validated_data.pop("resume_upload", None)
         profile = ApplicantProfile.objects.create(user=user, **validated_data)
-        profile.skills.set(skills_data)
-        profile.save()
+        sync_m2m(profile, "skills", skills_data, current_ids=())
+        if resume_upload is not None:
+            uploads.attach(resume_upload, profile)
 
         return profile
 
     def update(self, instance, validated_data):
-        skills_data = validated_data.pop("skills", [])
+        # Skills omitted from a partial update are left untouched
+        skills_data = validated_data.pop("skills", None)
+        resume_upload = validated_data.pop("resume_upload", None)
+        if resume_upload is not None:
+            uploads.attach(resume_upload, instance)
 
         for key, val in validated_data.items():
             setattr(instance, key, val)
 
-        if skills_data:
-            instance.skills.set(skills_data)
-        instance.save()
+        if validated_data:
+            instance.save(update_fields=[*validated_data, "updated_at"])
+        if skills_data is not None:
+            sync_m2m(instance, "skills", skills_data)
 
         return instance
 
 
+class ResumeUploadSessionSerializer(serializers.ModelSerializer):
+    """Resumable resume upload; chunks are PUT to the upload's URL"""
+
+    class Meta:
+        model = ResumeUploadSession
+        fields = ["id", "filename", "size", "received", "status"]
+        read_only_fields = ["id", "received", "status"]
+
+    def validate_filename(self, value):
+        if not value.lower().endswith(".pdf"):
+            raise serializers.ValidationError(
+                "Only PDF files are allowed for the resume."
+            )
+        return value
+
+    def validate_size(self, value):
+        if not 0 < value <= settings.RESUME_MAX_SIZE:
+            raise serializers.ValidationError(
+                f"Resume size must be between 1 and {settings.RESUME_MAX_SIZE} bytes."
+            )
+        return value
+
+
 class EmployerProfileSerializer(serializers.ModelSerializer):
     """EmployerProfileSerializer"""
 
@@ -114,5 +190,59 @@ class EmployerProfileSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         user = validated_data.pop("user")
         profile = EmployerProfile.objects.create(user=user, **validated_data)
-        profile.save()
         return profile
+
+
+class RegisterWithProfileSerializer(serializers.Serializer):
+    """
+    Registers a user and creates the matching applicant or employer profile
+    in one transaction, validating both from the same payload.
+    """
+
+    profile_serializers = {
+        "Applicant": ApplicantProfileSerializer,
+        "Employer": EmployerProfileSerializer,
+    }
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        data = kwargs.get("data", {})
+        self.user_serializer = UserRegisterSerializer(data=data)
+        profile_serializer_class = self.profile_serializers.get(data.get("user_type"))
+        self.profile_serializer = (
+            profile_serializer_class(data=data) if profile_serializer_class else None
+        )
+
+    def is_valid(self, raise_exception=False):
+        user_valid = self.user_serializer.is_valid()
+        profile_valid = self.profile_serializer is None or (
+            self.profile_serializer.is_valid()
+        )
+        self._errors = {
+            **(self.profile_serializer.errors if self.profile_serializer else {}),
+            **self.user_serializer.errors,
+        }
+        self._validated_data = {}
+        if self._errors and raise_exception:
+            raise serializers.ValidationError(self._errors)
+        return user_valid and profile_valid
+
+    def save(self, **kwargs):
+        # Hash outside the transaction so the rows are not locked meanwhile.
+        user = self.user_serializer.build_user(
+            dict(self.user_serializer.validated_data)
+        )
+        with transaction.atomic():
+            user.save(force_insert=True)
+            self.profile_serializer.save(user=user)
+        self.instance = user
+        return user
+
+
+class CoalescedLastLoginTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """Token pair serializer that records last_login through the coalescing writer"""
+
+    def validate(self, attrs):
+        data = super().validate(attrs)
+        last_login_writer.record(self.user.pk)
+        return data
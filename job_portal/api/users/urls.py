@@ -1,20 +1,49 @@
 from . import views
 from django.urls import path
-from rest_framework_simplejwt.views import TokenObtainPairView
 
 
 urlpatterns = [
     path("register/", views.RegisterView.as_view(), name="register"),
-    path("login/", TokenObtainPairView.as_view(), name="login"),
+    path(
+        "register/profile/",
+        views.RegisterWithProfileView.as_view(),
+        name="register_with_profile",
+    ),
+    path("login/", views.LoginView.as_view(), name="login"),
     path("logout/", views.LogoutView.as_view(), name="logout"),
     path(
         "profile/applicant/",
         views.ApplicantProfileView.as_view(),
         name="applicant_profile",
     ),
+    path(
+        "profile/applicant/resume/uploads/",
+        views.ResumeUploadCreateView.as_view(),
+        name="resume_upload_create",
+    ),
+    path(
+        "profile/applicant/resume/uploads/<uuid:upload_id>/",
+        views.ResumeUploadView.as_view(),
+        name="resume_upload",
+    ),
+    path(
+        "profile/applicant/resume/",
+        views.ResumeDownloadView.as_view(),
+        name="resume_download",
+    ),
+    path(
+        "profile/applicant/<int:profile_id>/resume/",
+        views.ResumeDownloadView.as_view(),
+        name="applicant_resume_download",
+    ),
     path(
         "profile/employer/",
         views.EmployerProfileView.as_view(),
         name="employer_profile",
     ),
+    path(
+        "hashing/metrics/",
+        views.HashingMetricsView.as_view(),
+        name="hashing_metrics",
+    ),
 ]
@@ -1,23 +1,47 @@
 from rest_framework.views import APIView
 from rest_framework import status
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.views import TokenObtainPairView
 from django.core.exceptions import ObjectDoesNotExist, MultipleObjectsReturned
+from django.db.models import Q
 
-from users.models import ApplicantProfile, EmployerProfile
+from users.models import ApplicantProfile, EmployerProfile, ResumeUploadSession
+from users.hashing import HashingPoolSaturated, hashing_service
+from users import downloads, profile_cache, uploads
 from .serializers import (
+    CoalescedLastLoginTokenObtainPairSerializer,
     EmployerProfileSerializer,
+    RegisterWithProfileSerializer,
+    ResumeUploadSessionSerializer,
     UserRegisterSerializer,
     ApplicantProfileSerializer,
 )
 from api.utils import ApiResponse
+from api.throttling import (
+    LoginRateThrottle,
+    RegisterRateThrottle,
+    ThrottleBeforeAuthMixin,
+)
+
+
+def service_busy_response():
+    """503 returned when the password hashing pool sheds a request"""
+    response = ApiResponse.error(
+        message="Service is busy, please retry shortly.",
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+    )
+    response["Retry-After"] = "1"
+    return response
 
 
 # Create your views here.
-class RegisterView(APIView):
+class RegisterView(ThrottleBeforeAuthMixin, APIView):
     """User Operations"""
 
+    throttle_classes = [RegisterRateThrottle]
+
     def post(self, request):
         try:
             serializer = UserRegisterSerializer(data=request.data)
@@ -29,6 +53,8 @@ class RegisterView(APIView):
                 )
             else:
                 return ApiResponse.serializer_error(serializer_errors=serializer.errors)
+        except HashingPoolSaturated:
+            return service_busy_response()
         except Exception as e:
             return ApiResponse.error(
                 message="An unexpected error occurred.",
@@ -37,6 +63,63 @@ class RegisterView(APIView):
             )
 
 
+class RegisterWithProfileView(ThrottleBeforeAuthMixin, APIView):
+    """Register a user together with their profile and return tokens"""
+
+    throttle_classes = [RegisterRateThrottle]
+
+    def post(self, request):
+        try:
+            serializer = RegisterWithProfileSerializer(data=request.data)
+            if serializer.is_valid():
+                user = serializer.save()
+                refresh = RefreshToken.for_user(user)
+                return ApiResponse.success(
+                    data={
+                        "refresh": str(refresh),
+                        "access": str(refresh.access_token),
+                    },
+                    message="User registered successfully.",
+                    status_code=status.HTTP_201_CREATED,
+                )
+            else:
+                return ApiResponse.serializer_error(serializer_errors=serializer.errors)
+        except HashingPoolSaturated:
+            return service_busy_response()
+        except Exception as e:
+            return ApiResponse.error(
+                message="An unexpected error occurred.",
+                errors=str(e),
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+
+class LoginView(ThrottleBeforeAuthMixin, TokenObtainPairView):
+    """Obtain a token pair, password verification runs in the hashing pool"""
+
+    throttle_classes = [LoginRateThrottle]
+    serializer_class = CoalescedLastLoginTokenObtainPairSerializer
+
+    def post(self, request, *args, **kwargs):
+        try:
+            return super().post(request, *args, **kwargs)
+        except HashingPoolSaturated:
+            return service_busy_response()
+
+
+class HashingMetricsView(APIView):
+    """Password hashing pool usage, for staff only"""
+
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return ApiResponse.success(
+            data=hashing_service.stats(),
+            message="Hashing metrics retrieved successfully.",
+        )
+
+
 class LogoutView(APIView):
     """user logout functionality"""
 
@@ -75,7 +158,9 @@ class ApplicantProfileView(APIView):
                     message="This action requires an applicant profile.",
                     status_code=status.HTTP_400_BAD_REQUEST,
                 )
-            serializer = ApplicantProfileSerializer(data=request.data)
+            serializer = ApplicantProfileSerializer(
+                data=request.data, context={"request": request}
+            )
             if serializer.is_valid():
                 serializer.save(user=request.user)
                 return ApiResponse.success(
@@ -94,10 +179,19 @@ class ApplicantProfileView(APIView):
 
     def get(self, request):
         try:
-            applicant_profile = ApplicantProfile.objects.get(user=request.user)
-            serializer = ApplicantProfileSerializer(applicant_profile)
+            data, version = profile_cache.get_cached_profile(
+                profile_cache.APPLICANT, request.user.id
+            )
+            if data is None:
+                applicant_profile = ApplicantProfile.objects.get(user=request.user)
+                # Reuse the authenticated user for the nested user fields
+                applicant_profile.user = request.user
+                data = ApplicantProfileSerializer(applicant_profile).data
+                profile_cache.set_cached_profile(
+                    profile_cache.APPLICANT, request.user.id, data, version
+                )
             return ApiResponse.success(
-                data=serializer.data,
+                data=data,
                 message="Applicant profile retrieved successfully.",
                 status_code=status.HTTP_200_OK,
             )
@@ -119,10 +213,16 @@ class ApplicantProfileView(APIView):
         try:
             applicant_profile = ApplicantProfile.objects.get(user=request.user)
             serializer = ApplicantProfileSerializer(
-                applicant_profile, request.data, partial=True
+                applicant_profile,
+                request.data,
+                partial=True,
+                context={"request": request},
             )
             if serializer.is_valid():
                 serializer.save()
+                profile_cache.invalidate_profile(
+                    profile_cache.APPLICANT, request.user.id
+                )
                 return ApiResponse.success(
                     message="Applicant Profile Updated Successfully!",
                 )
@@ -144,6 +244,150 @@ class ApplicantProfileView(APIView):
             )
 
 
+class ResumeUploadCreateView(APIView):
+    """Start a resumable resume upload"""
+
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        try:
+            if not request.user.is_applicant:
+                return ApiResponse.error(
+                    message="This action requires an applicant profile.",
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                )
+            serializer = ResumeUploadSessionSerializer(data=request.data)
+            if serializer.is_valid():
+                serializer.save(user=request.user)
+                return ApiResponse.success(
+                    data=serializer.data,
+                    message="Upload started.",
+                    status_code=status.HTTP_201_CREATED,
+                )
+            else:
+                return ApiResponse.serializer_error(serializer_errors=serializer.errors)
+        except Exception as e:
+            return ApiResponse.error(
+                message="An unexpected error occurred.",
+                errors=str(e),
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+
+class ResumeUploadView(APIView):
+    """
+    Upload status and chunks. Each PUT carries raw bytes with a
+    ``Content-Range: bytes <start>-<end>/<size>`` header and must start at
+    the ``received`` offset; the body is streamed to disk, never parsed.
+    """
+
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, upload_id):
+        try:
+            session = ResumeUploadSession.objects.get(pk=upload_id, user=request.user)
+            return ApiResponse.success(
+                data=ResumeUploadSessionSerializer(session).data,
+                message="Upload retrieved successfully.",
+            )
+        except ObjectDoesNotExist:
+            return ApiResponse.error(
+                message="Upload not found.", status_code=status.HTTP_404_NOT_FOUND
+            )
+        except Exception as e:
+            return ApiResponse.error(
+                message="An unexpected error occurred.",
+                errors=str(e),
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+    def put(self, request, upload_id):
+        try:
+            session = ResumeUploadSession.objects.get(pk=upload_id, user=request.user)
+            content_range = request.headers.get("Content-Range")
+            if not content_range:
+                return ApiResponse.error(
+                    message="Content-Range header is required.",
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                )
+            uploads.write_chunk(session, request.stream, content_range)
+
+            message = "Chunk received."
+            if session.status == ResumeUploadSession.STATUS_COMPLETED:
+                message = "Upload completed."
+                profile = ApplicantProfile.objects.filter(user=request.user).first()
+                if profile is not None:
+                    data = ResumeUploadSessionSerializer(session).data
+                    uploads.attach(session, profile)
+                    profile_cache.invalidate_profile(
+                        profile_cache.APPLICANT, request.user.id
+                    )
+                    return ApiResponse.success(
+                        data=data, message="Resume uploaded successfully."
+                    )
+            return ApiResponse.success(
+                data=ResumeUploadSessionSerializer(session).data, message=message
+            )
+        except ObjectDoesNotExist:
+            return ApiResponse.error(
+                message="Upload not found.", status_code=status.HTTP_404_NOT_FOUND
+            )
+        except uploads.InvalidResume as e:
+            uploads.fail(session)
+            return ApiResponse.error(message=str(e), status_code=e.status_code)
+        except uploads.UploadError as e:
+            session.refresh_from_db()
+            return ApiResponse.error(
+                message=str(e),
+                errors={"received": session.received},
+                status_code=e.status_code,
+            )
+        except Exception as e:
+            return ApiResponse.error(
+                message="An unexpected error occurred.",
+                errors=str(e),
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+
+class ResumeDownloadView(APIView):
+    """
+    Download an applicant's resume: the applicant's own, or one of an
+    applicant who applied to a job of the requesting employer. Supports
+    Range and conditional requests; see users.downloads.
+    """
+
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, profile_id=None):
+        try:
+            profiles = ApplicantProfile.objects.exclude(resume_file="").only(
+                "resume_file"
+            )
+            if profile_id is None:
+                profile = profiles.get(user=request.user)
+            else:
+                profile = profiles.filter(
+                    Q(user=request.user)
+                    | Q(applications__job_listing__employer__user=request.user),
+                    pk=profile_id,
+                )[:1].get()
+            return downloads.resume_response(request, profile.resume_file)
+        except (ObjectDoesNotExist, FileNotFoundError):
+            return ApiResponse.error(
+                message="Resume not found.", status_code=status.HTTP_404_NOT_FOUND
+            )
+        except Exception as e:
+            return ApiResponse.error(
+                message="An unexpected error occurred.",
+                errors=str(e),
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+
 class EmployerProfileView(APIView):
     """Applicant Profile"""
 
@@ -182,10 +426,19 @@ class EmployerProfileView(APIView):
 
     def get(self, request):
         try:
-            employer_profile = EmployerProfile.objects.get(user=request.user)
-            serializer = EmployerProfileSerializer(employer_profile)
+            data, version = profile_cache.get_cached_profile(
+                profile_cache.EMPLOYER, request.user.id
+            )
+            if data is None:
+                employer_profile = EmployerProfile.objects.get(user=request.user)
+                # Reuse the authenticated user for the nested user fields
+                employer_profile.user = request.user
+                data = EmployerProfileSerializer(employer_profile).data
+                profile_cache.set_cached_profile(
+                    profile_cache.EMPLOYER, request.user.id, data, version
+                )
             return ApiResponse.success(
-                data=serializer.data,
+                data=data,
                 message="Employer profile retrieved successfully.",
                 status_code=status.HTTP_200_OK,
             )
@@ -212,6 +465,9 @@ class EmployerProfileView(APIView):
             )
             if serializer.is_valid():
                 serializer.save()
+                profile_cache.invalidate_profile(
+                    profile_cache.EMPLOYER, request.user.id
+                )
                 return ApiResponse.success(
                     data=serializer.data,
                     message="Employer Profile Updated Successfully!",
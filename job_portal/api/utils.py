@@ -1,7 +1,7 @@
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import exception_handler
-from rest_framework.exceptions import PermissionDenied
+from rest_framework.exceptions import PermissionDenied, Throttled
 
 
 class ApiResponse:
@@ -61,5 +61,16 @@ def custom_exception_handler(exc, context):
             message=str(exc), status_code=status.HTTP_403_FORBIDDEN
         )
 
+    if isinstance(exc, Throttled):
+        # Keep the Retry-After header set by the default handler
+        throttled = ApiResponse.error(
+            message="Too many requests, please retry later.",
+            errors=str(exc.detail),
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        )
+        if response is not None and "Retry-After" in response:
+            throttled["Retry-After"] = response["Retry-After"]
+        return throttled
+
     # Return the default response for other exceptions
     return response
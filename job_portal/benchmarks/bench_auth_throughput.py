@@ -0,0 +1,131 @@
+"""
+Registration and login throughput under concurrency.
+
+Runs against a throwaway test database:
+
+    python benchmarks/bench_auth_throughput.py --users 200 --concurrency 16
+    python benchmarks/bench_auth_throughput.py --workers 0   # inline hashing
+
+Reports requests/second, latency percentiles, status code counts and the
+hashing pool metrics after each phase.
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "job_portal.settings")
+
+
+def run_phase(name, func, payloads, concurrency):
+    from django.db import connections
+
+    def call(payload):
+        started = time.perf_counter()
+        try:
+            return func(payload), time.perf_counter() - started
+        finally:
+            connections.close_all()
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(call, payloads))
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(latency for _, latency in results)
+    codes = Counter(code for code, _ in results)
+    print(
+        f"{name:<9} {len(payloads) / elapsed:8.1f} req/s | "
+        f"p50 {statistics.median(latencies) * 1000:7.1f} ms | "
+        f"p95 {latencies[int(len(latencies) * 0.95) - 1] * 1000:7.1f} ms | "
+        f"status {dict(codes)}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--max-pending", type=int, default=None)
+    args = parser.parse_args()
+
+    import django
+
+    django.setup()
+
+    from django.db import connection
+    from django.test import Client
+    from django.conf import settings
+    from django.test.utils import override_settings, setup_test_environment
+    from django.urls import reverse
+
+    from users.hashing import hashing_service
+    from users.last_login import last_login_writer
+
+    if args.workers is not None:
+        hashing_service.max_workers = args.workers
+    if args.max_pending is not None:
+        hashing_service.max_pending = args.max_pending
+
+    setup_test_environment()
+    # Measure hashing, not the per-IP login/register quotas
+    override_settings(
+        REST_FRAMEWORK={**settings.REST_FRAMEWORK, "DEFAULT_THROTTLE_RATES": {}}
+    ).enable()
+    old_name = connection.creation.create_test_db(verbosity=0, keepdb=False)
+    try:
+        run_id = uuid.uuid4().hex[:8]
+        users = [
+            {
+                "first_name": "Bench",
+                "last_name": "User",
+                "username": f"bench_{run_id}_{i}",
+                "password": f"Bench-pass-{i}-{run_id}",
+                "email": f"bench_{run_id}_{i}@example.com",
+                "user_type": "Applicant",
+            }
+            for i in range(args.users)
+        ]
+        register_url = reverse("register")
+        login_url = reverse("login")
+
+        def register(payload):
+            return Client().post(register_url, data=payload).status_code
+
+        def login(payload):
+            return (
+                Client()
+                .post(
+                    login_url,
+                    data={
+                        "username": payload["username"],
+                        "password": payload["password"],
+                    },
+                )
+                .status_code
+            )
+
+        print(
+            f"{args.users} users, concurrency {args.concurrency}, "
+            f"hashing workers {hashing_service.max_workers}, "
+            f"max pending {hashing_service.max_pending}"
+        )
+        run_phase("register", register, users, args.concurrency)
+        print(f"          hashing {hashing_service.stats()}")
+        run_phase("login", login, users, args.concurrency)
+        print(f"          hashing {hashing_service.stats()}")
+    finally:
+        last_login_writer.flush()
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        hashing_service.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Job recommendation ranking at catalog scale.
+
+Builds a JobMatrix from a synthetic catalog (no database) and ranks jobs
+for random applicants:
+
+    python benchmarks/bench_recommendations.py --jobs 500000 --skills 5000
+    python benchmarks/bench_recommendations.py --jobs 50000 --compare
+
+Skill popularity follows a Zipf distribution, so popular skills have long
+posting lists. --compare also times a plain Python loop over the jobs and
+checks both produce the same ranking.
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "job_portal.settings")
+
+DAY = 24 * 60 * 60
+
+
+def synthetic_catalog(rng, jobs, skills, skills_per_job):
+    popularity = 1 / np.arange(1, skills + 1) ** 1.1
+    popularity /= popularity.sum()
+    counts = rng.integers(skills_per_job[0], skills_per_job[1] + 1, size=jobs)
+    job_ids = np.arange(1, jobs + 1, dtype=np.int64)
+    pairs = np.column_stack(
+        [
+            np.repeat(job_ids, counts),
+            rng.choice(skills, size=counts.sum(), p=popularity) + 1,
+        ]
+    )
+    # Duplicate skills of a job would be one row in the through table
+    pairs = np.unique(pairs, axis=0)
+    now = time.time()
+    posted = now - rng.uniform(0, 180 * DAY, size=jobs)
+    return job_ids, posted, pairs, popularity, now
+
+
+def python_rank(job_skills, posted, skill_ids, limit, now, half_life_days):
+    skill_ids = set(skill_ids)
+    scored = []
+    for job_id, required in job_skills.items():
+        matched = len(required & skill_ids)
+        if matched:
+            age_days = max(now - posted[job_id], 0) / DAY
+            score = matched / len(required) * 2 ** (-age_days / half_life_days)
+            scored.append((-score, -posted[job_id], job_id))
+    scored.sort()
+    return [job_id for _, _, job_id in scored[:limit]]
+
+
+def report(name, latencies):
+    latencies = sorted(latencies)
+    print(
+        f"{name:<8} p50 {statistics.median(latencies) * 1000:8.2f} ms | "
+        f"p95 {latencies[int(len(latencies) * 0.95) - 1] * 1000:8.2f} ms | "
+        f"max {latencies[-1] * 1000:8.2f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--jobs", type=int, default=500000)
+    parser.add_argument("--skills", type=int, default=5000)
+    parser.add_argument("--applicants", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--compare", action="store_true")
+    args = parser.parse_args()
+
+    import django
+
+    django.setup()
+
+    from jobs.recommendations import JobMatrix
+
+    rng = np.random.default_rng(args.seed)
+    job_ids, posted, pairs, popularity, now = synthetic_catalog(
+        rng, args.jobs, args.skills, (3, 12)
+    )
+    started = time.perf_counter()
+    matrix = JobMatrix(job_ids, posted, pairs)
+    build = time.perf_counter() - started
+    size = sum(
+        array.nbytes
+        for array in (matrix.job_ids, matrix.posted, matrix.required, matrix.job_rows)
+    )
+    print(
+        f"{len(matrix)} jobs, {len(pairs)} required skills, {args.skills} skills | "
+        f"build {build * 1000:.0f} ms | {size / 1024 / 1024:.1f} MiB"
+    )
+
+    applicants = [
+        rng.choice(args.skills, size=rng.integers(5, 21), p=popularity, replace=False)
+        + 1
+        for _ in range(args.applicants)
+    ]
+    latencies = []
+    results = []
+    for skill_ids in applicants:
+        started = time.perf_counter()
+        results.append(matrix.rank(skill_ids, args.limit, now=now))
+        latencies.append(time.perf_counter() - started)
+    report("numpy", latencies)
+
+    if args.compare:
+        job_skills = {}
+        for job_id, skill_id in pairs.tolist():
+            job_skills.setdefault(job_id, set()).add(skill_id)
+        posted_by_id = dict(zip(job_ids.tolist(), posted.tolist()))
+        latencies = []
+        mismatches = 0
+        for skill_ids, expected in zip(applicants, results):
+            started = time.perf_counter()
+            ranked = python_rank(
+                job_skills, posted_by_id, skill_ids.tolist(), args.limit, now, 30
+            )
+            latencies.append(time.perf_counter() - started)
+            mismatches += ranked != [r.job_id for r in expected]
+        report("python", latencies)
+        print(f"rankings differing: {mismatches}/{len(applicants)}")
+
+
+if __name__ == "__main__":
+    main()
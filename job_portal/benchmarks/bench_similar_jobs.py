@@ -0,0 +1,115 @@
+"""
+Similar job lookups over a MinHash LSH index at catalog scale.
+
+Builds a SimilarJobIndex from a synthetic catalog (no database), times
+lookups and reports their recall against exact Jaccard similarity:
+
+    python benchmarks/bench_similar_jobs.py --jobs 100000 --skills 5000
+
+The catalog is made of base jobs and variants of them with a few skills
+swapped, so near neighbours exist. Recall is measured for the sampled jobs
+against a brute force scan of the whole catalog.
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "job_portal.settings")
+
+
+def synthetic_catalog(rng, jobs, skills, variants):
+    popularity = 1 / np.arange(1, skills + 1) ** 1.1
+    popularity /= popularity.sum()
+    catalog = []
+    while len(catalog) < jobs:
+        base = set(
+            (rng.choice(skills, size=rng.integers(3, 13), p=popularity) + 1).tolist()
+        )
+        catalog.append(base)
+        for _ in range(variants):
+            variant = set(base)
+            for _ in range(rng.integers(1, 4)):
+                variant.discard(rng.choice(sorted(variant)))
+                variant.add(int(rng.choice(skills, p=popularity)) + 1)
+            catalog.append(variant or base)
+    return catalog[:jobs]
+
+
+def report(name, latencies):
+    latencies = sorted(latencies)
+    print(
+        f"{name:<8} p50 {statistics.median(latencies) * 1000:8.3f} ms | "
+        f"p95 {latencies[int(len(latencies) * 0.95) - 1] * 1000:8.3f} ms | "
+        f"max {latencies[-1] * 1000:8.3f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--jobs", type=int, default=100000)
+    parser.add_argument("--skills", type=int, default=5000)
+    parser.add_argument("--variants", type=int, default=2)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--threshold", type=float, default=0.5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    import django
+
+    django.setup()
+
+    from jobs.similarity import SimilarJobIndex, minhash
+
+    rng = np.random.default_rng(args.seed)
+    catalog = synthetic_catalog(rng, args.jobs, args.skills, args.variants)
+    started = time.perf_counter()
+    signatures = [minhash(skills) for skills in catalog]
+    signing = time.perf_counter() - started
+    started = time.perf_counter()
+    index = SimilarJobIndex(enumerate(signatures))
+    build = time.perf_counter() - started
+    print(
+        f"{len(index)} jobs, {len(np.unique(index.keys))} band keys | "
+        f"signing {signing * 1000:.0f} ms | build {build * 1000:.0f} ms"
+    )
+
+    queries = rng.choice(len(catalog), size=args.queries, replace=False).tolist()
+    latencies = []
+    results = {}
+    for job_id in queries:
+        started = time.perf_counter()
+        results[job_id] = index.similar(job_id, args.limit)
+        latencies.append(time.perf_counter() - started)
+    report("lsh", latencies)
+
+    expected = found = 0
+    latencies = []
+    for job_id in queries:
+        skills = catalog[job_id]
+        started = time.perf_counter()
+        exact = {
+            other_id
+            for other_id, other in enumerate(catalog)
+            if other_id != job_id
+            and len(skills & other) / len(skills | other) >= args.threshold
+        }
+        latencies.append(time.perf_counter() - started)
+        retrieved = {other_id for other_id, _ in index.similar(job_id)}
+        expected += len(exact)
+        found += len(exact & retrieved)
+    report("exact", latencies)
+    print(
+        f"recall at Jaccard >= {args.threshold}: {found}/{expected} "
+        f"({found / max(expected, 1):.3f})"
+    )
+
+
+if __name__ == "__main__":
+    main()
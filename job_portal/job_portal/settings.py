@@ -13,6 +13,8 @@ https://docs.djangoproject.com/en/4.2/ref/settings/
 from pathlib import Path
 from datetime import timedelta
 import os
+import sys
+import tempfile
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -30,6 +32,8 @@ SECRET_KEY = "django-insecure-_9tzk@l8*hp_k73ml@kz&jx7syd)phs=2gk+cfs#ky9!v(2i+o
 # SECURITY WARNING: don't run with debug turned on in production!
 DEBUG = True
 
+TESTING = len(sys.argv) > 1 and sys.argv[1] == "test"
+
 ALLOWED_HOSTS = []
 
 
@@ -97,6 +101,52 @@ DATABASES = {
 }
 
 
+# Cache
+# Throttle counters and the version keys of the in-process indexes (skill
+# catalog, job recommendations, saved searches, similar jobs, gazetteer)
+# need a cache shared by every worker process, with an atomic incr and no
+# eviction of live keys: set REDIS_URL (docker-compose runs redis), or
+# CACHE_BACKEND/CACHE_LOCATION for memcached. Without either, the file based
+# cache is used. It is only shared on one host and its incr is a get
+# followed by a set, so it is meant for development; MAX_ENTRIES is raised
+# so that culling does not drop live counters. Tests run with the dummy
+# cache so that no state leaks between test cases.
+
+REDIS_URL = os.getenv("REDIS_URL")
+
+if os.getenv("CACHE_BACKEND"):
+    CACHES = {
+        "default": {
+            "BACKEND": os.getenv("CACHE_BACKEND"),
+            "LOCATION": os.getenv("CACHE_LOCATION"),
+        }
+    }
+elif REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": os.getenv(
+                "CACHE_LOCATION",
+                os.path.join(tempfile.gettempdir(), "job_portal_cache"),
+            ),
+            "OPTIONS": {"MAX_ENTRIES": 1000000},
+        }
+    }
+
+# Seconds a serialized applicant/employer profile stays cached
+PROFILE_CACHE_TIMEOUT = 60 * 15
+
+if TESTING:
+    CACHES["default"] = {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -140,11 +190,34 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 AUTH_USER_MODEL = "users.User"
 
+AUTHENTICATION_BACKENDS = ["users.backends.PooledPasswordBackend"]
+
+# Password hashing and verification run in a bounded process pool so that
+# registration/login storms cannot pin every request worker (users/hashing.py).
+# WORKERS=0 hashes inline on the request thread.
+PASSWORD_HASHING = {
+    "WORKERS": int(os.getenv("PASSWORD_HASHING_WORKERS", min(os.cpu_count() or 1, 4))),
+    "MAX_PENDING": int(os.getenv("PASSWORD_HASHING_MAX_PENDING", 64)),
+    "TIMEOUT": float(os.getenv("PASSWORD_HASHING_TIMEOUT", 5)),
+}
+
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
         "rest_framework_simplejwt.authentication.JWTAuthentication",
     ),
     "EXCEPTION_HANDLER": "api.utils.custom_exception_handler",
+    # Per-IP throttles key on REMOTE_ADDR. Behind reverse proxies, set
+    # NUM_PROXIES to their number so the client address is read from the
+    # X-Forwarded-For entry the outermost proxy appended, never from one the
+    # client supplied.
+    "NUM_PROXIES": int(os.getenv("NUM_PROXIES", "0")),
+    # Sliding window quotas per scope, see api/throttling.py
+    "DEFAULT_THROTTLE_RATES": {
+        "login": os.getenv("THROTTLE_LOGIN_RATE", "10/min"),
+        "register": os.getenv("THROTTLE_REGISTER_RATE", "5/min"),
+        "job_create": os.getenv("THROTTLE_JOB_CREATE_RATE", "30/hour"),
+        "job_application": os.getenv("THROTTLE_JOB_APPLICATION_RATE", "60/hour"),
+    },
 }
 
 SIMPLE_JWT = {
@@ -152,7 +225,8 @@ SIMPLE_JWT = {
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),  # Refresh token expiration time
     "ROTATE_REFRESH_TOKENS": False,  # Set True if you want to rotate refresh tokens
     "BLACKLIST_AFTER_ROTATION": True,  # If using refresh token rotation, set this to True
-    "UPDATE_LAST_LOGIN": True,  # Update the last login time
+    # last_login is written in batches by users.last_login.LastLoginWriter
+    "UPDATE_LAST_LOGIN": False,
     "ALGORITHM": "HS256",  # Algorithm to use for signing tokens
     "SIGNING_KEY": SECRET_KEY,  # Secret key to sign the token (ensure this is secret!)
     "AUDIENCE": None,
@@ -167,6 +241,50 @@ SIMPLE_JWT = {
     "TOKEN_USER_CLASS": "rest_framework_simplejwt.models.TokenUser",
 }
 
+# Seconds between batched last_login writes, 0 writes on every login
+LAST_LOGIN_FLUSH_INTERVAL = (
+    0 if TESTING else int(os.getenv("LAST_LOGIN_FLUSH_INTERVAL", 10))
+)
+
+# Resumable resume uploads (users/uploads.py). Partial files live in
+# RESUME_UPLOAD_TEMP_DIR, ideally on the same filesystem as MEDIA_ROOT so a
+# finished upload is moved into storage rather than copied.
+RESUME_MAX_SIZE = int(os.getenv("RESUME_MAX_SIZE", 5 * 1024 * 1024))
+RESUME_UPLOAD_TEMP_DIR = os.getenv(
+    "RESUME_UPLOAD_TEMP_DIR", os.path.join(tempfile.gettempdir(), "resume_uploads")
+)
+RESUME_UPLOAD_SESSION_TTL = timedelta(hours=24)
+
+# Resume text extraction pool (users/resume_text.py), 0 extracts inline
+RESUME_TEXT_EXTRACTION = {
+    "WORKERS": 0 if TESTING else int(os.getenv("RESUME_TEXT_WORKERS", 2)),
+}
+
+# How resumes are served (users/downloads.py): "django" streams them from
+# the app with Range support, "x-accel" (nginx, internal location mapped to
+# MEDIA_ROOT at RESUME_X_ACCEL_PREFIX) and "x-sendfile" (Apache) hand the
+# file to the web server after the permission check.
+RESUME_DOWNLOAD = {
+    "MODE": os.getenv("RESUME_DOWNLOAD_MODE", "django"),
+    "X_ACCEL_PREFIX": os.getenv("RESUME_X_ACCEL_PREFIX", "/protected/"),
+}
+
+# Job recommendations (jobs/recommendations.py): seconds before a process
+# picks up job changes made elsewhere, the age at which a job's score is
+# halved, jobs kept per applicant in JobRecommendation and the processes
+# refreshing that table (0 refreshes inline).
+JOB_RECOMMENDATIONS = {
+    "REFRESH_INTERVAL": int(os.getenv("JOB_RECOMMENDATIONS_REFRESH_INTERVAL", 60)),
+    "HALF_LIFE_DAYS": 30,
+    "TOP_K": 50,
+    "WORKERS": 0 if TESTING else int(os.getenv("JOB_RECOMMENDATIONS_WORKERS", 1)),
+}
+
+# Saved search alerts for new jobs are percolated in this many processes
+JOB_ALERTS = {
+    "WORKERS": 0 if TESTING else int(os.getenv("JOB_ALERTS_WORKERS", 1)),
+}
+
 TEST_RUNNER = "redgreenunittest.django.runner.RedGreenDiscoverRunner"
 
 LOGGING = {
@@ -0,0 +1,245 @@
+import atexit
+import bisect
+import logging
+import multiprocessing
+import os
+import threading
+from collections import defaultdict, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import product
+
+from django.conf import settings
+from django.db import transaction
+
+from users.hashing import _init_worker
+from users.versioned_cache import VersionedCache
+
+from .filters import job_location_key, job_matches, location_key
+from .models import Jobs, Notification, SavedSearch
+from .notifications import create_notifications
+
+logger = logging.getLogger(__name__)
+
+VERSION_CACHE_KEY = "jobs:saved_searches:version"
+
+PercolatorEntry = namedtuple(
+    "PercolatorEntry", "search_id user_id name criteria location"
+)
+
+
+class PercolatorIndex:
+    """
+    Saved searches bucketed by the values a job must equal to match them.
+
+    The bucket key is (location, job_type, experience_level, anchor skill),
+    with "" or None where the search leaves the criterion open; the anchor is
+    the search's lowest skill id, which any matching job must require. A job
+    therefore only looks at the 8 * (skills + 1) buckets it could match,
+    and within a bucket only at the prefix of searches, sorted by
+    min_salary, that its salary reaches. Those candidates are confirmed with
+    jobs.filters.job_matches.
+
+    Entries carry the location_key of their location, geocoded once when
+    they are loaded, so the index is rebuilt when the gazetteer changes.
+    """
+
+    def __init__(self, searches, version=None):
+        self.version = version
+        buckets = defaultdict(list)
+        for entry in searches:
+            criteria = entry.criteria
+            key = (
+                entry.location,
+                criteria["job_type"],
+                criteria["experience_level"],
+                min(criteria["skills"], default=None),
+            )
+            min_salary = criteria["min_salary"]
+            buckets[key].append(
+                (float("-inf") if min_salary is None else float(min_salary), entry)
+            )
+        self.buckets = {}
+        for key, entries in buckets.items():
+            entries.sort(key=lambda item: (item[0], item[1].search_id))
+            self.buckets[key] = (
+                [salary for salary, _ in entries],
+                [entry for _, entry in entries],
+            )
+        self.size = sum(len(entries) for entries in buckets.values())
+
+    def match(self, job, skill_ids):
+        """Entries of the saved searches ``job`` matches"""
+        skill_ids = set(skill_ids)
+        salary = float(job.salary_max)
+        matches = []
+        for key in product(
+            (job_location_key(job), ""),
+            (job.job_type, ""),
+            (job.experience_level, ""),
+            (None, *skill_ids),
+        ):
+            bucket = self.buckets.get(key)
+            if bucket is None:
+                continue
+            salaries, entries = bucket
+            for entry in entries[: bisect.bisect_right(salaries, salary)]:
+                if job_matches(entry.criteria, job, skill_ids, entry.location):
+                    matches.append(entry)
+        return matches
+
+
+class SavedSearchPercolator(VersionedCache):
+    """
+    In-process PercolatorIndex over the saved searches with alerts enabled.
+
+    Saved search writes bump a version in the shared cache, so every
+    process rebuilds its index on the next job it percolates; the writing
+    process drops its own copy right away.
+    """
+
+    cache_key = VERSION_CACHE_KEY
+
+    def build(self, version):
+        return PercolatorIndex(self.load_searches(), version=version)
+
+    def index(self):
+        return self.get()
+
+    def load_searches(self):
+        skills = defaultdict(set)
+        for search_id, skill_id in SavedSearch.skills.through.objects.filter(
+            savedsearch__alerts_enabled=True
+        ).values_list("savedsearch_id", "skill_id"):
+            skills[search_id].add(skill_id)
+        for (
+            search_id,
+            user_id,
+            name,
+            location,
+            job_type,
+            experience_level,
+            min_salary,
+        ) in (
+            SavedSearch.objects.filter(alerts_enabled=True)
+            .values_list(
+                "id",
+                "user_id",
+                "name",
+                "location",
+                "job_type",
+                "experience_level",
+                "min_salary",
+            )
+            .iterator(chunk_size=10000)
+        ):
+            yield PercolatorEntry(
+                search_id,
+                user_id,
+                name,
+                {
+                    "location": location,
+                    "job_type": job_type,
+                    "experience_level": experience_level,
+                    "min_salary": min_salary,
+                    "skills": frozenset(skills[search_id]),
+                },
+                location_key(location),
+            )
+
+
+saved_search_percolator = SavedSearchPercolator()
+
+
+def alert_message(name, job):
+    return (
+        f'New job matching your saved search "{name}": {job.job_title} at '
+        f"{job.employer.company_name} ({job.location})."
+    )
+
+
+def percolate_job(job_id):
+    """
+    Notify the owners of the saved searches a newly posted job matches, one
+    notification per user, written with a single bulk_create and added to
+    their unread counters. Returns the number of notifications.
+    """
+    job = (
+        Jobs.objects.select_related("employer")
+        .filter(pk=job_id, is_active=True)
+        .first()
+    )
+    if job is None:
+        return 0
+    skill_ids = Jobs.required_skills.through.objects.filter(jobs_id=job_id).values_list(
+        "skill_id", flat=True
+    )
+    names = {}
+    for entry in saved_search_percolator.index().match(job, skill_ids):
+        if entry.user_id != job.employer.user_id:
+            names.setdefault(entry.user_id, entry.name)
+    create_notifications(
+        Notification(user_id=user_id, message=alert_message(name, job))
+        for user_id, name in names.items()
+    )
+    return len(names)
+
+
+def run_percolate(job_id):
+    """Pool entry point; a failure is logged, the job's alerts are lost"""
+    try:
+        return percolate_job(job_id)
+    except Exception:
+        logger.exception("Job alerts failed for job %s.", job_id)
+        return 0
+
+
+class JobAlertSender:
+    """
+    Percolates new jobs in a process pool once they are committed, so the
+    employer's request neither waits for the matching nor fails with it.
+    Each pool process keeps its own SavedSearchPercolator index.
+    ``max_workers=0`` percolates inline, which is what the tests use.
+    """
+
+    def __init__(self, max_workers=1):
+        self.max_workers = max_workers
+        self._executor = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls):
+        config = getattr(settings, "JOB_ALERTS", {})
+        return cls(max_workers=config.get("WORKERS", 1))
+
+    def get_executor(self):
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.max_workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                        initializer=_init_worker,
+                        initargs=(os.environ.get("DJANGO_SETTINGS_MODULE", ""),),
+                    )
+        return self._executor
+
+    def submit(self, job_id):
+        if self.max_workers <= 0:
+            run_percolate(job_id)
+        else:
+            self.get_executor().submit(run_percolate, job_id)
+
+    def schedule(self, job_id):
+        """Percolate once the current transaction commits"""
+        # robust: a failure here must not skip the other on_commit callbacks
+        transaction.on_commit(partial(self.submit, job_id), robust=True)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+job_alert_sender = JobAlertSender.from_settings()
+atexit.register(job_alert_sender.shutdown)
@@ -0,0 +1,169 @@
+"""
+Near-duplicate job postings by SimHash.
+
+A posting's fingerprint is a 64 bit SimHash of the words of its title and
+description: every word hashes to 64 bits, and bit i of the fingerprint is
+set when the occurrences of words with bit i set outweigh the others.
+Small edits flip few bits, so copies lie within a small Hamming distance.
+Words rather than shingles keep that distance small for short postings,
+where one changed word would otherwise change a sizeable share of the
+features.
+
+To find them without scanning every job, the fingerprint is cut into
+BANDS bands of 16 bits, each in an indexed column. Two fingerprints at
+distance MAX_DISTANCE or less differ in at most MAX_DISTANCE bands, so
+they agree exactly on at least one: a lookup reads the jobs sharing one
+of the four band values and checks their distance.
+"""
+
+import hashlib
+import re
+from collections import Counter
+
+import numpy as np
+from django.db.models import Q
+
+from .models import Jobs
+
+BITS = 64
+BANDS = 4
+BAND_BITS = BITS // BANDS
+MAX_DISTANCE = BANDS - 1
+MASK = (1 << BITS) - 1
+BAND_FIELDS = [f"simhash_band_{band}" for band in range(BANDS)]
+
+
+def words(text):
+    return Counter(re.findall(r"\w+", text.casefold()))
+
+
+def simhash(job_title, description):
+    """Unsigned 64 bit SimHash of a posting, None when it has no words"""
+    features = words(f"{job_title}\n{description}")
+    if not features:
+        return None
+    hashes = np.array(
+        [
+            int.from_bytes(
+                hashlib.blake2b(word.encode(), digest_size=8).digest(), "big"
+            )
+            for word in features
+        ],
+        dtype=np.uint64,
+    )
+    weights = np.array(list(features.values()), dtype=np.int64)
+    bits = np.unpackbits(hashes.astype(">u8").view(np.uint8).reshape(-1, 8), axis=1)
+    # Bit 0 of the sum is the most significant bit of the hashes
+    score = weights @ np.where(bits, 1, -1)
+    return int("".join("1" if s > 0 else "0" for s in score.tolist()), 2)
+
+
+def bands(fingerprint):
+    return [
+        (fingerprint >> (band * BAND_BITS)) & ((1 << BAND_BITS) - 1)
+        for band in range(BANDS)
+    ]
+
+
+def to_signed(fingerprint):
+    """Fingerprint as stored in the signed BIGINT column"""
+    return fingerprint - (1 << BITS) if fingerprint >= 1 << (BITS - 1) else fingerprint
+
+
+def hamming(a, b):
+    return bin((a ^ b) & MASK).count("1")
+
+
+def fingerprint_fields(job_title, description):
+    """Jobs field values for the fingerprint of a posting"""
+    fingerprint = simhash(job_title, description)
+    if fingerprint is None:
+        return {"simhash": None, **dict.fromkeys(BAND_FIELDS)}
+    return {
+        "simhash": to_signed(fingerprint),
+        **dict(zip(BAND_FIELDS, bands(fingerprint))),
+    }
+
+
+def find_duplicates(fields, queryset=None):
+    """
+    ``(job_id, employer_id, duplicate_of_id, distance)`` of the jobs in
+    ``queryset`` (active jobs by default) within MAX_DISTANCE of the
+    fingerprint in ``fields``, closest first.
+    """
+    if fields["simhash"] is None:
+        return []
+    if queryset is None:
+        queryset = Jobs.objects.filter(is_active=True)
+    lookup = Q()
+    for field in BAND_FIELDS:
+        lookup |= Q(**{field: fields[field]})
+    duplicates = []
+    for job_id, employer_id, duplicate_of_id, fingerprint in queryset.filter(
+        lookup
+    ).values_list("id", "employer_id", "duplicate_of_id", "simhash"):
+        distance = hamming(fingerprint, fields["simhash"])
+        if distance <= MAX_DISTANCE:
+            duplicates.append((job_id, employer_id, duplicate_of_id, distance))
+    duplicates.sort(key=lambda duplicate: (duplicate[3], duplicate[0]))
+    return duplicates
+
+
+def update_fingerprints(job_ids):
+    """Store the fingerprints of the given jobs; returns how many have one"""
+    jobs = [
+        Jobs(pk=job_id, **fingerprint_fields(job_title, description))
+        for job_id, job_title, description in Jobs.objects.filter(
+            pk__in=job_ids
+        ).values_list("id", "job_title", "description")
+    ]
+    Jobs.objects.bulk_update(jobs, ["simhash", *BAND_FIELDS], batch_size=1000)
+    return sum(job.simhash is not None for job in jobs)
+
+
+def cluster_fingerprints(fingerprints):
+    """
+    Group ``{job_id: fingerprint}`` into clusters of near-duplicates and
+    return ``{job_id: root job_id}`` for every job but the earliest (lowest
+    id) of its cluster. Jobs sharing a band value are compared, and those
+    within MAX_DISTANCE are joined; a cluster may therefore chain postings
+    further apart than MAX_DISTANCE through the ones between them.
+    """
+    by_fingerprint = {}
+    for job_id, fingerprint in fingerprints.items():
+        by_fingerprint.setdefault(fingerprint & MASK, []).append(job_id)
+    values = np.array(list(by_fingerprint), dtype=np.uint64)
+    parent = np.arange(len(values))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for band in range(BANDS):
+        keys = (values >> np.uint64(band * BAND_BITS)) & np.uint64((1 << BAND_BITS) - 1)
+        order = np.argsort(keys, kind="stable")
+        sorted_keys = keys[order]
+        bounds = np.concatenate(
+            ([0], np.flatnonzero(sorted_keys[1:] != sorted_keys[:-1]) + 1, [len(order)])
+        )
+        for bucket in np.flatnonzero(np.diff(bounds) > 1):
+            members = order[bounds[bucket] : bounds[bucket + 1]]
+            for position in range(len(members) - 1):
+                distances = np.bitwise_count(
+                    values[members[position + 1 :]] ^ values[members[position]]
+                )
+                for other in members[position + 1 :][distances <= MAX_DISTANCE]:
+                    a, b = find(members[position]), find(other)
+                    if a != b:
+                        parent[b] = a
+
+    clusters = {}
+    for i, job_ids in enumerate(by_fingerprint.values()):
+        clusters.setdefault(find(i), []).extend(job_ids)
+    roots = {}
+    for job_ids in clusters.values():
+        root = min(job_ids)
+        roots.update((job_id, root) for job_id in job_ids if job_id != root)
+    return roots
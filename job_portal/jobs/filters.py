@@ -0,0 +1,86 @@
+"""
+Job search criteria shared by the job listing filters and saved searches.
+
+A job matches when it is at ``location``, its job_type and experience_level equal the given
+ones, its ``salary_max`` reaches ``min_salary`` and it requires every skill
+in ``skills``. Criteria left empty match every job. Locations known to the
+gazetteer match by place, so "NYC" finds jobs in "New York, NY"; other
+locations match by text, ignoring case and surrounding whitespace.
+
+The job listing also takes ``near`` (a geocoded Place) and ``radius_km``,
+which saved searches do not have.
+"""
+
+from users.locations import location_gazetteer, locations_within
+
+FILTER_FIELDS = ("location", "job_type", "experience_level", "min_salary", "skills")
+DEFAULT_RADIUS_KM = 25
+
+
+def location_key(value):
+    """Geocoded Location id of a search location, else its folded text"""
+    text = (value or "").strip()
+    if not text:
+        return ""
+    place = location_gazetteer.geocode(text)
+    return text.casefold() if place is None else place.id
+
+
+def job_location_key(job):
+    """The same for a job, from the location geocoded when it was saved"""
+    if job.location_ref_id is not None:
+        return job.location_ref_id
+    return job.location.strip().casefold()
+
+
+def filter_jobs(queryset, criteria):
+    """Apply search ``criteria`` (validated JobFilterSerializer data) to Jobs"""
+    if criteria.get("location"):
+        key = location_key(criteria["location"])
+        if isinstance(key, str):
+            queryset = queryset.filter(
+                location_ref__isnull=True, location__iexact=criteria["location"].strip()
+            )
+        else:
+            queryset = queryset.filter(location_ref_id=key)
+    if criteria.get("near") is not None:
+        near = criteria["near"]
+        nearby = locations_within(
+            near.latitude,
+            near.longitude,
+            criteria.get("radius_km", DEFAULT_RADIUS_KM),
+        )
+        queryset = queryset.filter(location_ref_id__in=list(nearby))
+    if criteria.get("job_type"):
+        queryset = queryset.filter(job_type=criteria["job_type"])
+    if criteria.get("experience_level"):
+        queryset = queryset.filter(experience_level=criteria["experience_level"])
+    if criteria.get("min_salary") is not None:
+        queryset = queryset.filter(salary_max__gte=criteria["min_salary"])
+    # One join per skill: the job must require all of them
+    for skill in criteria.get("skills") or ():
+        queryset = queryset.filter(required_skills=skill)
+    return queryset
+
+
+def job_matches(criteria, job, skill_ids, location=None):
+    """
+    The same test for one job, ``skill_ids`` being its required skills.
+    ``location`` is the location_key of the criteria's location if known.
+    """
+    if location is None:
+        location = location_key(criteria.get("location"))
+    return (
+        (not location or location == job_location_key(job))
+        and (not criteria.get("job_type") or criteria["job_type"] == job.job_type)
+        and (
+            not criteria.get("experience_level")
+            or criteria["experience_level"] == job.experience_level
+        )
+        and (
+            criteria.get("min_salary") is None
+            or job.salary_max >= criteria["min_salary"]
+        )
+        and {getattr(skill, "pk", skill) for skill in criteria.get("skills") or ()}
+        <= set(skill_ids)
+    )
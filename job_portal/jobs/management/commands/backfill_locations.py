@@ -0,0 +1,73 @@
+import time
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand
+
+from jobs.models import Jobs
+from users.locations import location_gazetteer
+from users.models import EmployerProfile
+
+
+class Command(BaseCommand):
+    help = (
+        "Geocode the free text location of existing jobs and employer "
+        "profiles into location_ref. Walks each table in primary key order, "
+        "one UPDATE per place and chunk, so it can run against a live "
+        "database and be resumed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=1000)
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Geocode rows that already have a location again",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=0,
+            help="Seconds to pause between chunks to leave room for live traffic",
+        )
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        for model in (EmployerProfile, Jobs):
+            self.backfill(model, options)
+        self.stdout.write(
+            self.style.SUCCESS(f"Done in {time.monotonic() - started:.1f}s.")
+        )
+
+    def backfill(self, model, options):
+        queryset = model.objects.order_by("pk")
+        if not options["all"]:
+            queryset = queryset.filter(location_ref__isnull=True)
+        last_id = 0
+        geocoded = unmatched = 0
+        while True:
+            chunk = list(
+                queryset.filter(pk__gt=last_id).values_list("pk", "location")[
+                    : options["chunk_size"]
+                ]
+            )
+            if not chunk:
+                break
+            last_id = chunk[-1][0]
+            by_location = defaultdict(list)
+            for pk, text in chunk:
+                place = location_gazetteer.geocode(text)
+                by_location[None if place is None else place.id].append(pk)
+            for location_id, pks in by_location.items():
+                if location_id is None:
+                    unmatched += len(pks)
+                    if not options["all"]:
+                        continue
+                else:
+                    geocoded += len(pks)
+                model.objects.filter(pk__in=pks).update(location_ref_id=location_id)
+            self.stdout.write(
+                f"{model.__name__} up to {last_id}: {geocoded} geocoded, "
+                f"{unmatched} unmatched"
+            )
+            if options["sleep"]:
+                time.sleep(options["sleep"])
@@ -0,0 +1,101 @@
+import time
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand
+
+from jobs.duplicates import cluster_fingerprints, update_fingerprints
+from jobs.models import Jobs
+
+
+class Command(BaseCommand):
+    help = (
+        "Cluster near-duplicate jobs by the SimHash of their title and "
+        "description and point every job at the earliest posting of its "
+        "cluster through duplicate_of. Jobs without a fingerprint, e.g. those "
+        "posted before fingerprints existed, are fingerprinted first."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=1000)
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Fingerprint jobs that already have a fingerprint again",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report the clusters without writing duplicate_of",
+        )
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        self.fingerprint(options)
+
+        fingerprints, current = {}, {}
+        for job_id, fingerprint, duplicate_of_id in (
+            Jobs.objects.filter(simhash__isnull=False)
+            .values_list("id", "simhash", "duplicate_of_id")
+            .iterator(chunk_size=10000)
+        ):
+            fingerprints[job_id] = fingerprint
+            current[job_id] = duplicate_of_id
+        roots = cluster_fingerprints(fingerprints)
+        self.stdout.write(
+            f"{len(roots)} of {len(fingerprints)} jobs duplicate "
+            f"{len(set(roots.values()))} earlier postings"
+        )
+
+        by_root = defaultdict(list)
+        for job_id, root in roots.items():
+            if current[job_id] != root:
+                by_root[root].append(job_id)
+        stale = [
+            job_id
+            for job_id in Jobs.objects.filter(duplicate_of__isnull=False).values_list(
+                "pk", flat=True
+            )
+            if job_id not in roots
+        ]
+        if options["dry_run"]:
+            for root, job_ids in sorted(by_root.items()):
+                self.stdout.write(f"  {root}: {', '.join(map(str, sorted(job_ids)))}")
+            self.stdout.write(
+                f"Would flag {sum(map(len, by_root.values()))} and clear "
+                f"{len(stale)} jobs."
+            )
+            return
+
+        for root, job_ids in by_root.items():
+            for start in range(0, len(job_ids), options["chunk_size"]):
+                Jobs.objects.filter(
+                    pk__in=job_ids[start : start + options["chunk_size"]]
+                ).update(duplicate_of_id=root)
+        for start in range(0, len(stale), options["chunk_size"]):
+            Jobs.objects.filter(
+                pk__in=stale[start : start + options["chunk_size"]]
+            ).update(duplicate_of=None)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Flagged {sum(map(len, by_root.values()))} and cleared "
+                f"{len(stale)} jobs in {time.monotonic() - started:.1f}s."
+            )
+        )
+
+    def fingerprint(self, options):
+        queryset = Jobs.objects.order_by("pk")
+        if not options["all"]:
+            queryset = queryset.filter(simhash__isnull=True)
+        last_id = 0
+        fingerprinted = 0
+        while True:
+            job_ids = list(
+                queryset.filter(pk__gt=last_id).values_list("pk", flat=True)[
+                    : options["chunk_size"]
+                ]
+            )
+            if not job_ids:
+                break
+            last_id = job_ids[-1]
+            fingerprinted += update_fingerprints(job_ids)
+            self.stdout.write(f"Fingerprinted {fingerprinted} jobs up to {last_id}")
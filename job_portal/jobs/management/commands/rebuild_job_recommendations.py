@@ -0,0 +1,68 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from jobs.recommendations import job_recommender, refresh_applicants
+from users.hashing import _init_worker
+from users.models import ApplicantProfile
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the JobRecommendation table of every applicant, fanned out "
+        "over a process pool. Each process builds the job matrix once."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=settings.JOB_RECOMMENDATIONS.get("WORKERS") or os.cpu_count(),
+            help="Processes, 0 runs inline",
+        )
+        parser.add_argument(
+            "--chunk-size", type=int, default=500, help="Applicants per task"
+        )
+
+    def handle(self, *args, **options):
+        profile_ids = list(
+            ApplicantProfile.objects.order_by("pk").values_list("pk", flat=True)
+        )
+        chunk_size = options["chunk_size"]
+        chunks = [
+            profile_ids[start : start + chunk_size]
+            for start in range(0, len(profile_ids), chunk_size)
+        ]
+        # The matrix must not be rebuilt for every chunk
+        job = partial(refresh_applicants, fresh=False)
+        started = time.monotonic()
+
+        if options["workers"] <= 0:
+            job_recommender.matrix(fresh=True)
+            self.report(map(job, chunks), len(profile_ids), started)
+            return
+
+        with ProcessPoolExecutor(
+            max_workers=options["workers"],
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(os.environ.get("DJANGO_SETTINGS_MODULE", ""),),
+        ) as executor:
+            self.report(executor.map(job, chunks), len(profile_ids), started)
+
+    def report(self, results, total, started):
+        done = 0
+        for count in results:
+            done += count
+            self.stdout.write(f"Recomputed {done}/{total} applicants")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rebuilt recommendations for {done} applicants in "
+                f"{time.monotonic() - started:.1f}s."
+            )
+        )
@@ -0,0 +1,35 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from jobs.models import Jobs
+from jobs.similarity import similar_jobs, update_signatures
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the MinHash skill signature of every job, e.g. after "
+        "existing jobs were migrated or skills were deleted."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size", type=int, default=1000, help="Jobs per update"
+        )
+
+    def handle(self, *args, **options):
+        job_ids = list(Jobs.objects.order_by("pk").values_list("pk", flat=True))
+        chunk_size = options["chunk_size"]
+        started = time.monotonic()
+        for start in range(0, len(job_ids), chunk_size):
+            update_signatures(job_ids[start : start + chunk_size])
+            self.stdout.write(
+                f"Signed {min(start + chunk_size, len(job_ids))}/{len(job_ids)} jobs"
+            )
+        similar_jobs.invalidate()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rebuilt skill signatures for {len(job_ids)} jobs in "
+                f"{time.monotonic() - started:.1f}s."
+            )
+        )
@@ -0,0 +1,125 @@
+import multiprocessing
+import os
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from jobs.models import Jobs
+from jobs.recommendations import job_recommender
+from jobs.similarity import similar_jobs, update_signatures
+from users.hashing import _init_worker
+from users.skill_tagger import skill_tagger
+from users.skills import skill_autocomplete
+
+
+def untagged_skills(job_ids):
+    """(job_id, skill ids named in its description but not required) pairs"""
+    required = defaultdict(set)
+    for job_id, skill_id in Jobs.required_skills.through.objects.filter(
+        jobs_id__in=job_ids
+    ).values_list("jobs_id", "skill_id"):
+        required[job_id].add(skill_id)
+    missing = []
+    for job_id, description in Jobs.objects.filter(pk__in=job_ids).values_list(
+        "pk", "description"
+    ):
+        skill_ids = [
+            skill_id
+            for skill_id in skill_tagger.skill_ids(description)
+            if skill_id not in required[job_id]
+        ]
+        if skill_ids:
+            missing.append((job_id, skill_ids))
+    return missing
+
+
+class Command(BaseCommand):
+    help = (
+        "Find skills named in job descriptions but missing from their "
+        "required skills, scanning the jobs in a process pool. Each process "
+        "builds the skill automaton once. Reports only, unless --attach."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count(),
+            help="Processes, 0 runs inline",
+        )
+        parser.add_argument(
+            "--chunk-size", type=int, default=1000, help="Jobs per task"
+        )
+        parser.add_argument(
+            "--attach", action="store_true", help="Add the skills found to the jobs"
+        )
+        parser.add_argument(
+            "--active-only", action="store_true", help="Skip inactive jobs"
+        )
+
+    def handle(self, *args, **options):
+        jobs = Jobs.objects.order_by("pk")
+        if options["active_only"]:
+            jobs = jobs.filter(is_active=True)
+        job_ids = list(jobs.values_list("pk", flat=True))
+        chunk_size = options["chunk_size"]
+        chunks = [
+            job_ids[start : start + chunk_size]
+            for start in range(0, len(job_ids), chunk_size)
+        ]
+        started = time.monotonic()
+
+        if options["workers"] <= 0:
+            skill_tagger.automaton()
+            self.apply(map(untagged_skills, chunks), len(job_ids), options)
+        else:
+            with ProcessPoolExecutor(
+                max_workers=options["workers"],
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(os.environ.get("DJANGO_SETTINGS_MODULE", ""),),
+            ) as executor:
+                self.apply(executor.map(untagged_skills, chunks), len(job_ids), options)
+        self.stdout.write(f"Done in {time.monotonic() - started:.1f}s.")
+
+    def apply(self, results, total, options):
+        through = Jobs.required_skills.through
+        scanned = tagged_jobs = tagged_skills = 0
+        changed = []
+        for missing in results:
+            scanned += options["chunk_size"]
+            tagged_jobs += len(missing)
+            tagged_skills += sum(len(skill_ids) for _, skill_ids in missing)
+            if options["attach"] and missing:
+                with transaction.atomic():
+                    through.objects.bulk_create(
+                        [
+                            through(jobs_id=job_id, skill_id=skill_id)
+                            for job_id, skill_ids in missing
+                            for skill_id in skill_ids
+                        ],
+                        batch_size=1000,
+                        ignore_conflicts=True,
+                    )
+                changed.extend(job_id for job_id, _ in missing)
+                update_signatures([job_id for job_id, _ in missing])
+            self.stdout.write(
+                f"Scanned {min(scanned, total)}/{total} jobs: {tagged_skills} "
+                f"skills missing from {tagged_jobs} jobs"
+            )
+
+        if changed:
+            # The rows were inserted without m2m_changed, refresh what
+            # the signals would have
+            similar_jobs.invalidate()
+            job_recommender.invalidate()
+            skill_autocomplete.invalidate()
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Attached {tagged_skills} skills to {len(changed)} jobs. Run "
+                    "rebuild_job_recommendations to refresh recommendations."
+                )
+            )
@@ -0,0 +1,32 @@
+# Generated by Django 4.2.16 on 2026-10-19 00:03
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0006_resumetext'),
+        ('jobs', '0003_alter_jobapplication_status_jobapplicationaudit'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobRecommendation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField()),
+                ('matched_skills', models.PositiveSmallIntegerField()),
+                ('applicant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='job_recommendations', to='users.applicantprofile')),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='recommendations', to='jobs.jobs')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['applicant', '-score'], name='job_recommendation_rank_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='jobrecommendation',
+            constraint=models.UniqueConstraint(fields=('applicant', 'job'), name='unique_job_recommendation'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.16 on 2026-10-19 00:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0005_savedsearch'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobs',
+            name='skill_signature',
+            field=models.BinaryField(null=True),
+        ),
+    ]
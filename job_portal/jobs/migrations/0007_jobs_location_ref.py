@@ -0,0 +1,21 @@
+# Generated by Django 4.2.16 on 2026-10-19 00:30
+
+from django.db import migrations
+import django.db.models.deletion
+import users.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0008_location'),
+        ('jobs', '0006_jobs_skill_signature'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobs',
+            name='location_ref',
+            field=users.fields.GeocodedLocationField(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='jobs', source='location', to='users.location'),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 4.2.16 on 2026-10-19 00:43
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def count_unread_notifications(apps, schema_editor):
+    """Start the counters from the notifications already unread"""
+    Notification = apps.get_model("jobs", "Notification")
+    NotificationCounter = apps.get_model("jobs", "NotificationCounter")
+    NotificationCounter.objects.bulk_create(
+        [
+            NotificationCounter(user_id=row["user_id"], unread=row["unread"])
+            for row in Notification.objects.filter(is_read=False)
+            .values("user_id")
+            .annotate(unread=models.Count("id"))
+            .order_by()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0009_skillalias'),
+        ('jobs', '0008_jobs_simhash'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationCounter',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='notification_counter', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('unread', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['user', 'is_read', 'created_at'], name='notification_inbox_idx'),
+        ),
+        migrations.RunPython(count_unread_notifications, migrations.RunPython.noop),
+    ]
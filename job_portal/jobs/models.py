@@ -1,5 +1,6 @@
 from django.db import models
 from django.db import models
+from users.fields import GeocodedLocationField
 from users.models import EmployerProfile, Skill, ApplicantProfile, User, BaseModel
 
 
@@ -13,6 +14,7 @@ class Jobs(BaseModel):
         job_title (CharField): Title of the job position.
         description (TextField): Detailed description of the job responsibilities.
         location (CharField): Location where the job is based.
+        location_ref (GeocodedLocationField): Location geocoded from ``location``.
         salary_min (DecimalField): Minimum salary offered for the position.
         salary_max (DecimalField): Maximum salary offered for the position.
         job_type (CharField): Type of job (e.g., Full-Time, Part-Time, Contract).
@@ -20,6 +22,12 @@ class Jobs(BaseModel):
         experience_level (CharField): Level of experience required for the job.
         posted_date (DateTimeField): Date when the job was posted.
         is_active (BooleanField): Status indicating if the job is currently active.
+        skill_signature (BinaryField): MinHash signature of the required skills,
+            see jobs/similarity.py.
+        simhash (BigIntegerField): SimHash of the title and description, and
+            simhash_band_0 to simhash_band_3 its 16 bit bands, see
+            jobs/duplicates.py.
+        duplicate_of (ForeignKey): Earlier posting this job duplicates.
     """
 
     JOB_TYPE_CHOICES = [("FT", "Full-Time"), ("PT", "Part-Time"), ("CT", "Contract")]
@@ -35,6 +43,9 @@ class Jobs(BaseModel):
     job_title = models.CharField(max_length=100)
     description = models.TextField()
     location = models.CharField(max_length=100)
+    location_ref = GeocodedLocationField(
+        "users.Location", null=True, on_delete=models.SET_NULL, related_name="jobs"
+    )
     salary_min = models.DecimalField(max_digits=10, decimal_places=2)
     salary_max = models.DecimalField(max_digits=10, decimal_places=2)
     job_type = models.CharField(
@@ -48,6 +59,32 @@ class Jobs(BaseModel):
     )
     posted_date = models.DateTimeField(auto_now_add=True)
     is_active = models.BooleanField(default=True)
+    skill_signature = models.BinaryField(null=True, editable=False)
+    simhash = models.BigIntegerField(null=True, editable=False)
+    simhash_band_0 = models.PositiveIntegerField(
+        null=True, editable=False, db_index=True
+    )
+    simhash_band_1 = models.PositiveIntegerField(
+        null=True, editable=False, db_index=True
+    )
+    simhash_band_2 = models.PositiveIntegerField(
+        null=True, editable=False, db_index=True
+    )
+    simhash_band_3 = models.PositiveIntegerField(
+        null=True, editable=False, db_index=True
+    )
+    duplicate_of = models.ForeignKey(
+        "self",
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="duplicates",
+    )
+
+    def save(self, *args, update_fields=None, **kwargs):
+        if update_fields is not None and "location" in update_fields:
+            update_fields = {*update_fields, "location_ref"}
+        super().save(*args, update_fields=update_fields, **kwargs)
 
     def __str__(self):
         return self.job_title
@@ -137,3 +174,96 @@ class Notification(BaseModel):
     message = models.TextField()
     is_read = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["user", "is_read", "created_at"], name="notification_inbox_idx"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} - {self.message[:50]}"
+
+
+class NotificationCounter(models.Model):
+    """
+    Number of unread notifications of a user, maintained by
+    jobs.notifications whenever notifications are created or read, so
+    clients polling it never cause a COUNT query.
+    """
+
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="notification_counter",
+    )
+    unread = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.user_id}: {self.unread} unread"
+
+
+class JobRecommendation(models.Model):
+    """
+    Precomputed top matching jobs of an applicant, maintained by
+    jobs.recommendations.
+
+    ``score`` is the log2 of the match score at the Unix epoch. All jobs
+    decay at the same rate, so it orders jobs exactly like the current
+    score and never goes stale; the current score is derived from it when
+    read.
+    """
+
+    applicant = models.ForeignKey(
+        ApplicantProfile, on_delete=models.CASCADE, related_name="job_recommendations"
+    )
+    job = models.ForeignKey(
+        Jobs, on_delete=models.CASCADE, related_name="recommendations"
+    )
+    score = models.FloatField()
+    matched_skills = models.PositiveSmallIntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["applicant", "job"], name="unique_job_recommendation"
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=["applicant", "-score"], name="job_recommendation_rank_idx"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.applicant_id} - {self.job_id} ({self.score:.3f})"
+
+
+class SavedSearch(BaseModel):
+    """
+    Job search criteria saved by a user, who is notified of new jobs
+    matching them (see jobs.filters for the matching rules and
+    jobs.alerts for the percolator).
+    """
+
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="saved_searches"
+    )
+    name = models.CharField(max_length=100)
+    location = models.CharField(max_length=100, blank=True)
+    job_type = models.CharField(
+        max_length=50, choices=Jobs.JOB_TYPE_CHOICES, blank=True
+    )
+    experience_level = models.CharField(
+        max_length=50, choices=Jobs.EXPERIENCE_LEVEL_CHOICES, blank=True
+    )
+    min_salary = models.DecimalField(
+        max_digits=10, decimal_places=2, null=True, blank=True
+    )
+    skills = models.ManyToManyField(Skill, blank=True, related_name="saved_searches")
+    alerts_enabled = models.BooleanField(default=True)
+
+    def __str__(self):
+        return f"{self.user.username} - {self.name}"
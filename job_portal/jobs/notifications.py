@@ -0,0 +1,118 @@
+import base64
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.db import transaction
+from django.db.models import Case, F, Q, Value, When
+from django.utils import timezone
+
+from .candidates import InvalidCursor
+from .models import Notification, NotificationCounter
+
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+
+def encode_cursor(created_at, notification_id):
+    micros = (created_at - EPOCH) // timedelta(microseconds=1)
+    return base64.urlsafe_b64encode(f"{micros}.{notification_id}".encode()).decode()
+
+
+def decode_cursor(cursor):
+    """(created_at, id) of the last notification of the previous page"""
+    try:
+        micros, notification_id = base64.urlsafe_b64decode(cursor.encode()).split(b".")
+        return EPOCH + timedelta(microseconds=int(micros)), int(notification_id)
+    except (ValueError, OverflowError):
+        raise InvalidCursor("Invalid cursor.")
+
+
+def add_unread(unread):
+    """Add ``{user_id: count}`` to the users' unread counters"""
+    NotificationCounter.objects.bulk_create(
+        [NotificationCounter(user_id=user_id) for user_id in unread],
+        ignore_conflicts=True,
+        batch_size=1000,
+    )
+    # One UPDATE per distinct count, usually just 1
+    by_count = defaultdict(list)
+    for user_id, count in unread.items():
+        by_count[count].append(user_id)
+    for count, user_ids in by_count.items():
+        NotificationCounter.objects.filter(user_id__in=user_ids).update(
+            unread=F("unread") + count
+        )
+
+
+def create_notifications(notifications):
+    """
+    Insert unsaved Notification instances with one bulk_create and add the
+    unread ones to their users' counters in the same transaction.
+    """
+    notifications = list(notifications)
+    with transaction.atomic():
+        Notification.objects.bulk_create(notifications, batch_size=1000)
+        add_unread(Counter(n.user_id for n in notifications if not n.is_read))
+    return notifications
+
+
+def mark_read(user, notification_ids=None):
+    """
+    Mark the user's unread notifications read, only those of
+    ``notification_ids`` if given, and take them off the unread counter.
+    Returns how many were unread.
+    """
+    queryset = Notification.objects.filter(user=user, is_read=False)
+    if notification_ids is not None:
+        queryset = queryset.filter(pk__in=notification_ids)
+    with transaction.atomic():
+        # The UPDATE only counts rows it flipped, so concurrent calls
+        # never take the same notification off twice
+        read = queryset.update(is_read=True, updated_at=timezone.now())
+        if read:
+            NotificationCounter.objects.filter(user=user).update(
+                unread=Case(
+                    When(unread__gte=read, then=F("unread") - read),
+                    default=Value(0),
+                )
+            )
+    return read
+
+
+def unread_count(user):
+    """The user's unread counter, a primary key lookup"""
+    return (
+        NotificationCounter.objects.filter(user=user)
+        .values_list("unread", flat=True)
+        .first()
+        or 0
+    )
+
+
+def list_notifications(user, cursor=None, limit=20, unread_only=False):
+    """
+    The user's notifications newest first, and the cursor of the next page
+    (None on the last page).
+
+    Each read state is a keyset scan of the (user, is_read, created_at)
+    index continuing after the cursor's (created_at, id) instead of
+    counting past an OFFSET; listing both states merges the two scans.
+    """
+    keyset = Q()
+    if cursor is not None:
+        created_at, notification_id = decode_cursor(cursor)
+        keyset = Q(created_at__lt=created_at) | Q(
+            created_at=created_at, id__lt=notification_id
+        )
+    page = []
+    for is_read in (False,) if unread_only else (False, True):
+        page.extend(
+            Notification.objects.filter(keyset, user=user, is_read=is_read).order_by(
+                "-created_at", "-id"
+            )[: limit + 1]
+        )
+    page.sort(key=lambda n: (n.created_at, n.id), reverse=True)
+    next_cursor = None
+    if len(page) > limit:
+        page = page[:limit]
+        next_cursor = encode_cursor(page[-1].created_at, page[-1].id)
+    return page, next_cursor
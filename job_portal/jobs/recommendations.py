@@ -0,0 +1,495 @@
+import atexit
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from collections import defaultdict, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import chain
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from users.hashing import _init_worker
+from users.models import ApplicantProfile
+from users.versioned_cache import VersionedCache
+from .models import JobApplication, JobRecommendation, Jobs
+
+logger = logging.getLogger(__name__)
+
+VERSION_CACHE_KEY = "jobs:recommendations:version"
+DAY = 24 * 60 * 60
+
+Recommendation = namedtuple("Recommendation", "job_id score key matched required")
+
+
+def score_key(matched, required, posted, half_life_days):
+    """
+    log2 of the score at the Unix epoch: ``log2(coverage) + posted / half_life``.
+    Orders jobs like the current score at any time, see JobRecommendation.
+    """
+    return np.log2(matched / required) + posted / (DAY * half_life_days)
+
+
+def score_at(key, now, half_life_days):
+    """Current score of a stored score key"""
+    return float(np.exp2(key - now / (DAY * half_life_days)))
+
+
+class JobMatrix:
+    """
+    Active jobs and their required skills as immutable sparse arrays.
+
+    Jobs are rows ordered by id. The required skills are kept as an
+    inverted index in CSC form: the rows of the jobs requiring skill ``s``
+    are ``job_rows[skill_indptr[s]:skill_indptr[s + 1]]``. Ranking for one
+    applicant then touches only the postings of the applicant's skills.
+    """
+
+    def __init__(self, job_ids, posted, pairs, version=None):
+        self.version = version
+        self.built_at = time.monotonic()
+        self.job_ids = np.asarray(job_ids, dtype=np.int64)
+        self.posted = np.asarray(posted, dtype=np.float64)
+        pairs = np.asarray(pairs, dtype=np.int64).reshape(-1, 2)
+
+        rows = np.searchsorted(self.job_ids, pairs[:, 0])
+        if len(self.job_ids):
+            # Jobs deactivated between the two queries are dropped
+            known = self.job_ids[np.minimum(rows, len(self.job_ids) - 1)] == pairs[:, 0]
+            rows, skills = rows[known], pairs[known, 1]
+        else:
+            rows, skills = rows[:0], pairs[:0, 1]
+
+        self.required = np.bincount(rows, minlength=len(self.job_ids))
+        order = np.argsort(skills, kind="stable")
+        self.job_rows = rows[order].astype(np.int32)
+        counts = np.bincount(skills, minlength=1)
+        self.skill_indptr = np.zeros(len(counts) + 1, dtype=np.int64)
+        np.cumsum(counts, out=self.skill_indptr[1:])
+
+    @classmethod
+    def from_database(cls, version=None):
+        jobs = Jobs.objects.filter(is_active=True).order_by("id")
+        rows = np.fromiter(
+            chain.from_iterable(
+                (job_id, posted.timestamp())
+                for job_id, posted in jobs.values_list("id", "posted_date").iterator(
+                    chunk_size=10000
+                )
+            ),
+            dtype=np.float64,
+        ).reshape(-1, 2)
+        pairs = np.fromiter(
+            chain.from_iterable(
+                Jobs.required_skills.through.objects.filter(jobs__is_active=True)
+                .values_list("jobs_id", "skill_id")
+                .iterator(chunk_size=10000)
+            ),
+            dtype=np.int64,
+        )
+        return cls(rows[:, 0].astype(np.int64), rows[:, 1], pairs, version=version)
+
+    def __len__(self):
+        return len(self.job_ids)
+
+    def rank(self, skill_ids, limit, exclude_job_ids=(), now=None, half_life_days=30):
+        """
+        The ``limit`` best jobs for an applicant with ``skill_ids``.
+
+        A job scores the share of its required skills the applicant has,
+        halved every ``half_life_days`` since it was posted; jobs sharing no
+        skill are left out. Overlap counts come from one ``bincount`` over
+        the postings of the applicant's skills, and only the top ``limit``
+        scores are sorted.
+        """
+        skill_ids = np.unique(np.asarray(list(skill_ids), dtype=np.int64))
+        skill_ids = skill_ids[
+            (skill_ids >= 0) & (skill_ids < len(self.skill_indptr) - 1)
+        ]
+        if not len(skill_ids) or not len(self.job_ids) or limit <= 0:
+            return []
+
+        postings = np.concatenate(
+            [
+                self.job_rows[start:end]
+                for start, end in zip(
+                    self.skill_indptr[skill_ids], self.skill_indptr[skill_ids + 1]
+                )
+            ]
+        )
+        overlap = np.bincount(postings, minlength=len(self.job_ids))
+        if exclude_job_ids:
+            excluded = np.asarray(list(exclude_job_ids), dtype=np.int64)
+            rows = np.searchsorted(self.job_ids, excluded)
+            found = rows < len(self.job_ids)
+            rows, excluded = rows[found], excluded[found]
+            overlap[rows[self.job_ids[rows] == excluded]] = 0
+        candidates = np.flatnonzero(overlap)
+        if not len(candidates):
+            return []
+
+        now = time.time() if now is None else now
+        matched = overlap[candidates]
+        required = self.required[candidates]
+        age_days = np.maximum(now - self.posted[candidates], 0) / DAY
+        scores = matched / required * np.exp2(-age_days / half_life_days)
+        keys = score_key(matched, required, self.posted[candidates], half_life_days)
+
+        if len(candidates) > limit:
+            top = np.argpartition(-scores, limit - 1)[:limit]
+        else:
+            top = np.arange(len(candidates))
+        # Best score first, newer jobs first on ties
+        top = top[np.lexsort((-self.posted[candidates[top]], -scores[top]))]
+        return [
+            Recommendation(
+                int(self.job_ids[candidates[i]]),
+                float(scores[i]),
+                float(keys[i]),
+                int(matched[i]),
+                int(required[i]),
+            )
+            for i in top
+        ]
+
+
+class JobRecommender(VersionedCache):
+    """
+    Ranks active jobs for applicants by skill overlap against an in-process
+    JobMatrix.
+
+    Job writes bump a version in the shared cache; other processes rebuild
+    their matrix on the next request once it is ``refresh_interval`` seconds
+    old, so a busy job board does not rebuild on every posting. The writing
+    process drops its own copy right away.
+    """
+
+    cache_key = VERSION_CACHE_KEY
+
+    def __init__(self, refresh_interval=60, half_life_days=30, top_k=50):
+        self.refresh_interval = refresh_interval
+        self.half_life_days = half_life_days
+        self.top_k = top_k
+        super().__init__()
+
+    @classmethod
+    def from_settings(cls):
+        config = getattr(settings, "JOB_RECOMMENDATIONS", {})
+        return cls(
+            refresh_interval=config.get("REFRESH_INTERVAL", 60),
+            half_life_days=config.get("HALF_LIFE_DAYS", 30),
+            top_k=config.get("TOP_K", 50),
+        )
+
+    def is_current(self, matrix, version, fresh=False):
+        return matrix is not None and (
+            matrix.version == version
+            or not fresh
+            and time.monotonic() - matrix.built_at < self.refresh_interval
+        )
+
+    def build(self, version):
+        return JobMatrix.from_database(version=version)
+
+    def matrix(self, fresh=False):
+        """The current JobMatrix; ``fresh`` ignores the refresh interval"""
+        return self.get(partial(self.is_current, fresh=fresh))
+
+    def recommend(self, profile, limit=20):
+        """Recommendations for an ApplicantProfile, skipping jobs already applied to"""
+        skill_ids = profile.skills.values_list("id", flat=True)
+        applied = JobApplication.objects.filter(applicant=profile).values_list(
+            "job_listing_id", flat=True
+        )
+        return self.matrix().rank(
+            list(skill_ids),
+            limit,
+            exclude_job_ids=list(applied),
+            now=timezone.now().timestamp(),
+            half_life_days=self.half_life_days,
+        )
+
+
+job_recommender = JobRecommender.from_settings()
+
+
+def refresh_applicants(profile_ids, fresh=False):
+    """
+    Recompute the JobRecommendation rows of the given applicants from the
+    JobMatrix, with a handful of queries for the whole batch.
+
+    Unless ``fresh``, the matrix may be up to ``refresh_interval`` seconds
+    old: every job write bumps its version, so rebuilding it for each
+    applicant change would keep the pool busy rebuilding. Jobs deactivated
+    since are dropped below; ``rebuild_job_recommendations`` recomputes
+    every table should anything else be left stale.
+    """
+    profile_ids = list(profile_ids)
+    if not profile_ids:
+        return 0
+    matrix = job_recommender.matrix(fresh=fresh)
+    skills = defaultdict(list)
+    for profile_id, skill_id in ApplicantProfile.skills.through.objects.filter(
+        applicantprofile_id__in=profile_ids
+    ).values_list("applicantprofile_id", "skill_id"):
+        skills[profile_id].append(skill_id)
+    applied = defaultdict(list)
+    for profile_id, job_id in JobApplication.objects.filter(
+        applicant_id__in=profile_ids
+    ).values_list("applicant_id", "job_listing_id"):
+        applied[profile_id].append(job_id)
+
+    ranked = {
+        profile_id: matrix.rank(
+            skills[profile_id],
+            job_recommender.top_k,
+            exclude_job_ids=applied[profile_id],
+            half_life_days=job_recommender.half_life_days,
+        )
+        for profile_id in profile_ids
+    }
+    # Jobs deactivated or deleted since the matrix was built
+    active = set(
+        Jobs.objects.filter(
+            pk__in={
+                r.job_id for recommendations in ranked.values() for r in recommendations
+            },
+            is_active=True,
+        ).values_list("pk", flat=True)
+    )
+    rows = [
+        JobRecommendation(
+            applicant_id=profile_id,
+            job_id=recommendation.job_id,
+            score=recommendation.key,
+            matched_skills=recommendation.matched,
+        )
+        for profile_id, recommendations in ranked.items()
+        for recommendation in recommendations
+        if recommendation.job_id in active
+    ]
+    with transaction.atomic():
+        JobRecommendation.objects.filter(applicant_id__in=profile_ids).delete()
+        JobRecommendation.objects.bulk_create(rows, batch_size=1000)
+    return len(profile_ids)
+
+
+def refresh_job(job_id, chunk_size=1000):
+    """
+    Merge one posted, changed, deactivated or deleted job into the tables
+    of the applicants it affects: those sharing a skill with it and those
+    whose table holds it.
+
+    The job's score for every such applicant comes from one grouped query.
+    It is inserted where it beats the applicant's worst row (which is then
+    dropped) and updated in place where it improved. Applicants for whom
+    it got worse or stopped matching are recomputed in full, since another
+    job may now belong in their top K.
+    """
+    top_k = job_recommender.top_k
+    half_life_days = job_recommender.half_life_days
+    posted = (
+        Jobs.objects.filter(pk=job_id, is_active=True)
+        .values_list("posted_date", flat=True)
+        .first()
+    )
+    skill_ids = (
+        list(
+            Jobs.required_skills.through.objects.filter(jobs_id=job_id).values_list(
+                "skill_id", flat=True
+            )
+        )
+        if posted is not None
+        else []
+    )
+
+    matched = {}
+    if skill_ids:
+        matched = dict(
+            ApplicantProfile.skills.through.objects.filter(skill_id__in=skill_ids)
+            .values("applicantprofile_id")
+            .annotate(matched=Count("skill_id"))
+            .values_list("applicantprofile_id", "matched")
+        )
+        for profile_id in JobApplication.objects.filter(
+            job_listing_id=job_id
+        ).values_list("applicant_id", flat=True):
+            matched.pop(profile_id, None)
+    affected = set(matched)
+    affected.update(
+        JobRecommendation.objects.filter(job_id=job_id).values_list(
+            "applicant_id", flat=True
+        )
+    )
+
+    affected = sorted(affected)
+    recompute = []
+    for start in range(0, len(affected), chunk_size):
+        chunk = affected[start : start + chunk_size]
+        current = defaultdict(dict)
+        for pk, profile_id, row_job_id, score in JobRecommendation.objects.filter(
+            applicant_id__in=chunk
+        ).values_list("pk", "applicant_id", "job_id", "score"):
+            current[profile_id][row_job_id] = (pk, score)
+
+        creates, updates, deletes = [], [], []
+        for profile_id in chunk:
+            rows = current[profile_id]
+            key = None
+            if profile_id in matched:
+                key = float(
+                    score_key(
+                        matched[profile_id],
+                        len(skill_ids),
+                        posted.timestamp(),
+                        half_life_days,
+                    )
+                )
+            row = rows.get(job_id)
+            if row is not None:
+                if key is None or key < row[1]:
+                    recompute.append(profile_id)
+                else:
+                    updates.append(
+                        JobRecommendation(
+                            pk=row[0],
+                            score=key,
+                            matched_skills=matched[profile_id],
+                        )
+                    )
+            elif key is not None:
+                if len(rows) >= top_k:
+                    worst_pk, worst_score = min(rows.values(), key=lambda r: r[1])
+                    if key <= worst_score:
+                        continue
+                    deletes.append(worst_pk)
+                creates.append(
+                    JobRecommendation(
+                        applicant_id=profile_id,
+                        job_id=job_id,
+                        score=key,
+                        matched_skills=matched[profile_id],
+                    )
+                )
+        with transaction.atomic():
+            JobRecommendation.objects.filter(pk__in=deletes).delete()
+            JobRecommendation.objects.bulk_create(creates, ignore_conflicts=True)
+            JobRecommendation.objects.bulk_update(updates, ["score", "matched_skills"])
+
+    # A stale matrix would rank these applicants against the job's old
+    # score; one rebuild serves every job of the batch at the same version
+    for start in range(0, len(recompute), chunk_size):
+        refresh_applicants(recompute[start : start + chunk_size], fresh=True)
+    return len(affected)
+
+
+def run_refresh(job_ids=(), profile_ids=()):
+    """
+    Pool entry point; a failure is logged and left for
+    ``rebuild_job_recommendations`` to repair.
+    """
+    try:
+        for job_id in job_ids:
+            refresh_job(job_id)
+        refresh_applicants(profile_ids)
+    except Exception:
+        logger.exception(
+            "Recommendation refresh failed for jobs %s, applicants %s.",
+            job_ids,
+            profile_ids,
+        )
+
+
+class RecommendationRefresher:
+    """
+    Applies job and applicant changes to the JobRecommendation table in a
+    process pool, after the change is committed. ``max_workers=0`` refreshes
+    inline, which is what the tests use.
+
+    One batch runs at a time. Changes arriving meanwhile are merged into
+    the next batch, so a burst of writes neither grows the executor's queue
+    nor refreshes the same job or applicant twice.
+
+    Concurrent refreshes of the same applicant can leave a row too many or
+    too few; ``rebuild_job_recommendations`` recomputes every table.
+    """
+
+    def __init__(self, max_workers=1):
+        self.max_workers = max_workers
+        self._executor = None
+        self._lock = threading.Lock()
+        self._job_ids = set()
+        self._profile_ids = set()
+        self._running = False
+
+    @classmethod
+    def from_settings(cls):
+        config = getattr(settings, "JOB_RECOMMENDATIONS", {})
+        return cls(max_workers=config.get("WORKERS", 1))
+
+    def get_executor(self):
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.max_workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                        initializer=_init_worker,
+                        initargs=(os.environ.get("DJANGO_SETTINGS_MODULE", ""),),
+                    )
+        return self._executor
+
+    def submit(self, job_ids=(), profile_ids=()):
+        if self.max_workers <= 0:
+            run_refresh(sorted(job_ids), sorted(profile_ids))
+            return
+        with self._lock:
+            self._job_ids.update(job_ids)
+            self._profile_ids.update(profile_ids)
+            if self._running:
+                return
+            self._running = True
+        self.dispatch()
+
+    def dispatch(self, finished=None):
+        """Submit the changes collected so far; called again when they are done"""
+        with self._lock:
+            job_ids, profile_ids = sorted(self._job_ids), sorted(self._profile_ids)
+            self._job_ids.clear()
+            self._profile_ids.clear()
+            if not job_ids and not profile_ids:
+                self._running = False
+                return
+        try:
+            future = self.get_executor().submit(run_refresh, job_ids, profile_ids)
+        except Exception:
+            logger.exception(
+                "Could not submit the refresh of jobs %s, applicants %s.",
+                job_ids,
+                profile_ids,
+            )
+            with self._lock:
+                self._running = False
+            return
+        future.add_done_callback(self.dispatch)
+
+    def schedule(self, job_ids=(), profile_ids=()):
+        """Refresh once the current transaction commits"""
+        transaction.on_commit(
+            lambda: self.submit(job_ids=job_ids, profile_ids=profile_ids), robust=True
+        )
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+recommendation_refresher = RecommendationRefresher.from_settings()
+atexit.register(recommendation_refresher.shutdown)
@@ -0,0 +1,123 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from users.models import ApplicantProfile, Location
+from .alerts import job_alert_sender, saved_search_percolator
+from .models import JobApplication, JobRecommendation, Jobs, SavedSearch
+from .recommendations import job_recommender, recommendation_refresher
+from .similarity import similar_jobs
+
+# Fields the recommendation matrix is built from
+RECOMMENDATION_FIELDS = {"is_active", "posted_date"}
+
+
+def changed_ids(instance, action, reverse, pk_set, reverse_manager):
+    """Ids on the side an m2m change is tracked by, None for unrelated actions"""
+    if not reverse:
+        return [instance.pk] if action.startswith("post_") else None
+    if action == "pre_clear":
+        return list(getattr(instance, reverse_manager).values_list("pk", flat=True))
+    if action in ("post_add", "post_remove"):
+        return list(pk_set)
+    return None
+
+
+@receiver(post_save, sender=Jobs)
+def refresh_recommendations_on_save(sender, instance, created, update_fields, **kwargs):
+    if created or update_fields is None or RECOMMENDATION_FIELDS & set(update_fields):
+        job_recommender.invalidate()
+        recommendation_refresher.schedule(job_ids=[instance.pk])
+
+
+@receiver(pre_delete, sender=Jobs)
+def refresh_recommendations_on_delete(sender, instance, **kwargs):
+    # The job's rows go with it; its applicants get their tables refilled
+    recommendation_refresher.schedule(
+        profile_ids=list(
+            JobRecommendation.objects.filter(job=instance).values_list(
+                "applicant_id", flat=True
+            )
+        )
+    )
+
+
+@receiver(post_delete, sender=Jobs)
+def invalidate_recommendations_on_delete(sender, instance, **kwargs):
+    job_recommender.invalidate()
+
+
+@receiver(m2m_changed, sender=Jobs.required_skills.through)
+def refresh_recommendations_on_skills_change(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    job_ids = changed_ids(instance, action, reverse, pk_set, "job_listings")
+    if job_ids:
+        job_recommender.invalidate()
+        recommendation_refresher.schedule(job_ids=job_ids)
+
+
+@receiver(m2m_changed, sender=ApplicantProfile.skills.through)
+def refresh_recommendations_on_applicant_skills_change(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    profile_ids = changed_ids(instance, action, reverse, pk_set, "applicants")
+    if profile_ids:
+        recommendation_refresher.schedule(profile_ids=profile_ids)
+
+
+@receiver(post_save, sender=JobApplication)
+def refresh_recommendations_on_apply(sender, instance, created, **kwargs):
+    if created:
+        recommendation_refresher.schedule(profile_ids=[instance.applicant_id])
+
+
+@receiver(post_delete, sender=JobApplication)
+def refresh_recommendations_on_withdraw(sender, instance, **kwargs):
+    recommendation_refresher.schedule(profile_ids=[instance.applicant_id])
+
+
+@receiver(post_save, sender=Jobs)
+def send_job_alerts(sender, instance, created, **kwargs):
+    """Percolate new jobs in the alert pool once committed with their skills"""
+    if created and instance.is_active:
+        job_alert_sender.schedule(instance.pk)
+
+
+@receiver(post_save, sender=SavedSearch)
+@receiver(post_delete, sender=SavedSearch)
+def refresh_percolator(sender, **kwargs):
+    saved_search_percolator.invalidate()
+
+
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def refresh_percolator_on_location_change(sender, **kwargs):
+    # Saved searches are bucketed by their geocoded location
+    saved_search_percolator.invalidate()
+
+
+@receiver(m2m_changed, sender=SavedSearch.skills.through)
+def refresh_percolator_on_skills_change(sender, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        saved_search_percolator.invalidate()
+
+
+@receiver(post_save, sender=Jobs)
+def refresh_similar_jobs_on_save(sender, instance, created, update_fields, **kwargs):
+    # New jobs are indexed once their required skills are set
+    if not created and (update_fields is None or "is_active" in update_fields):
+        similar_jobs.schedule([instance.pk])
+
+
+@receiver(post_delete, sender=Jobs)
+def refresh_similar_jobs_on_delete(sender, instance, **kwargs):
+    similar_jobs.schedule([instance.pk])
+
+
+@receiver(m2m_changed, sender=Jobs.required_skills.through)
+def refresh_similar_jobs_on_skills_change(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    job_ids = changed_ids(instance, action, reverse, pk_set, "job_listings")
+    if job_ids:
+        similar_jobs.schedule(job_ids)
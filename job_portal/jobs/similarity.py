@@ -0,0 +1,275 @@
+import hashlib
+from collections import defaultdict
+from functools import partial
+
+import numpy as np
+from django.db import transaction
+
+from users.versioned_cache import VersionedCache
+
+from .models import Jobs
+
+VERSION_CACHE_KEY = "jobs:similarity:version"
+
+# 20 bands of 3 rows: a pair of jobs with Jaccard similarity s shares a
+# band with probability 1 - (1 - s**3)**20, 0.93 at s = 0.5 and 0.16 at
+# s = 0.2. Stored signatures depend on these and on the hash functions, so
+# changing them needs ``rebuild_job_signatures``.
+BANDS = 20
+ROWS = 3
+NUM_PERM = BANDS * ROWS
+PRIME = (1 << 31) - 1
+
+
+def hash_parameters():
+    """Coefficients of h(x) = (a * x + b) mod PRIME, fixed across processes"""
+
+    def coefficient(name, i):
+        digest = hashlib.blake2b(f"{name}{i}".encode()).digest()
+        return int.from_bytes(digest[:8], "big")
+
+    a = np.array(
+        [coefficient("a", i) % (PRIME - 1) + 1 for i in range(NUM_PERM)],
+        dtype=np.int64,
+    )
+    b = np.array([coefficient("b", i) % PRIME for i in range(NUM_PERM)], dtype=np.int64)
+    return a[:, None], b[:, None]
+
+
+A, B = hash_parameters()
+
+
+def minhash(skill_ids):
+    """MinHash signature of a set of skill ids, None for an empty set"""
+    ids = np.unique(np.asarray(list(skill_ids), dtype=np.int64) % PRIME)
+    if not len(ids):
+        return None
+    # a, x < 2**31, so a * x + b stays below 2**63
+    return ((A * ids + B) % PRIME).min(axis=1).astype("<u4")
+
+
+def signature_bytes(signature):
+    return None if signature is None else signature.tobytes()
+
+
+def signature_from_bytes(value):
+    return np.frombuffer(value, dtype="<u4")
+
+
+BAND_SEEDS = np.arange(1, BANDS + 1, dtype=np.uint64) * np.uint64(0x9E3779B97F4A7C15)
+FNV_PRIME = np.uint64(0x100000001B3)
+
+
+def band_keys(signatures):
+    """
+    One 64 bit key per band of each signature, shape (signatures, BANDS).
+    Keys of different bands differ, so all of them share one sorted array.
+    """
+    values = np.asarray(signatures).reshape(-1, BANDS, ROWS).astype(np.uint64)
+    keys = np.broadcast_to(BAND_SEEDS, values.shape[:2]).copy()
+    for row in range(ROWS):
+        keys ^= values[:, :, row]
+        keys *= FNV_PRIME
+    return keys
+
+
+class SimilarJobIndex:
+    """
+    Locality sensitive hashing over job MinHash signatures.
+
+    Every signature is cut into BANDS bands, each hashed to a key; jobs
+    sharing a key are candidates, ranked by the share of equal signature
+    values, which estimates their Jaccard similarity. A lookup reads BANDS
+    key ranges instead of comparing against every job.
+
+    Signatures are rows of one array and the (key, row) pairs are sorted
+    arrays: about 560 bytes per job, 240 for its 60 uint32 signature values
+    and 16 for each of its 20 (key, row) pairs. Jobs added afterwards go to
+    a small key -> rows overlay and removed ones are masked out; both are
+    folded into the sorted arrays once they grow past a quarter of the
+    index.
+    """
+
+    def __init__(self, signatures=(), version=None):
+        self.version = version
+        job_ids, matrix = [], []
+        for job_id, signature in signatures:
+            job_ids.append(job_id)
+            matrix.append(signature)
+        self.job_ids = np.array(job_ids, dtype=np.int64)
+        self.matrix = (
+            np.stack(matrix).astype(np.uint32)
+            if matrix
+            else np.empty((0, NUM_PERM), dtype=np.uint32)
+        )
+        self.alive = np.ones(len(job_ids), dtype=bool)
+        self.used = len(job_ids)
+        self.rows = dict(zip(job_ids, range(len(job_ids))))
+        self.build()
+
+    def __len__(self):
+        return len(self.rows)
+
+    def build(self):
+        """Sort the band keys of every live row, emptying the overlay"""
+        live = np.flatnonzero(self.alive[: self.used])
+        keys = band_keys(self.matrix[live])
+        order = np.argsort(keys, axis=None, kind="stable")
+        self.keys = keys.ravel()[order]
+        self.key_rows = np.repeat(live, BANDS)[order]
+        self.added = defaultdict(list)
+        self.changes = 0
+
+    def compact(self):
+        """Drop removed rows and rebuild the sorted keys"""
+        live = np.flatnonzero(self.alive[: self.used])
+        self.job_ids = self.job_ids[live]
+        self.matrix = self.matrix[live]
+        self.alive = np.ones(len(live), dtype=bool)
+        self.used = len(live)
+        self.rows = dict(zip(self.job_ids.tolist(), range(len(live))))
+        self.build()
+
+    def changed(self):
+        self.changes += 1
+        if self.changes > max(1024, len(self.rows) // 4):
+            self.compact()
+
+    def add(self, job_id, signature):
+        self.remove(job_id)
+        if self.used == len(self.matrix):
+            capacity = max(16, 2 * len(self.matrix))
+            self.job_ids = np.resize(self.job_ids, capacity)
+            self.matrix = np.resize(self.matrix, (capacity, NUM_PERM))
+            self.alive = np.resize(self.alive, capacity)
+            self.alive[self.used :] = False
+        row = self.used
+        self.used += 1
+        self.job_ids[row] = job_id
+        self.matrix[row] = signature
+        self.alive[row] = True
+        self.rows[job_id] = row
+        for key in band_keys(signature)[0].tolist():
+            self.added[key].append(row)
+        self.changed()
+
+    def remove(self, job_id):
+        row = self.rows.pop(job_id, None)
+        if row is not None:
+            self.alive[row] = False
+            self.changed()
+
+    def query(self, signature, limit=None, exclude=None):
+        """(job_id, estimated similarity) pairs, most similar first"""
+        keys = band_keys(signature)[0]
+        starts = np.searchsorted(self.keys, keys, side="left")
+        ends = np.searchsorted(self.keys, keys, side="right")
+        parts = [self.key_rows[start:end] for start, end in zip(starts, ends)]
+        parts.extend(
+            np.array(self.added[key], dtype=np.int64)
+            for key in keys.tolist()
+            if key in self.added
+        )
+        rows = np.unique(np.concatenate(parts))
+        rows = rows[self.alive[rows]]
+        if exclude is not None:
+            rows = rows[self.job_ids[rows] != exclude]
+        if not len(rows):
+            return []
+
+        similarity = (self.matrix[rows] == signature).mean(axis=1)
+        job_ids = self.job_ids[rows]
+        if limit is not None and len(rows) > limit:
+            # Keep ties with the limit-th best so the order below decides
+            cutoff = np.partition(similarity, len(rows) - limit)[len(rows) - limit]
+            keep = similarity >= cutoff
+            similarity, job_ids = similarity[keep], job_ids[keep]
+        # Most similar first, newer (higher) ids first on ties
+        order = np.lexsort((-job_ids, -similarity))[:limit]
+        return list(zip(job_ids[order].tolist(), similarity[order].tolist()))
+
+    def similar(self, job_id, limit=None):
+        row = self.rows.get(job_id)
+        if row is None:
+            return []
+        return self.query(self.matrix[row].copy(), limit, exclude=job_id)
+
+
+class SimilarJobs(VersionedCache):
+    """
+    In-process SimilarJobIndex over the active jobs.
+
+    Job and required skill changes are applied to the index of the writing
+    process in place once committed, and bump a version in the shared cache
+    so other processes rebuild theirs on their next lookup.
+    """
+
+    cache_key = VERSION_CACHE_KEY
+
+    def build(self, version):
+        return SimilarJobIndex(self.load_signatures(), version=version)
+
+    def index(self):
+        return self.get()
+
+    def load_signatures(self):
+        for job_id, signature in (
+            Jobs.objects.filter(is_active=True, skill_signature__isnull=False)
+            .values_list("id", "skill_signature")
+            .iterator(chunk_size=10000)
+        ):
+            yield job_id, signature_from_bytes(signature)
+
+    def similar(self, job_id, limit=10):
+        index = self.index()
+        with self._lock:
+            return index.similar(job_id, limit)
+
+    def refresh(self, job_ids):
+        """Recompute the signatures of ``job_ids`` and apply them to the index"""
+        job_ids = sorted(job_ids)
+        signatures = update_signatures(job_ids)
+        active = set(
+            Jobs.objects.filter(pk__in=job_ids, is_active=True).values_list(
+                "pk", flat=True
+            )
+        )
+        with self._lock:
+            index = self._value
+            version = self.bump_version()
+            # Keep the patched index unless another process changed jobs too
+            if index is None or (index.version or 0) + 1 != version:
+                self._value = None
+                return
+            for job_id in job_ids:
+                if job_id in active and signatures.get(job_id) is not None:
+                    index.add(job_id, signatures[job_id])
+                else:
+                    index.remove(job_id)
+            index.version = version
+
+    def schedule(self, job_ids):
+        """Refresh once the current transaction commits"""
+        transaction.on_commit(partial(self.refresh, list(job_ids)))
+
+
+similar_jobs = SimilarJobs()
+
+
+def update_signatures(job_ids):
+    """Store the MinHash signatures of the given jobs; returns them by job id"""
+    skills = defaultdict(list)
+    for job_id, skill_id in Jobs.required_skills.through.objects.filter(
+        jobs_id__in=job_ids
+    ).values_list("jobs_id", "skill_id"):
+        skills[job_id].append(skill_id)
+    signatures = {job_id: minhash(skills[job_id]) for job_id in job_ids}
+    Jobs.objects.bulk_update(
+        [
+            Jobs(pk=job_id, skill_signature=signature_bytes(signatures[job_id]))
+            for job_id in job_ids
+        ],
+        ["skill_signature"],
+        batch_size=1000,
+    )
+    return signatures
@@ -17,6 +17,10 @@ done
 echo "Applying migrations..."
 python manage.py migrate
 
+# Step 1b: Load the offline gazetteer used to geocode locations
+echo "Loading gazetteer..."
+python manage.py load_gazetteer
+
 # Step 2: Create superuser
 echo "Creating superuser..."
 python manage.py shell <<EOF
@@ -1,5 +1,12 @@
 from django.contrib import admin
-from .models import User, ApplicantProfile, Skill, EmployerProfile
+from .models import (
+    User,
+    ApplicantProfile,
+    Skill,
+    SkillAlias,
+    EmployerProfile,
+    Location,
+)
 
 # Register your models here.
 
@@ -15,7 +22,8 @@ class UserAdmin(admin.ModelAdmin):
         "is_applicant",
         "is_employer",
     ]
-    search_fields = ["username", "email", "id"]
+    # Prefix match on the unique index instead of scanning every email
+    search_fields = ["username", "^email_normalized", "id"]
     list_filter = ["last_login", "date_joined"]
 
 
@@ -51,3 +59,28 @@ class SkillAdmin(admin.ModelAdmin):
         "id",
         "name",
     ]
+
+
+@admin.register(SkillAlias)
+class SkillAliasAdmin(admin.ModelAdmin):
+    list_display = [
+        "id",
+        "name",
+        "skill",
+    ]
+    search_fields = ["^normalized_name"]
+
+
+@admin.register(Location)
+class LocationAdmin(admin.ModelAdmin):
+    list_display = [
+        "id",
+        "name",
+        "region_code",
+        "country_code",
+        "latitude",
+        "longitude",
+        "population",
+    ]
+    list_filter = ["country_code"]
+    search_fields = ["name", "alternate_names"]
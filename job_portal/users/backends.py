@@ -0,0 +1,67 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.hashers import get_hasher, identify_hasher
+from django.db.models import Q
+
+from .fields import normalize_email
+from .hashing import hashing_service
+
+UserModel = get_user_model()
+
+
+class PooledPasswordBackend(ModelBackend):
+    """
+    ModelBackend that verifies passwords through the hashing pool instead of
+    on the request thread. Raises ``HashingPoolSaturated`` when the pool
+    is full so callers can shed the request.
+
+    The username may also be the user's email address in any case, looked
+    up through the unique ``email_normalized`` index. A username match wins
+    over another user's email.
+    """
+
+    def get_user_by_login(self, login):
+        if "@" not in login:
+            return UserModel._default_manager.get_by_natural_key(login)
+        username_field = UserModel.USERNAME_FIELD
+        users = list(
+            UserModel._default_manager.filter(
+                Q(**{username_field: login})
+                | Q(email_normalized=normalize_email(login))
+            )[:2]
+        )
+        for user in users:
+            if getattr(user, username_field) == login:
+                return user
+        if not users:
+            raise UserModel.DoesNotExist
+        return users[0]
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+        try:
+            user = self.get_user_by_login(username)
+        except UserModel.DoesNotExist:
+            # Run the hasher once to reduce the timing difference between an
+            # existing and a nonexistent user (#20760).
+            hashing_service.make_password(password)
+            return None
+
+        if hashing_service.check_password(
+            password, user.password
+        ) and self.user_can_authenticate(user):
+            self._upgrade_password(user, password)
+            return user
+        return None
+
+    def _upgrade_password(self, user, password):
+        """Re-hash passwords stored with outdated hasher settings."""
+        hasher = identify_hasher(user.password)
+        if hasher.algorithm != get_hasher().algorithm or hasher.must_update(
+            user.password
+        ):
+            user.password = hashing_service.make_password(password)
+            user.save(update_fields=["password"])
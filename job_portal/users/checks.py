@@ -0,0 +1,24 @@
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+
+# Backends whose incr is atomic across processes and hosts
+SHARED_CACHE_BACKENDS = (
+    "django.core.cache.backends.redis.RedisCache",
+    "django.core.cache.backends.memcached.PyMemcacheCache",
+    "django.core.cache.backends.memcached.PyLibMCCache",
+)
+
+
+@register(Tags.caches, deploy=True)
+def check_shared_cache(app_configs, **kwargs):
+    """Throttle counters and index versions need an atomic shared cache"""
+    if settings.CACHES["default"]["BACKEND"] in SHARED_CACHE_BACKENDS:
+        return []
+    return [
+        Warning(
+            "The default cache has no atomic incr shared by every worker, so "
+            "throttle counters lose counts and index versions may be missed.",
+            hint="Set REDIS_URL, or CACHE_BACKEND to a memcached backend.",
+            id="users.W001",
+        )
+    ]
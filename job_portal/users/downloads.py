@@ -0,0 +1,167 @@
+import os
+import re
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import content_disposition_header, http_date, parse_http_date
+
+from .storage import digest_from_name
+
+BLOCK_SIZE = 64 * 1024
+RANGE_RE = re.compile(r"^\s*bytes\s*=\s*(?P<first>[0-9]*)-(?P<last>[0-9]*)\s*$", re.I)
+
+MODE_DJANGO = "django"
+MODE_X_ACCEL = "x-accel"
+MODE_X_SENDFILE = "x-sendfile"
+
+
+class RangeFile:
+    """
+    Read-only view of ``length`` bytes of ``f`` starting at ``start``.
+
+    ``fileno`` is passed through and the file is positioned at ``start``, so
+    a WSGI server with a sendfile ``wsgi.file_wrapper`` (gunicorn) sends the
+    range straight from the page cache using the response Content-Length;
+    otherwise Django reads it in BLOCK_SIZE blocks and never past the end.
+    """
+
+    def __init__(self, f, start, length):
+        self.file = f
+        self.remaining = length
+        f.seek(start)
+
+    def read(self, size=-1):
+        if size is None or size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self):
+        return self.file.fileno()
+
+    def close(self):
+        self.file.close()
+
+
+def parse_range(value, size):
+    """
+    (start, end) of a single ``bytes=`` range, inclusive. Returns None when
+    the header is malformed or asks for several ranges, in which case the
+    whole file is served, and raises ValueError when it is unsatisfiable.
+    """
+    match = RANGE_RE.match(value or "")
+    if match is None or not (match["first"] or match["last"]):
+        return None
+    if not match["first"]:
+        # Suffix range: the last N bytes
+        suffix = int(match["last"])
+        if suffix == 0 or size == 0:
+            raise ValueError(value)
+        return max(size - suffix, 0), size - 1
+    start = int(match["first"])
+    end = int(match["last"]) if match["last"] else size - 1
+    if match["last"] and start > end:
+        return None
+    if start >= size:
+        raise ValueError(value)
+    return start, min(end, size - 1)
+
+
+def resume_etag(name, stat):
+    """The content hash for content-addressed names, weak otherwise"""
+    digest = digest_from_name(name)
+    if digest:
+        return f'"{digest}"'
+    return f'W/"{stat.st_size:x}-{int(stat.st_mtime):x}"'
+
+
+def if_range_matches(value, etag, last_modified):
+    """If-Range only matches a strong ETag or the exact Last-Modified date"""
+    if value is None:
+        return True
+    if value.startswith('"'):
+        return value == etag
+    return parse_http_date_safe(value) == int(last_modified)
+
+
+def parse_http_date_safe(value):
+    try:
+        return parse_http_date(value)
+    except ValueError:
+        return None
+
+
+def resume_response(request, resume_file):
+    """
+    Response serving ``resume_file`` without reading it into memory.
+
+    Conditional requests are answered with 304/412 before the file is
+    opened. In the default ``django`` mode a single ``Range`` is served as a
+    206 from a RangeFile and an unsatisfiable one as a 416; the
+    ``x-accel``/``x-sendfile`` modes hand the file to nginx or Apache,
+    which handle ranges themselves.
+    """
+    config = getattr(settings, "RESUME_DOWNLOAD", {})
+    mode = config.get("MODE", MODE_DJANGO)
+    name = resume_file.name
+    path = resume_file.path
+    stat = os.stat(path)
+    etag = resume_etag(name, stat)
+    filename = f"resume{os.path.splitext(name)[1].lower()}"
+
+    response = get_conditional_response(
+        request, etag=etag, last_modified=int(stat.st_mtime)
+    )
+    if response is None:
+        if mode == MODE_X_ACCEL:
+            response = HttpResponse(content_type="application/pdf")
+            response["X-Accel-Redirect"] = (
+                config.get("X_ACCEL_PREFIX", "/protected/") + name
+            )
+        elif mode == MODE_X_SENDFILE:
+            response = HttpResponse(content_type="application/pdf")
+            response["X-Sendfile"] = path
+        else:
+            response = file_response(request, path, stat, etag)
+        if response.status_code < 400:
+            response["Content-Disposition"] = content_disposition_header(
+                request.GET.get("download") is not None, filename
+            )
+
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(stat.st_mtime)
+    # The URL keeps serving the current resume, so clients revalidate; the
+    # ETag makes that a cheap 304.
+    response["Cache-Control"] = "private, no-cache"
+    return response
+
+
+def file_response(request, path, stat, etag):
+    size = stat.st_size
+    byte_range = None
+    if request.method in ("GET", "HEAD") and if_range_matches(
+        request.headers.get("If-Range"), etag, stat.st_mtime
+    ):
+        try:
+            byte_range = parse_range(request.headers.get("Range"), size)
+        except ValueError:
+            response = HttpResponse(status=416)
+            response["Content-Range"] = f"bytes */{size}"
+            return response
+
+    f = open(path, "rb")
+    if byte_range is None:
+        response = FileResponse(f, content_type="application/pdf")
+    else:
+        start, end = byte_range
+        length = end - start + 1
+        response = FileResponse(
+            RangeFile(f, start, length), status=206, content_type="application/pdf"
+        )
+        response["Content-Length"] = length
+        response["Content-Range"] = f"bytes {start}-{end}/{size}"
+    response.block_size = BLOCK_SIZE
+    response["Accept-Ranges"] = "bytes"
+    return response
@@ -0,0 +1,121 @@
+import re
+
+from django.db import models
+
+
+def canonicalize_skill_name(name):
+    """Display form of a skill name: trimmed, inner whitespace collapsed"""
+    return re.sub(r"\s+", " ", str(name)).strip()
+
+
+def normalize_skill_name(name):
+    """Lookup key of a skill name, 'Machine  Learning ' -> 'machine learning'"""
+    return canonicalize_skill_name(name).casefold()
+
+
+def normalize_email(email):
+    """Lookup key of an email address, None when blank"""
+    email = str(email or "").strip()
+    return email.casefold() or None
+
+
+class NormalizedField(models.CharField):
+    """
+    CharField holding the normalized form of another field of the same
+    model, recomputed on every save. Also applied by bulk_create(), which
+    calls pre_save() on each object.
+    """
+
+    def __init__(self, *args, source, **kwargs):
+        self.source = source
+        kwargs.setdefault("editable", False)
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        kwargs["source"] = self.source
+        kwargs.pop("editable", None)
+        return name, path, args, kwargs
+
+    def normalize(self, value):
+        raise NotImplementedError(".normalize() must be overridden")
+
+    def pre_save(self, model_instance, add):
+        value = self.normalize(getattr(model_instance, self.source))
+        setattr(model_instance, self.attname, value)
+        return value
+
+
+class NormalizedNameField(NormalizedField):
+    """Skill name lookup key, see normalize_skill_name()"""
+
+    def __init__(self, *args, source="name", **kwargs):
+        super().__init__(*args, source=source, **kwargs)
+
+    def normalize(self, value):
+        return normalize_skill_name(value)
+
+
+class NormalizedEmailField(NormalizedField):
+    """
+    Email lookup key, NULL for blank emails so they never collide.
+
+    Legacy rows whose key already belongs to another row were left NULL by
+    the ``backfill_email_normalized`` command; saving them with the same
+    email keeps it NULL instead of failing on the unique index. Changing
+    the email to one taken by another row still fails.
+    """
+
+    def __init__(self, *args, source="email", **kwargs):
+        super().__init__(*args, source=source, **kwargs)
+
+    def normalize(self, value):
+        return normalize_email(value)
+
+    def pre_save(self, model_instance, add):
+        previous = getattr(model_instance, self.attname)
+        value = super().pre_save(model_instance, add)
+        if add or previous is not None or value is None:
+            return value
+        manager = model_instance.__class__._default_manager
+        stored = (
+            manager.filter(pk=model_instance.pk)
+            .values_list(self.source, flat=True)
+            .first()
+        )
+        if (
+            self.normalize(stored) == value
+            and manager.filter(**{self.attname: value})
+            .exclude(pk=model_instance.pk)
+            .exists()
+        ):
+            setattr(model_instance, self.attname, None)
+            return None
+        return value
+
+
+class GeocodedLocationField(models.ForeignKey):
+    """
+    ForeignKey to the Location geocoded from a free text field of the same
+    model, recomputed on every save like NormalizedField. NULL when the
+    text matches no gazetteer entry.
+    """
+
+    def __init__(self, *args, source="location", **kwargs):
+        self.source = source
+        kwargs.setdefault("editable", False)
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        kwargs["source"] = self.source
+        kwargs.pop("editable", None)
+        return name, path, args, kwargs
+
+    def pre_save(self, model_instance, add):
+        from .locations import location_gazetteer
+
+        location = location_gazetteer.geocode(getattr(model_instance, self.source))
+        value = None if location is None else location.id
+        setattr(model_instance, self.attname, value)
+        return value
@@ -0,0 +1,184 @@
+import atexit
+import logging
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+import django
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, make_password
+
+logger = logging.getLogger(__name__)
+
+
+class HashingPoolSaturated(Exception):
+    """Raised when the hashing pool cannot accept or finish a job in time."""
+
+
+def _init_worker(settings_module):
+    """Make sure Django is configured in pool processes started with spawn."""
+    if not apps.ready:
+        os.environ.setdefault("DJANGO_SETTINGS_MODULE", settings_module)
+        django.setup()
+
+
+def _hash(password):
+    return make_password(password)
+
+
+def _verify(password, encoded):
+    return check_password(password, encoded)
+
+
+class PasswordHashingService:
+    """
+    Runs password hashing and verification in a bounded process pool.
+
+    Request workers hand the CPU-heavy PBKDF2 work to the pool and wait for
+    the result. At most ``max_pending`` jobs may be queued or running at any
+    time; further callers are rejected immediately with
+    ``HashingPoolSaturated`` so the view can answer 503 instead of piling up.
+    With ``max_workers=0`` jobs run inline on the calling thread, which keeps
+    the same accounting without starting any processes.
+    """
+
+    def __init__(self, max_workers=1, max_pending=64, timeout=5.0):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self._executor = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        # Futures the caller gave up on; counted as timed out, not completed
+        self._timed_out = set()
+        self._counters = {
+            "submitted": 0,
+            "completed": 0,
+            "rejected": 0,
+            "timed_out": 0,
+            "cancelled": 0,
+            "failed": 0,
+            "peak_pending": 0,
+        }
+
+    @classmethod
+    def from_settings(cls):
+        config = getattr(settings, "PASSWORD_HASHING", {})
+        return cls(
+            max_workers=config.get("WORKERS", 1),
+            max_pending=config.get("MAX_PENDING", 64),
+            timeout=config.get("TIMEOUT", 5.0),
+        )
+
+    def _get_executor(self):
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.max_workers,
+                        initializer=_init_worker,
+                        initargs=(os.environ.get("DJANGO_SETTINGS_MODULE", ""),),
+                    )
+        return self._executor
+
+    def _acquire(self):
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self._counters["rejected"] += 1
+                logger.warning(
+                    "Password hashing pool saturated (%s pending).", self._pending
+                )
+                raise HashingPoolSaturated("Password hashing pool is saturated.")
+            self._pending += 1
+            self._counters["submitted"] += 1
+            self._counters["peak_pending"] = max(
+                self._counters["peak_pending"], self._pending
+            )
+
+    def _release(self, outcome):
+        with self._lock:
+            self._pending -= 1
+            self._counters[outcome] += 1
+
+    def _finished(self, future):
+        if future.cancelled():
+            outcome = "cancelled"
+        elif future.exception() is not None:
+            outcome = "failed"
+        else:
+            outcome = "completed"
+        with self._lock:
+            self._pending -= 1
+            if future in self._timed_out:
+                self._timed_out.discard(future)
+            else:
+                self._counters[outcome] += 1
+
+    def _run(self, func, *args):
+        self._acquire()
+        if self.max_workers <= 0:
+            outcome = "failed"
+            try:
+                result = func(*args)
+                outcome = "completed"
+                return result
+            finally:
+                self._release(outcome)
+
+        try:
+            future = self._get_executor().submit(func, *args)
+        except Exception:
+            self._release("failed")
+            raise
+        # The slot is held until the job is done, not until the caller stops
+        # waiting: a timed out job keeps its worker busy
+        future.add_done_callback(self._finished)
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            with self._lock:
+                # Finished since the wait ran out and already counted
+                timed_out = not future.done()
+                if timed_out:
+                    self._timed_out.add(future)
+                    self._counters["timed_out"] += 1
+            if not timed_out:
+                return future.result()
+            # Only takes effect while the job is still queued; the done
+            # callback takes the lock, so this must not hold it
+            future.cancel()
+            raise HashingPoolSaturated("Password hashing timed out.")
+
+    def make_password(self, password):
+        """Hash ``password`` with the default hasher."""
+        return self._run(_hash, password)
+
+    def check_password(self, password, encoded):
+        """Verify ``password`` against the stored ``encoded`` hash."""
+        return self._run(_verify, password, encoded)
+
+    def stats(self):
+        """Snapshot of pool usage; ``saturation`` is pending / max_pending."""
+        with self._lock:
+            return {
+                **self._counters,
+                "workers": self.max_workers,
+                "pending": self._pending,
+                "max_pending": self.max_pending,
+                "saturation": (
+                    round(self._pending / self.max_pending, 3)
+                    if self.max_pending
+                    else 1.0
+                ),
+            }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+hashing_service = PasswordHashingService.from_settings()
+atexit.register(hashing_service.shutdown)
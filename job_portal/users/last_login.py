@@ -0,0 +1,92 @@
+import atexit
+import logging
+import threading
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Case, DateTimeField, Value, When
+from django.utils import timezone
+
+from .models import User
+
+logger = logging.getLogger(__name__)
+
+
+class LastLoginWriter:
+    """
+    Coalesces ``last_login`` updates for token logins.
+
+    Logins only record the timestamp in memory; a background thread writes
+    all pending timestamps every ``flush_interval`` seconds with one
+    ``UPDATE ... SET last_login = CASE id WHEN ...`` per ``batch_size`` users,
+    and whatever is left is flushed at shutdown. Repeated logins of the same
+    user between flushes cost a single row update. With ``flush_interval=0``
+    every login is written immediately.
+    """
+
+    def __init__(self, flush_interval=10, batch_size=500):
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @classmethod
+    def from_settings(cls):
+        return cls(flush_interval=settings.LAST_LOGIN_FLUSH_INTERVAL)
+
+    def record(self, user_id, when=None):
+        with self._lock:
+            self._pending[user_id] = when or timezone.now()
+        if self.flush_interval <= 0:
+            self.flush()
+        else:
+            self._start()
+
+    def _start(self):
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(
+                        target=self._run, name="last-login-writer", daemon=True
+                    )
+                    self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+            connection.close()
+
+    def flush(self):
+        """Write pending timestamps, returns the number of users updated"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        items = list(pending.items())
+        try:
+            for start in range(0, len(items), self.batch_size):
+                batch = items[start : start + self.batch_size]
+                User.objects.filter(pk__in=[user_id for user_id, _ in batch]).update(
+                    last_login=Case(
+                        *[
+                            When(pk=user_id, then=Value(when))
+                            for user_id, when in batch
+                        ],
+                        output_field=DateTimeField(),
+                    )
+                )
+        except Exception:
+            logger.exception("Could not write %s last_login updates.", len(items))
+            with self._lock:
+                # Keep the newer timestamp of anything recorded meanwhile
+                self._pending = {**pending, **self._pending}
+            return 0
+        return len(items)
+
+    def shutdown(self):
+        self._stop.set()
+        self.flush()
+
+
+last_login_writer = LastLoginWriter.from_settings()
+atexit.register(last_login_writer.shutdown)
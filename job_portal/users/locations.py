@@ -0,0 +1,219 @@
+import csv
+import math
+import re
+import unicodedata
+from collections import defaultdict, namedtuple
+from pathlib import Path
+
+from django.db.models import Q
+
+from .models import Location
+from .versioned_cache import VersionedCache
+
+VERSION_CACHE_KEY = "locations:version"
+GAZETTEER_PATH = Path(__file__).resolve().parent / "data" / "gazetteer.tsv"
+EARTH_RADIUS_KM = 6371.0088
+
+# Country spellings the gazetteer does not carry, by country code
+COUNTRY_ALIASES = {
+    "US": ("usa", "us", "united states of america", "america"),
+    "GB": ("uk", "great britain", "britain"),
+    "AE": ("uae",),
+}
+
+Place = namedtuple("Place", "id name region_code country_code latitude longitude")
+
+
+def normalize_place(text):
+    """Lookup key of a place name, 'Montréal, QC.' -> 'montreal qc'"""
+    text = unicodedata.normalize("NFKD", str(text or ""))
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    text = text.casefold().replace(".", "")
+    return " ".join(re.split(r"[\W_]+", text)).strip()
+
+
+def read_gazetteer(path=GAZETTEER_PATH):
+    """Rows of the gazetteer file as Location field dicts"""
+    with open(path, encoding="utf-8", newline="") as f:
+        rows = csv.DictReader(
+            (line for line in f if not line.startswith("#")), delimiter="\t"
+        )
+        for row in rows:
+            yield {
+                **row,
+                "latitude": float(row["latitude"]),
+                "longitude": float(row["longitude"]),
+                "population": int(row["population"] or 0),
+            }
+
+
+class GazetteerSnapshot:
+    """
+    Name index over the Location table at one version.
+
+    Places are keyed by their normalized name and alternate names, most
+    populous first. Each also knows the qualifiers that may follow its name
+    ("ny", "new york", "us", "usa", ...), which pick between places sharing
+    a name.
+    """
+
+    def __init__(self, locations, version):
+        self.version = version
+        self.by_name = defaultdict(list)
+        self.qualifiers = {}
+        self.max_words = 1
+        self.cache = {}
+        for location in sorted(locations, key=lambda row: -row["population"]):
+            place = Place(
+                location["id"],
+                location["name"],
+                location["region_code"],
+                location["country_code"],
+                location["latitude"],
+                location["longitude"],
+            )
+            names = {location["name"], *location["alternate_names"].split(",")}
+            for name in filter(None, map(normalize_place, names)):
+                self.by_name[name].append(place)
+                self.max_words = max(self.max_words, len(name.split()))
+            self.qualifiers[place.id] = frozenset(
+                filter(
+                    None,
+                    map(
+                        normalize_place,
+                        (
+                            location["region_code"],
+                            location["region_name"],
+                            location["country_code"],
+                            location["country_name"],
+                            *COUNTRY_ALIASES.get(location["country_code"], ()),
+                        ),
+                    ),
+                )
+            )
+
+    def qualified(self, place, words):
+        """Whether ``words`` are made only of the place's qualifiers"""
+        qualifiers = self.qualifiers[place.id]
+        start = 0
+        while start < len(words):
+            for end in range(len(words), start, -1):
+                if " ".join(words[start:end]) in qualifiers:
+                    start = end
+                    break
+            else:
+                return False
+        return True
+
+    def geocode(self, text):
+        """
+        The Place ``text`` names, or None. The longest leading run of words
+        naming a place wins, provided the remaining words qualify it:
+        "New York, NY", "NYC" and "new york" all find New York, and
+        "London, ON" finds London, Ontario over London, England.
+        """
+        key = normalize_place(text)
+        if key in self.cache:
+            return self.cache[key]
+        words = key.split()
+        place = None
+        for end in range(min(len(words), self.max_words), 0, -1):
+            candidates = self.by_name.get(" ".join(words[:end]))
+            if not candidates:
+                continue
+            place = next(
+                (c for c in candidates if self.qualified(c, words[end:])), None
+            )
+            if place is not None:
+                break
+        if len(self.cache) >= 10000:
+            self.cache.clear()
+        self.cache[key] = place
+        return place
+
+
+class LocationGazetteer(VersionedCache):
+    """
+    In-process GazetteerSnapshot, rebuilt when the Location table changes.
+
+    Writes bump a version in the shared cache so every process rebuilds its
+    snapshot on the next lookup, like the skill catalog.
+    """
+
+    cache_key = VERSION_CACHE_KEY
+
+    def build(self, version):
+        return GazetteerSnapshot(
+            Location.objects.values(
+                "id",
+                "name",
+                "alternate_names",
+                "region_code",
+                "region_name",
+                "country_code",
+                "country_name",
+                "latitude",
+                "longitude",
+                "population",
+            ),
+            version,
+        )
+
+    def snapshot(self):
+        return self.get()
+
+    def geocode(self, text):
+        if not str(text or "").strip():
+            return None
+        return self.snapshot().geocode(text)
+
+
+location_gazetteer = LocationGazetteer()
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Great circle distance between two points, in kilometres"""
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = (
+        math.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def bounding_box(latitude, longitude, radius_km):
+    """
+    Q over Location latitude/longitude enclosing the circle of
+    ``radius_km`` around a point. Longitudes wrap at the antimeridian and
+    the box spans every longitude when the circle covers a pole.
+    """
+    angle = radius_km / EARTH_RADIUS_KM
+    min_lat = latitude - math.degrees(angle)
+    max_lat = latitude + math.degrees(angle)
+    box = Q(latitude__gte=max(min_lat, -90), latitude__lte=min(max_lat, 90))
+    if min_lat <= -90 or max_lat >= 90:
+        return box
+    delta = math.degrees(
+        math.asin(min(1.0, math.sin(angle) / math.cos(math.radians(latitude))))
+    )
+    min_lon, max_lon = longitude - delta, longitude + delta
+    if min_lon < -180:
+        return box & (Q(longitude__gte=min_lon + 360) | Q(longitude__lte=max_lon))
+    if max_lon > 180:
+        return box & (Q(longitude__gte=min_lon) | Q(longitude__lte=max_lon - 360))
+    return box & Q(longitude__gte=min_lon, longitude__lte=max_lon)
+
+
+def locations_within(latitude, longitude, radius_km):
+    """
+    {location id: distance in km} of the places within ``radius_km`` of a
+    point. The bounding box is read from the (latitude, longitude) index;
+    only the places inside it get the exact haversine test.
+    """
+    return {
+        location_id: distance
+        for location_id, lat, lon in Location.objects.filter(
+            bounding_box(latitude, longitude, radius_km)
+        ).values_list("id", "latitude", "longitude")
+        if (distance := haversine_km(latitude, longitude, lat, lon)) <= radius_km
+    }
@@ -0,0 +1,112 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import IntegrityError, transaction
+from django.db.models import Case, CharField, Value, When
+
+from users.fields import normalize_email
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = (
+        "Fill User.email_normalized for users created before the column "
+        "existed. Walks the table in primary key order, one short UPDATE per "
+        "chunk, so it can run against a live database and be resumed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=1000)
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=0,
+            help="Seconds to pause between chunks to leave room for live traffic",
+        )
+        parser.add_argument(
+            "--start-id", type=int, default=0, help="Resume after this user id"
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = options["chunk_size"]
+        last_id = options["start_id"]
+        self.updated = 0
+        self.conflicts = 0
+        started = time.monotonic()
+
+        while True:
+            chunk = list(
+                User.objects.filter(pk__gt=last_id, email_normalized__isnull=True)
+                .order_by("pk")
+                .values_list("pk", "email")[:chunk_size]
+            )
+            if not chunk:
+                break
+            last_id = chunk[-1][0]
+            self.write_chunk(chunk)
+            self.stdout.write(
+                f"Up to user {last_id}: {self.updated} updated, "
+                f"{self.conflicts} conflicts"
+            )
+            if options["sleep"]:
+                time.sleep(options["sleep"])
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Done: {self.updated} updated, {self.conflicts} conflicts in "
+                f"{time.monotonic() - started:.1f}s."
+            )
+        )
+
+    def write_chunk(self, chunk):
+        values = {}
+        for pk, email in chunk:
+            email = normalize_email(email)
+            if email is not None:
+                values[pk] = email
+        if not values:
+            return
+
+        taken = set(
+            User.objects.filter(email_normalized__in=values.values()).values_list(
+                "email_normalized", flat=True
+            )
+        )
+        pending = {}
+        for pk, email in values.items():
+            if email in taken:
+                self.report_conflict(pk, email)
+            else:
+                taken.add(email)
+                pending[pk] = email
+        if not pending:
+            return
+
+        try:
+            with transaction.atomic():
+                self.update(pending)
+            self.updated += len(pending)
+        except IntegrityError:
+            # Someone registered one of these emails meanwhile, go row by row.
+            for pk, email in pending.items():
+                try:
+                    with transaction.atomic():
+                        self.update({pk: email})
+                    self.updated += 1
+                except IntegrityError:
+                    self.report_conflict(pk, email)
+
+    @staticmethod
+    def update(values):
+        User.objects.filter(pk__in=list(values), email_normalized__isnull=True).update(
+            email_normalized=Case(
+                *[When(pk=pk, then=Value(email)) for pk, email in values.items()],
+                output_field=CharField(),
+            )
+        )
+
+    def report_conflict(self, pk, email):
+        self.conflicts += 1
+        self.stderr.write(
+            f"User {pk}: {email} already belongs to another user, left empty."
+        )
@@ -0,0 +1,78 @@
+import multiprocessing
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from users.hashing import _init_worker
+from users.models import ApplicantProfile
+from users.resume_text import process_resume_safely
+
+
+class Command(BaseCommand):
+    help = (
+        "Extract the text of every applicant resume in parallel. Resumes whose "
+        "file hash matches the stored text are skipped unless --force is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=settings.RESUME_TEXT_EXTRACTION.get("WORKERS") or os.cpu_count(),
+            help="Extraction processes, 0 runs inline",
+        )
+        parser.add_argument("--chunk-size", type=int, default=500)
+        parser.add_argument(
+            "--force", action="store_true", help="Re-extract unchanged resumes"
+        )
+
+    def handle(self, *args, **options):
+        profile_ids = list(
+            ApplicantProfile.objects.exclude(resume_file="")
+            .order_by("pk")
+            .values_list("pk", flat=True)
+        )
+        job = partial(process_resume_safely, force=options["force"])
+        started = time.monotonic()
+        statuses = Counter()
+        chunk_size = options["chunk_size"]
+
+        executor = None
+        if options["workers"] > 0:
+            executor = ProcessPoolExecutor(
+                max_workers=options["workers"],
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(os.environ.get("DJANGO_SETTINGS_MODULE", ""),),
+            )
+        try:
+            for start in range(0, len(profile_ids), chunk_size):
+                chunk = profile_ids[start : start + chunk_size]
+                if executor is None:
+                    statuses.update(map(job, chunk))
+                else:
+                    statuses.update(
+                        executor.map(
+                            job,
+                            chunk,
+                            chunksize=max(len(chunk) // (options["workers"] * 4), 1),
+                        )
+                    )
+                self.stdout.write(
+                    f"Processed {start + len(chunk)}/{len(profile_ids)} resumes: "
+                    f"{dict(statuses)}"
+                )
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Done: {dict(statuses)} in {time.monotonic() - started:.1f}s."
+            )
+        )
@@ -0,0 +1,73 @@
+from collections import Counter
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from users.models import ApplicantProfile
+from users.storage import digest_from_name
+
+
+class Command(BaseCommand):
+    help = (
+        "Count references to every content-addressed resume blob and delete "
+        "the blobs no applicant profile references anymore."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--grace-hours",
+            type=float,
+            default=24,
+            help="Keep unreferenced blobs written more recently than this",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report what would be deleted",
+        )
+
+    def handle(self, *args, **options):
+        field = ApplicantProfile._meta.get_field("resume_file")
+        storage = field.storage
+        cutoff = timezone.now() - timedelta(hours=options["grace_hours"])
+
+        refcounts = Counter(
+            ApplicantProfile.objects.exclude(resume_file="")
+            .values_list("resume_file", flat=True)
+            .iterator()
+        )
+
+        blobs = deleted = freed = 0
+        for name in self.walk(storage, storage.prefix):
+            blobs += 1
+            if refcounts[name] or storage.get_modified_time(name) > cutoff:
+                continue
+            size = storage.size(name)
+            if options["verbosity"] > 1:
+                self.stdout.write(f"Unreferenced {name} ({size} bytes)")
+            if not options["dry_run"]:
+                storage.delete(name)
+            deleted += 1
+            freed += size
+
+        referenced = sum(1 for name in refcounts if digest_from_name(name))
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{blobs} blobs, {referenced} referenced by "
+                f"{sum(refcounts.values())} profiles, "
+                f"{'would delete' if options['dry_run'] else 'deleted'} "
+                f"{deleted} ({freed} bytes)."
+            )
+        )
+
+    def walk(self, storage, prefix):
+        """Content-addressed names under ``prefix``, spool files included"""
+        if not storage.exists(prefix):
+            return
+        directories, _ = storage.listdir(prefix)
+        for directory in directories:
+            path = f"{prefix}/{directory}"
+            for name in storage.listdir(path)[1]:
+                if directory == ".tmp" or digest_from_name(f"{path}/{name}"):
+                    yield f"{path}/{name}"
@@ -0,0 +1,364 @@
+import csv
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.core.validators import URLValidator, validate_email
+from django.db import connection, transaction
+
+from users.fields import normalize_email, normalize_skill_name
+from users.hashing import _hash, _init_worker
+from users.models import ApplicantProfile, EmployerProfile, Skill, User
+
+USER_FIELDS = ["username", "email", "first_name", "last_name", "password"]
+APPLICANT_FIELDS = ["phone_number", "address"]
+EMPLOYER_FIELDS = ["company_name", "company_website", "location", "description"]
+TRUE_VALUES = {"1", "true", "yes", "y"}
+
+
+class RowError(Exception):
+    """Invalid input row; the message is reported and the row skipped."""
+
+
+class Command(BaseCommand):
+    help = (
+        "Stream users with their applicant/employer profiles and skills from a "
+        "CSV or NDJSON file and bulk insert them in chunks. Use '-' to read "
+        "from stdin."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV or NDJSON file, or '-' for stdin")
+        parser.add_argument(
+            "--format",
+            choices=["csv", "ndjson"],
+            help="Input format, guessed from the file extension by default",
+        )
+        parser.add_argument("--chunk-size", type=int, default=1000)
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=settings.PASSWORD_HASHING.get("WORKERS") or os.cpu_count(),
+            help="Password hashing processes",
+        )
+        parser.add_argument(
+            "--errors-file",
+            help="Write rejected rows as NDJSON here instead of stderr",
+        )
+
+    def handle(self, *args, **options):
+        input_format = options["format"] or self.guess_format(options["path"])
+        self.chunk_size = options["chunk_size"]
+        self.skills = self.load_skill_lookup()
+        self.workers = max(options["workers"], 1)
+        self.seen_usernames = set()
+        self.seen_emails = set()
+        self.imported = 0
+        self.failed = 0
+        self.processed = 0
+        self.started = time.monotonic()
+
+        errors_file = (
+            open(options["errors_file"], "w") if options["errors_file"] else None
+        )
+        source = (
+            sys.stdin
+            if options["path"] == "-"
+            else open(options["path"], newline="", encoding="utf-8")
+        )
+        try:
+            rows = (
+                self.read_csv(source)
+                if input_format == "csv"
+                else self.read_ndjson(source)
+            )
+            with ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(os.environ.get("DJANGO_SETTINGS_MODULE", ""),),
+            ) as executor:
+                self.run(rows, executor, errors_file)
+        finally:
+            if source is not sys.stdin:
+                source.close()
+            if errors_file:
+                errors_file.close()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Done: {self.imported} imported, {self.failed} rejected, "
+                f"{self.processed} rows in {time.monotonic() - self.started:.1f}s."
+            )
+        )
+
+    @staticmethod
+    def guess_format(path):
+        if path.endswith((".ndjson", ".jsonl")):
+            return "ndjson"
+        if path.endswith(".csv"):
+            return "csv"
+        raise CommandError("Cannot guess the input format, pass --format.")
+
+    @staticmethod
+    def load_skill_lookup():
+        """Map skill ids and normalized names to ids; the catalog is small."""
+        lookup = {}
+        for skill_id, key in Skill.objects.values_list(
+            "id", "normalized_name"
+        ).iterator():
+            lookup[str(skill_id)] = skill_id
+            lookup.setdefault(key, skill_id)
+        return lookup
+
+    @staticmethod
+    def read_csv(source):
+        reader = csv.DictReader(source)
+        for row in reader:
+            yield reader.line_num, row
+
+    @staticmethod
+    def read_ndjson(source):
+        for line_number, line in enumerate(source, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as e:
+                yield line_number, RowError(f"Invalid JSON: {e}")
+                continue
+            if not isinstance(row, dict):
+                yield line_number, RowError("Each line must be a JSON object.")
+                continue
+            yield line_number, row
+
+    def run(self, rows, executor, errors_file):
+        # Hash the next chunk in the pool while the previous one is written.
+        pending = None
+        while True:
+            chunk = list(islice(rows, self.chunk_size))
+            if not chunk:
+                break
+            prepared = self.prepare_chunk(chunk, executor, errors_file)
+            if pending is not None:
+                self.write_chunk(*pending, errors_file)
+            pending = prepared
+        if pending is not None:
+            self.write_chunk(*pending, errors_file)
+
+    def prepare_chunk(self, chunk, executor, errors_file):
+        valid = []
+        for line_number, row in chunk:
+            self.processed += 1
+            try:
+                if isinstance(row, RowError):
+                    raise row
+                valid.append((line_number, self.clean_row(row)))
+            except RowError as e:
+                self.report(errors_file, line_number, str(e))
+
+        existing = set(
+            User.objects.filter(
+                username__in=[row["username"] for _, row in valid]
+            ).values_list("username", flat=True)
+        )
+        existing_emails = set(
+            User.objects.filter(
+                email_normalized__in=[normalize_email(row["email"]) for _, row in valid]
+            ).values_list("email_normalized", flat=True)
+        )
+        rows = []
+        for line_number, row in valid:
+            if row["username"] in existing:
+                self.report(errors_file, line_number, "Username already exists.")
+            elif normalize_email(row["email"]) in existing_emails:
+                self.report(errors_file, line_number, "Email already exists.")
+            else:
+                rows.append((line_number, row))
+
+        hashes = executor.map(
+            _hash,
+            [row["password"] for _, row in rows],
+            chunksize=max(len(rows) // (self.workers * 4), 1),
+        )
+        return rows, hashes
+
+    def clean_row(self, row):
+        row = {
+            key.strip(): (value.strip() if isinstance(value, str) else value)
+            for key, value in row.items()
+            if key
+        }
+        user_type = str(row.get("user_type") or "").capitalize()
+        if user_type not in ("Applicant", "Employer"):
+            raise RowError("Invalid User Type")
+        profile_fields = (
+            APPLICANT_FIELDS if user_type == "Applicant" else EMPLOYER_FIELDS
+        )
+        missing = [
+            field for field in USER_FIELDS + profile_fields if not row.get(field)
+        ]
+        if missing:
+            raise RowError(f"Missing required fields: {', '.join(missing)}.")
+
+        username = row["username"]
+        try:
+            User.username_validator(username)
+            validate_email(row["email"])
+        except ValidationError as e:
+            raise RowError(" ".join(e.messages))
+        if username in self.seen_usernames:
+            raise RowError("Duplicate username in file.")
+        email = normalize_email(row["email"])
+        if email in self.seen_emails:
+            raise RowError("Duplicate email in file.")
+        self.seen_usernames.add(username)
+        self.seen_emails.add(email)
+
+        cleaned = {field: str(row[field]) for field in USER_FIELDS}
+        cleaned["user_type"] = user_type
+        if user_type == "Applicant":
+            if not re.match(r"^\d{10}$", str(row["phone_number"])):
+                raise RowError("Phone number must be exactly 10 digits.")
+            cleaned["profile"] = {
+                "phone_number": str(row["phone_number"]),
+                "address": str(row["address"]),
+                "resume_file": str(row.get("resume_file") or ""),
+                "profile_complete": str(row.get("profile_complete", "")).lower()
+                in TRUE_VALUES
+                or row.get("profile_complete") is True,
+            }
+            cleaned["skills"] = self.resolve_skills(row.get("skills"))
+        else:
+            try:
+                URLValidator()(row["company_website"])
+            except ValidationError:
+                raise RowError("Enter a valid URL.")
+            cleaned["profile"] = {field: str(row[field]) for field in EMPLOYER_FIELDS}
+        return cleaned
+
+    def resolve_skills(self, value):
+        """Skills as a list, or ';'-separated ids or names in CSV."""
+        if not value:
+            return []
+        tokens = value if isinstance(value, list) else str(value).split(";")
+        skill_ids, unknown = [], []
+        for token in tokens:
+            key = normalize_skill_name(token)
+            if not key:
+                continue
+            if key in self.skills:
+                skill_ids.append(self.skills[key])
+            else:
+                unknown.append(str(token).strip())
+        if unknown:
+            raise RowError(f"Unknown skills: {', '.join(unknown)}.")
+        return list(dict.fromkeys(skill_ids))
+
+    def write_chunk(self, rows, hashes, errors_file):
+        if not rows:
+            return
+        try:
+            with transaction.atomic():
+                self.insert_rows(rows, list(hashes))
+        except Exception as e:
+            for line_number, _ in rows:
+                self.report(errors_file, line_number, f"Chunk failed: {e}")
+            return
+        self.imported += len(rows)
+        elapsed = time.monotonic() - self.started
+        self.stdout.write(
+            f"Processed {self.processed} rows: {self.imported} imported, "
+            f"{self.failed} rejected ({self.processed / elapsed:.0f} rows/s)"
+        )
+
+    def insert_rows(self, rows, hashes):
+        users = User.objects.bulk_create(
+            [
+                User(
+                    username=row["username"],
+                    email=row["email"],
+                    first_name=row["first_name"],
+                    last_name=row["last_name"],
+                    password=encoded,
+                    is_applicant=row["user_type"] == "Applicant",
+                    is_employer=row["user_type"] == "Employer",
+                )
+                for (_, row), encoded in zip(rows, hashes)
+            ],
+            batch_size=self.chunk_size,
+        )
+        user_ids = self.returned_ids(
+            users,
+            lambda: dict(
+                User.objects.filter(
+                    username__in=[user.username for user in users]
+                ).values_list("username", "id")
+            ),
+            key=lambda user: user.username,
+        )
+
+        applicants = [
+            (row, user_ids[row["username"]])
+            for _, row in rows
+            if row["user_type"] == "Applicant"
+        ]
+        EmployerProfile.objects.bulk_create(
+            [
+                EmployerProfile(user_id=user_ids[row["username"]], **row["profile"])
+                for _, row in rows
+                if row["user_type"] == "Employer"
+            ],
+            batch_size=self.chunk_size,
+        )
+        profiles = ApplicantProfile.objects.bulk_create(
+            [
+                ApplicantProfile(user_id=user_id, **row["profile"])
+                for row, user_id in applicants
+            ],
+            batch_size=self.chunk_size,
+        )
+        profile_ids = self.returned_ids(
+            profiles,
+            lambda: dict(
+                ApplicantProfile.objects.filter(
+                    user_id__in=[user_id for _, user_id in applicants]
+                ).values_list("user_id", "id")
+            ),
+            key=lambda profile: profile.user_id,
+        )
+
+        through = ApplicantProfile.skills.through
+        through.objects.bulk_create(
+            [
+                through(applicantprofile_id=profile_ids[user_id], skill_id=skill_id)
+                for row, user_id in applicants
+                for skill_id in row["skills"]
+            ],
+            batch_size=self.chunk_size,
+        )
+
+    @staticmethod
+    def returned_ids(objs, fetch, key):
+        """
+        Primary keys of bulk created rows. Backends that cannot return rows
+        from a bulk insert (MySQL) need one extra lookup query.
+        """
+        if connection.features.can_return_rows_from_bulk_insert:
+            return {key(obj): obj.pk for obj in objs}
+        return fetch()
+
+    def report(self, errors_file, line_number, message):
+        self.failed += 1
+        if errors_file:
+            errors_file.write(
+                json.dumps({"line": line_number, "error": message}) + "\n"
+            )
+        else:
+            self.stderr.write(f"line {line_number}: {message}")
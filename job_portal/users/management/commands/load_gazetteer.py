@@ -0,0 +1,60 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from jobs.alerts import saved_search_percolator
+from users.locations import GAZETTEER_PATH, location_gazetteer, read_gazetteer
+from users.models import Location
+
+FIELDS = [
+    "alternate_names",
+    "region_name",
+    "country_name",
+    "latitude",
+    "longitude",
+    "population",
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Insert or update the Location table from the offline gazetteer "
+        "file. Safe to run on every deploy."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--path", default=str(GAZETTEER_PATH), help="Tab separated gazetteer"
+        )
+
+    def handle(self, *args, **options):
+        # An explicit upsert: MySQL cannot bulk_create with update_conflicts
+        # on named unique fields
+        rows = list(read_gazetteer(options["path"]))
+        with transaction.atomic():
+            existing = {
+                (row["name"], row["region_code"], row["country_code"]): row
+                for row in Location.objects.select_for_update().values(
+                    "id", "name", "region_code", "country_code", *FIELDS
+                )
+            }
+            created, updated = [], []
+            for row in rows:
+                current = existing.get(
+                    (row["name"], row["region_code"], row["country_code"])
+                )
+                if current is None:
+                    created.append(Location(**row))
+                elif any(current[field] != row[field] for field in FIELDS):
+                    updated.append(Location(id=current["id"], **row))
+            Location.objects.bulk_create(created, batch_size=1000)
+            Location.objects.bulk_update(updated, FIELDS, batch_size=1000)
+        if created or updated:
+            # bulk_create() and bulk_update() send no signals
+            location_gazetteer.invalidate()
+            saved_search_percolator.invalidate()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Loaded {len(rows)} gazetteer entries: {len(created)} new, "
+                f"{len(updated)} updated."
+            )
+        )
@@ -0,0 +1,24 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from users import uploads
+from users.models import ResumeUploadSession
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete resume upload sessions older than RESUME_UPLOAD_SESSION_TTL "
+        "along with their partial files."
+    )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - settings.RESUME_UPLOAD_SESSION_TTL
+        purged = 0
+        for session in ResumeUploadSession.objects.filter(
+            created_at__lt=cutoff
+        ).iterator():
+            uploads.discard(session)
+            session.delete()
+            purged += 1
+        self.stdout.write(self.style.SUCCESS(f"Purged {purged} upload sessions."))
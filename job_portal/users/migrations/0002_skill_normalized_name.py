@@ -0,0 +1,63 @@
+# Generated by Django 4.2.16 on 2026-10-18 09:12
+
+from django.db import migrations
+import users.fields
+
+
+def merge_duplicate_skills(apps, schema_editor):
+    """
+    Fill normalized_name and fold skills that only differ in case or
+    whitespace into the oldest one, so the unique index can be added.
+    """
+    Skill = apps.get_model("users", "Skill")
+    ApplicantProfile = apps.get_model("users", "ApplicantProfile")
+    Jobs = apps.get_model("jobs", "Jobs")
+    relations = [
+        (ApplicantProfile.skills.through, "applicantprofile_id"),
+        (Jobs.required_skills.through, "jobs_id"),
+    ]
+
+    keep_by_key = {}
+    duplicates = {}
+    for skill in Skill.objects.order_by("id").iterator():
+        key = users.fields.normalize_skill_name(skill.name)
+        if key in keep_by_key:
+            duplicates[skill.id] = keep_by_key[key]
+        else:
+            keep_by_key[key] = skill.id
+            Skill.objects.filter(id=skill.id).update(normalized_name=key)
+
+    for duplicate_id, keep_id in duplicates.items():
+        for through, owner_column in relations:
+            owners_with_keep = set(
+                through.objects.filter(skill_id=keep_id).values_list(
+                    owner_column, flat=True
+                )
+            )
+            through.objects.filter(skill_id=duplicate_id).exclude(
+                **{f"{owner_column}__in": owners_with_keep}
+            ).update(skill_id=keep_id)
+            through.objects.filter(skill_id=duplicate_id).delete()
+    Skill.objects.filter(id__in=list(duplicates)).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0003_alter_jobapplication_status_jobapplicationaudit'),
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='skill',
+            name='normalized_name',
+            field=users.fields.NormalizedNameField(max_length=50, null=True, source='name'),
+        ),
+        migrations.RunPython(merge_duplicate_skills, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='skill',
+            name='normalized_name',
+            field=users.fields.NormalizedNameField(max_length=50, unique=True, source='name'),
+        ),
+    ]
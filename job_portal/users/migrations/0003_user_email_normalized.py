@@ -0,0 +1,21 @@
+# Generated by Django 4.2.16 on 2026-10-18 23:37
+
+from django.db import migrations
+import users.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0002_skill_normalized_name"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="email_normalized",
+            field=users.fields.NormalizedEmailField(
+                blank=True, max_length=254, null=True, source="email", unique=True
+            ),
+        ),
+    ]
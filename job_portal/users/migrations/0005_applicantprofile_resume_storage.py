@@ -0,0 +1,19 @@
+# Generated by Django 4.2.16 on 2026-10-18 23:46
+
+from django.db import migrations, models
+import users.storage
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0004_resumeuploadsession'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='applicantprofile',
+            name='resume_file',
+            field=models.FileField(storage=users.storage.ContentAddressedStorage(prefix='resumes'), upload_to='resumes/'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 4.2.16 on 2026-10-19 01:05
+
+from django.db import migrations, models
+
+# Covers candidate search (jobs/candidates.py): rows are found by skill and
+# grouped by profile without touching the table. Auto-created through
+# tables take no Meta.indexes, so the index is added here.
+INDEX = models.Index(
+    fields=["skill", "applicantprofile"], name="applicant_skill_profile_idx"
+)
+
+
+def through_model(apps):
+    ApplicantProfile = apps.get_model("users", "ApplicantProfile")
+    return ApplicantProfile._meta.get_field("skills").remote_field.through
+
+
+def add_index(apps, schema_editor):
+    schema_editor.add_index(through_model(apps), INDEX)
+
+
+def remove_index(apps, schema_editor):
+    schema_editor.remove_index(through_model(apps), INDEX)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0006_resumetext'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_index, remove_index),
+    ]
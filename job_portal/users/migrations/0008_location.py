@@ -0,0 +1,45 @@
+# Generated by Django 4.2.16 on 2026-10-19 00:29
+
+from django.db import migrations, models
+import django.db.models.deletion
+import users.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0007_applicant_skill_profile_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Location',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('deleted_at', models.DateTimeField(blank=True, null=True)),
+                ('name', models.CharField(max_length=100)),
+                ('alternate_names', models.TextField(blank=True)),
+                ('region_code', models.CharField(blank=True, max_length=10)),
+                ('region_name', models.CharField(blank=True, max_length=100)),
+                ('country_code', models.CharField(max_length=2)),
+                ('country_name', models.CharField(max_length=100)),
+                ('latitude', models.FloatField()),
+                ('longitude', models.FloatField()),
+                ('population', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['latitude', 'longitude'], name='location_lat_lon_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='location',
+            constraint=models.UniqueConstraint(fields=('name', 'region_code', 'country_code'), name='location_unique_place'),
+        ),
+        migrations.AddField(
+            model_name='employerprofile',
+            name='location_ref',
+            field=users.fields.GeocodedLocationField(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='employers', source='location', to='users.location'),
+        ),
+    ]
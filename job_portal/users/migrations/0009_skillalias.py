@@ -0,0 +1,30 @@
+# Generated by Django 4.2.16 on 2026-10-19 00:34
+
+from django.db import migrations, models
+import django.db.models.deletion
+import users.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0008_location'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SkillAlias',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('deleted_at', models.DateTimeField(blank=True, null=True)),
+                ('name', models.CharField(max_length=50)),
+                ('normalized_name', users.fields.NormalizedNameField(max_length=50, source='name', unique=True)),
+                ('skill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='aliases', to='users.skill')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+    ]
@@ -1,8 +1,13 @@
+import uuid
+
 from django.db import models
 from django.contrib.auth.models import AbstractUser
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.contenttypes.fields import GenericForeignKey
 
+from .fields import GeocodedLocationField, NormalizedEmailField, NormalizedNameField
+from .storage import resume_storage
+
 # Create your models here.
 
 
@@ -31,10 +36,19 @@ class User(AbstractUser):
     Fields:
         is_applicant (BooleanField): Flag to identify if the user is an applicant.
         is_employer (BooleanField): Flag to identify if the user is an employer.
+        email_normalized (NormalizedEmailField): Case-folded email, unique.
     """
 
     is_applicant = models.BooleanField(default=False)
     is_employer = models.BooleanField(default=False)
+    email_normalized = NormalizedEmailField(
+        max_length=254, null=True, blank=True, unique=True
+    )
+
+    def save(self, *args, update_fields=None, **kwargs):
+        if update_fields is not None and "email" in update_fields:
+            update_fields = {*update_fields, "email_normalized"}
+        super().save(*args, update_fields=update_fields, **kwargs)
 
 
 class ApplicantProfile(BaseModel):
@@ -46,7 +60,7 @@ class ApplicantProfile(BaseModel):
         full_name (CharField): Full name of the applicant.
         phone_number (CharField): Contact number of the applicant.
         address (TextField): Residential address of the applicant.
-        resume_file (FileField): Uploaded resume of the applicant.
+        resume_file (FileField): Uploaded resume, stored once per content (see ContentAddressedStorage).
         skills (ManyToManyField): Set of skills the applicant possesses.
         profile_complete (BooleanField): Indicates if the profile setup is complete.
     """
@@ -56,7 +70,7 @@ class ApplicantProfile(BaseModel):
     )
     phone_number = models.CharField(max_length=15)
     address = models.TextField()
-    resume_file = models.FileField(upload_to="resumes/")
+    resume_file = models.FileField(upload_to="resumes/", storage=resume_storage)
     skills = models.ManyToManyField("Skill", related_name="applicants")
     profile_complete = models.BooleanField(default=False)
 
@@ -73,6 +87,7 @@ class EmployerProfile(BaseModel):
         company_name (CharField): Name of the employer's company.
         company_website (URLField): Website of the employer's company.
         location (CharField): Location of the employer's company.
+        location_ref (GeocodedLocationField): Location geocoded from ``location``.
         description (TextField): Description or additional information about the employer.
     """
 
@@ -82,8 +97,16 @@ class EmployerProfile(BaseModel):
     company_name = models.CharField(max_length=100)
     company_website = models.URLField()
     location = models.CharField(max_length=100)
+    location_ref = GeocodedLocationField(
+        "Location", null=True, on_delete=models.SET_NULL, related_name="employers"
+    )
     description = models.TextField()
 
+    def save(self, *args, update_fields=None, **kwargs):
+        if update_fields is not None and "location" in update_fields:
+            update_fields = {*update_fields, "location_ref"}
+        super().save(*args, update_fields=update_fields, **kwargs)
+
     def __str__(self):
         return self.company_name
 
@@ -94,9 +117,149 @@ class Skill(BaseModel):
 
     Fields:
         name (CharField): Name of the skill.
+        normalized_name (NormalizedNameField): Case-folded name, unique.
+    """
+
+    name = models.CharField(max_length=50)
+    normalized_name = NormalizedNameField(max_length=50, unique=True)
+
+    def __str__(self):
+        return self.name
+
+
+class SkillAlias(BaseModel):
+    """
+    Other name of a skill, e.g. "JS" for JavaScript, recognized when
+    tagging text with skills (see users.skill_tagger).
+
+    Fields:
+        skill (ForeignKey): The skill this name stands for.
+        name (CharField): The alias.
+        normalized_name (NormalizedNameField): Case-folded alias, unique.
     """
 
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name="aliases")
     name = models.CharField(max_length=50)
+    normalized_name = NormalizedNameField(max_length=50, unique=True)
 
     def __str__(self):
         return self.name
+
+
+class Location(BaseModel):
+    """
+    Place from the offline gazetteer (users/data/gazetteer.tsv), see
+    users.locations for geocoding and radius search.
+
+    Fields:
+        name (CharField): Place name.
+        alternate_names (TextField): Comma separated other names, e.g. "NYC".
+        region_code (CharField): State or province code, e.g. "NY".
+        region_name (CharField): State or province name.
+        country_code (CharField): ISO 3166-1 alpha-2 country code.
+        country_name (CharField): Country name.
+        latitude (FloatField): Latitude in decimal degrees.
+        longitude (FloatField): Longitude in decimal degrees.
+        population (PositiveIntegerField): Ranks places sharing a name.
+    """
+
+    name = models.CharField(max_length=100)
+    alternate_names = models.TextField(blank=True)
+    region_code = models.CharField(max_length=10, blank=True)
+    region_name = models.CharField(max_length=100, blank=True)
+    country_code = models.CharField(max_length=2)
+    country_name = models.CharField(max_length=100)
+    latitude = models.FloatField()
+    longitude = models.FloatField()
+    population = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["name", "region_code", "country_code"],
+                name="location_unique_place",
+            )
+        ]
+        # Bounding box prefilter of radius searches
+        indexes = [
+            models.Index(fields=["latitude", "longitude"], name="location_lat_lon_idx")
+        ]
+
+    def __str__(self):
+        return ", ".join(
+            part for part in (self.name, self.region_code, self.country_code) if part
+        )
+
+
+class ResumeUploadSession(BaseModel):
+    """
+    Model to track a resumable, chunked resume upload.
+
+    Fields:
+        id (UUIDField): Upload id used in the chunk URLs.
+        user (ForeignKey): Reference to the uploading User.
+        filename (CharField): Original file name.
+        size (PositiveBigIntegerField): Total size announced by the client.
+        received (PositiveBigIntegerField): Bytes written so far, the offset of the next chunk.
+        status (CharField): Uploading, completed or failed.
+    """
+
+    STATUS_UPLOADING = "uploading"
+    STATUS_COMPLETED = "completed"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = [
+        (STATUS_UPLOADING, "Uploading"),
+        (STATUS_COMPLETED, "Completed"),
+        (STATUS_FAILED, "Failed"),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="resume_uploads"
+    )
+    filename = models.CharField(max_length=255)
+    size = models.PositiveBigIntegerField()
+    received = models.PositiveBigIntegerField(default=0)
+    status = models.CharField(
+        max_length=20, choices=STATUS_CHOICES, default=STATUS_UPLOADING
+    )
+
+    def __str__(self):
+        return f"{self.filename} ({self.received}/{self.size})"
+
+
+class ResumeText(BaseModel):
+    """
+    Model to hold the plain text extracted from an applicant's resume.
+
+    Fields:
+        profile (OneToOneField): Reference to the ApplicantProfile.
+        sha256 (CharField): Hash of the resume file the text was extracted from.
+        text (TextField): Extracted plain text.
+        page_count (PositiveIntegerField): Number of pages in the PDF.
+        status (CharField): Pending, extracted or failed.
+        error (TextField): Reason of the last failed extraction.
+    """
+
+    STATUS_PENDING = "pending"
+    STATUS_EXTRACTED = "extracted"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = [
+        (STATUS_PENDING, "Pending"),
+        (STATUS_EXTRACTED, "Extracted"),
+        (STATUS_FAILED, "Failed"),
+    ]
+
+    profile = models.OneToOneField(
+        ApplicantProfile, on_delete=models.CASCADE, related_name="resume_text"
+    )
+    sha256 = models.CharField(max_length=64, db_index=True)
+    text = models.TextField(blank=True)
+    page_count = models.PositiveIntegerField(null=True, blank=True)
+    status = models.CharField(
+        max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING
+    )
+    error = models.TextField(blank=True)
+
+    def __str__(self):
+        return f"{self.profile} ({self.status})"
@@ -0,0 +1,58 @@
+"""
+Serialized profiles cached per user.
+
+Every entry is stored with the profile's version, a counter that writes
+bump after committing. A GET reads the version together with the entry
+and caches what it loaded under the version it read, so a GET racing a
+PUT can at worst store a copy tagged with the old version, which the next
+read ignores.
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .versioned_cache import bump_version
+
+APPLICANT = "applicant"
+EMPLOYER = "employer"
+
+
+def profile_cache_key(kind, user_id):
+    return f"profile:{kind}:{user_id}"
+
+
+def profile_version_key(kind, user_id):
+    return f"profile:{kind}:{user_id}:version"
+
+
+def get_cached_profile(kind, user_id):
+    """
+    (serialized profile or None on a miss, version), the version being what
+    set_cached_profile() stores a freshly loaded profile under
+    """
+    key = profile_cache_key(kind, user_id)
+    version_key = profile_version_key(kind, user_id)
+    values = cache.get_many([key, version_key])
+    version = values.get(version_key, 0)
+    entry = values.get(key)
+    if entry is not None and entry["version"] == version:
+        return entry["data"], version
+    return None, version
+
+
+def set_cached_profile(kind, user_id, data, version):
+    cache.set(
+        profile_cache_key(kind, user_id),
+        {"version": version, "data": dict(data)},
+        timeout=settings.PROFILE_CACHE_TIMEOUT,
+    )
+
+
+def invalidate_profile(kind, user_id):
+    bump_version(profile_version_key(kind, user_id))
+
+
+def invalidate_profiles(user_ids):
+    for user_id in user_ids:
+        for kind in (APPLICANT, EMPLOYER):
+            invalidate_profile(kind, user_id)
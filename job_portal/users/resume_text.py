@@ -0,0 +1,172 @@
+import atexit
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+
+from .hashing import _init_worker
+from .models import ApplicantProfile, ResumeText
+from .storage import digest_from_name, file_digest
+
+logger = logging.getLogger(__name__)
+
+SKIPPED = "skipped"
+MISSING = "missing"
+ERROR = "error"
+
+
+def extract_pdf_text(path):
+    """
+    Plain text and page count of a PDF with pypdf, a pinned requirement
+    imported here so only the extraction workers load it
+    """
+    from pypdf import PdfReader
+
+    reader = PdfReader(path)
+    pages = [page.extract_text() or "" for page in reader.pages]
+    # NUL characters are not accepted by every database backend
+    return "\n".join(pages).replace("\x00", "").strip(), len(pages)
+
+
+def resume_sha256(resume_file):
+    """Content-addressed names carry the hash, older files are read once"""
+    return digest_from_name(resume_file.name) or file_digest(resume_file.path)
+
+
+def process_resume(profile_id, force=False):
+    """
+    Extract and store the text of one applicant's resume, returns the
+    resulting status.
+
+    Runs in a pool process. Nothing is extracted when the stored text
+    belongs to a file with the same hash, and text already extracted from
+    the same file for another profile is copied instead.
+    """
+    profile = ApplicantProfile.objects.filter(pk=profile_id).only("resume_file").first()
+    if profile is None or not profile.resume_file:
+        return MISSING
+    name = profile.resume_file.name
+    try:
+        sha256 = resume_sha256(profile.resume_file)
+    except OSError as e:
+        return save_result(profile_id, name, "", ResumeText.STATUS_FAILED, error=e)
+
+    current = ResumeText.objects.filter(profile_id=profile_id).first()
+    if (
+        not force
+        and current is not None
+        and current.sha256 == sha256
+        and current.status == ResumeText.STATUS_EXTRACTED
+    ):
+        return SKIPPED
+
+    same_file = (
+        ResumeText.objects.filter(sha256=sha256, status=ResumeText.STATUS_EXTRACTED)
+        .exclude(profile_id=profile_id)
+        .first()
+    )
+    if same_file is not None and not force:
+        return save_result(
+            profile_id,
+            name,
+            sha256,
+            ResumeText.STATUS_EXTRACTED,
+            text=same_file.text,
+            page_count=same_file.page_count,
+        )
+
+    ResumeText.objects.update_or_create(
+        profile_id=profile_id,
+        defaults={"sha256": sha256, "status": ResumeText.STATUS_PENDING},
+    )
+    try:
+        text, page_count = extract_pdf_text(profile.resume_file.path)
+    except Exception as e:
+        return save_result(profile_id, name, sha256, ResumeText.STATUS_FAILED, error=e)
+    return save_result(
+        profile_id,
+        name,
+        sha256,
+        ResumeText.STATUS_EXTRACTED,
+        text=text,
+        page_count=page_count,
+    )
+
+
+def process_resume_safely(profile_id, force=False):
+    """process_resume() for batch jobs: one broken profile must not stop the rest"""
+    try:
+        return process_resume(profile_id, force=force)
+    except Exception:
+        logger.exception("Resume text extraction failed for %s.", profile_id)
+        return ERROR
+
+
+def save_result(profile_id, name, sha256, status, text="", page_count=None, error=""):
+    # The resume may have been replaced while this one was being extracted;
+    # the job queued for the new file will store its text.
+    if not ApplicantProfile.objects.filter(pk=profile_id, resume_file=name).exists():
+        return SKIPPED
+    ResumeText.objects.update_or_create(
+        profile_id=profile_id,
+        defaults={
+            "sha256": sha256,
+            "status": status,
+            "text": text,
+            "page_count": page_count,
+            "error": str(error),
+        },
+    )
+    return status
+
+
+class ResumeTextPipeline:
+    """
+    Extracts resume text in a process pool, off the request path.
+
+    ``submit`` only queues the profile id; the pool processes load the
+    profile, extract and save the text themselves with their own database
+    connections. Processes are spawned rather than forked so they never
+    share the parent's connections. With ``max_workers=0`` jobs run inline,
+    which is what the tests use.
+    """
+
+    def __init__(self, max_workers=2):
+        self.max_workers = max_workers
+        self._executor = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls):
+        config = getattr(settings, "RESUME_TEXT_EXTRACTION", {})
+        return cls(max_workers=config.get("WORKERS", 2))
+
+    def get_executor(self):
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.max_workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                        initializer=_init_worker,
+                        initargs=(os.environ.get("DJANGO_SETTINGS_MODULE", ""),),
+                    )
+        return self._executor
+
+    def submit(self, profile_id):
+        if self.max_workers <= 0:
+            process_resume_safely(profile_id)
+        else:
+            self.get_executor().submit(process_resume_safely, profile_id)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+resume_text_pipeline = ResumeTextPipeline.from_settings()
+atexit.register(resume_text_pipeline.shutdown)
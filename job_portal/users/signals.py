@@ -0,0 +1,125 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from .locations import location_gazetteer
+from .models import (
+    ApplicantProfile,
+    EmployerProfile,
+    Location,
+    Skill,
+    SkillAlias,
+    User,
+)
+from .profile_cache import (
+    APPLICANT,
+    EMPLOYER,
+    invalidate_profile,
+    invalidate_profiles,
+)
+from .resume_text import resume_text_pipeline
+from .skills import skill_autocomplete, skill_catalog
+
+
+@receiver(m2m_changed, sender=ApplicantProfile.skills.through)
+def invalidate_applicant_profile_on_skills_change(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    """Drop cached applicant profiles whose skills changed"""
+    if not reverse:
+        if action in ("post_add", "post_remove", "post_clear"):
+            invalidate_profile(APPLICANT, instance.user_id)
+        return
+
+    # skill.applicants.add()/remove()/clear(): collect the affected users
+    # before a clear, when the rows are still there.
+    if action == "pre_clear":
+        instance._cleared_applicant_user_ids = list(
+            instance.applicants.values_list("user_id", flat=True)
+        )
+    elif action == "post_clear":
+        invalidate_profiles(getattr(instance, "_cleared_applicant_user_ids", []))
+    elif action in ("post_add", "post_remove") and pk_set:
+        invalidate_profiles(
+            ApplicantProfile.objects.filter(pk__in=pk_set).values_list(
+                "user_id", flat=True
+            )
+        )
+
+
+@receiver(post_delete, sender=ApplicantProfile)
+def invalidate_deleted_applicant_profile(sender, instance, **kwargs):
+    invalidate_profile(APPLICANT, instance.user_id)
+
+
+@receiver(post_delete, sender=EmployerProfile)
+def invalidate_deleted_employer_profile(sender, instance, **kwargs):
+    invalidate_profile(EMPLOYER, instance.user_id)
+
+
+@receiver(post_save, sender=User)
+def invalidate_profiles_on_user_change(sender, instance, update_fields, **kwargs):
+    """Profiles embed the user's details; last_login updates do not matter"""
+    if update_fields is not None and set(update_fields) <= {"last_login"}:
+        return
+    invalidate_profiles([instance.pk])
+
+
+@receiver(post_save, sender=Skill)
+def refresh_skill_indexes_on_save(sender, instance, **kwargs):
+    skill_catalog.invalidate()
+    skill_autocomplete.skill_saved(instance)
+
+
+@receiver(post_delete, sender=Skill)
+def refresh_skill_indexes_on_delete(sender, instance, **kwargs):
+    skill_catalog.invalidate()
+    skill_autocomplete.skill_deleted(instance.pk)
+
+
+@receiver(post_save, sender=SkillAlias)
+@receiver(post_delete, sender=SkillAlias)
+def refresh_skill_tagger(sender, **kwargs):
+    # The skill tagger follows the catalog version
+    skill_catalog.invalidate()
+
+
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def refresh_gazetteer(sender, **kwargs):
+    location_gazetteer.invalidate()
+
+
+def update_skill_popularity(sender, instance, action, reverse, pk_set, **kwargs):
+    """Keep autocomplete weights in step with job and applicant skills"""
+    if action == "post_clear":
+        skill_autocomplete.invalidate()
+    elif action in ("post_add", "post_remove") and pk_set:
+        delta = 1 if action == "post_add" else -1
+        if reverse:
+            skill_autocomplete.adjust_weights([instance.pk], delta * len(pk_set))
+        else:
+            skill_autocomplete.adjust_weights(pk_set, delta)
+
+
+m2m_changed.connect(
+    update_skill_popularity,
+    sender=ApplicantProfile.skills.through,
+    dispatch_uid="applicant_skill_popularity",
+)
+m2m_changed.connect(
+    update_skill_popularity,
+    sender=Skill.job_listings.through,
+    dispatch_uid="job_skill_popularity",
+)
+
+
+@receiver(post_save, sender=ApplicantProfile)
+def extract_resume_text_on_upload(sender, instance, created, update_fields, **kwargs):
+    """Queue text extraction once the new resume is committed"""
+    if not instance.resume_file:
+        return
+    if created or update_fields is None or "resume_file" in update_fields:
+        transaction.on_commit(partial(resume_text_pipeline.submit, instance.pk))
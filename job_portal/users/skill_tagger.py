@@ -0,0 +1,157 @@
+import threading
+from collections import deque
+
+from .fields import normalize_skill_name
+from .models import SkillAlias
+from .skills import skill_catalog
+
+
+def is_word_char(char):
+    return char.isalnum() or char == "_"
+
+
+class SkillAutomaton:
+    """
+    Aho-Corasick automaton over normalized skill names and aliases.
+
+    ``scan`` reads a text once, following goto and failure transitions, and
+    reports every occurrence of every name in time linear in the text plus
+    the matches. Names must stand as whole words ("Go" does not match in
+    "good"), and where matches overlap the leftmost, then longest, one
+    wins, so "C++" hides the "C" inside it.
+    """
+
+    def __init__(self, names, snapshot=None):
+        self.snapshot = snapshot
+        self.goto = [{}]
+        # Longest name ending at each state, and the next state down the
+        # failure chain that ends a name
+        self.output = [None]
+        self.fail = [0]
+        self.output_link = [0]
+        self.skill_names = {}
+        for skill_id, name in names:
+            self.skill_names.setdefault(skill_id, name)
+            self.add(normalize_skill_name(name), skill_id)
+        self.build()
+
+    def add(self, key, skill_id):
+        if not key:
+            return
+        state = 0
+        for char in key:
+            next_state = self.goto[state].get(char)
+            if next_state is None:
+                next_state = len(self.goto)
+                self.goto[state][char] = next_state
+                self.goto.append({})
+                self.output.append(None)
+            state = next_state
+        if self.output[state] is None:
+            self.output[state] = (len(key), skill_id)
+
+    def build(self):
+        self.fail = [0] * len(self.goto)
+        self.output_link = [0] * len(self.goto)
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(char, 0)
+                self.fail[next_state] = target if target != next_state else 0
+                target = self.fail[next_state]
+                self.output_link[next_state] = (
+                    target
+                    if self.output[target] is not None
+                    else self.output_link[target]
+                )
+
+    def scan(self, text):
+        """(start, end, skill_id) of the names in ``text``, whole words only"""
+        text = normalize_skill_name(text)
+        goto, fail, output, output_link = (
+            self.goto,
+            self.fail,
+            self.output,
+            self.output_link,
+        )
+        matches = []
+        state = 0
+        for end, char in enumerate(text, 1):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            found = state if output[state] is not None else output_link[state]
+            while found:
+                length, skill_id = output[found]
+                start = end - length
+                if not (
+                    start > 0
+                    and is_word_char(text[start - 1])
+                    and is_word_char(text[start])
+                ) and not (
+                    end < len(text)
+                    and is_word_char(text[end])
+                    and is_word_char(text[end - 1])
+                ):
+                    matches.append((start, end, skill_id))
+                found = output_link[found]
+
+        selected = []
+        position = 0
+        for start, end, skill_id in sorted(matches, key=lambda m: (m[0], -m[1])):
+            if start >= position:
+                selected.append((start, end, skill_id))
+                position = end
+        return selected
+
+    def skill_ids(self, text):
+        """Ids of the skills named in ``text``, in order of first mention"""
+        return list(dict.fromkeys(skill_id for _, _, skill_id in self.scan(text)))
+
+
+class SkillTagger:
+    """
+    In-process SkillAutomaton over all skill names and aliases.
+
+    It is built from the skill catalog snapshot, which every Skill and
+    SkillAlias write replaces, and rebuilt on the first scan after that.
+    """
+
+    def __init__(self):
+        self._automaton = None
+        self._lock = threading.Lock()
+
+    def automaton(self):
+        snapshot = skill_catalog.snapshot()
+        automaton = self._automaton
+        if automaton is not None and automaton.snapshot is snapshot:
+            return automaton
+        with self._lock:
+            automaton = self._automaton
+            if automaton is None or automaton.snapshot is not snapshot:
+                names = [(skill["id"], skill["name"]) for skill in snapshot.skills]
+                names += SkillAlias.objects.order_by("id").values_list(
+                    "skill_id", "name"
+                )
+                automaton = SkillAutomaton(names, snapshot=snapshot)
+                self._automaton = automaton
+        return automaton
+
+    def skill_ids(self, text):
+        return self.automaton().skill_ids(text or "")
+
+    def suggest(self, text):
+        """``{"id", "name"}`` of the skills named in ``text``"""
+        automaton = self.automaton()
+        return [
+            {"id": skill_id, "name": automaton.skill_names[skill_id]}
+            for skill_id in automaton.skill_ids(text or "")
+        ]
+
+
+skill_tagger = SkillTagger()
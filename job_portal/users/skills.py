@@ -0,0 +1,211 @@
+import bisect
+import hashlib
+import heapq
+import json
+import threading
+import time
+
+from django.db.models import Count
+
+from .fields import canonicalize_skill_name, normalize_skill_name
+from .models import ApplicantProfile, Skill
+from .versioned_cache import VersionedCache
+
+VERSION_CACHE_KEY = "skills:version"
+
+
+class SkillSnapshot:
+    """Immutable view of the skill table at one catalog version"""
+
+    def __init__(self, skills, version):
+        self.version = version
+        self.skills = skills
+        self.by_key = {normalize_skill_name(skill["name"]): skill for skill in skills}
+        payload = json.dumps(skills, separators=(",", ":")).encode()
+        self.etag = '"%s"' % hashlib.sha1(payload).hexdigest()
+
+
+class SkillCatalog(VersionedCache):
+    """
+    In-process snapshot of all skills, shared by the catalog endpoint, name
+    resolution and the skill tagger.
+
+    Writes bump a version counter in the shared cache, so every worker
+    process rebuilds its snapshot on the next read; the writing process also
+    drops its own copy right away. Reads cost one cache lookup while the
+    snapshot is current.
+    """
+
+    cache_key = VERSION_CACHE_KEY
+
+    def build(self, version):
+        skills = [
+            {"id": skill_id, "name": name}
+            for skill_id, name in Skill.objects.order_by("id").values_list("id", "name")
+        ]
+        return SkillSnapshot(skills, version)
+
+    def snapshot(self):
+        return self.get()
+
+    def resolve(self, names):
+        """
+        Map skill names to skills, creating the missing ones.
+
+        Names are canonicalized and matched case-insensitively. Names not in
+        the snapshot are inserted with one ``bulk_create(ignore_conflicts=True)``
+        (rows created concurrently are simply kept) and read back with one
+        query. Returns ``{"id", "name"}`` dicts in input order, without
+        duplicates.
+        """
+        wanted = {}
+        for name in names:
+            canonical = canonicalize_skill_name(name)
+            wanted.setdefault(canonical.casefold(), canonical)
+
+        by_key = self.snapshot().by_key
+        found = {key: by_key[key] for key in wanted if key in by_key}
+        missing = [key for key in wanted if key not in found]
+        if missing:
+            Skill.objects.bulk_create(
+                [Skill(name=wanted[key]) for key in missing], ignore_conflicts=True
+            )
+            for skill_id, name, key in Skill.objects.filter(
+                normalized_name__in=missing
+            ).values_list("id", "name", "normalized_name"):
+                found[key] = {"id": skill_id, "name": name}
+            # bulk_create() sends no post_save
+            self.invalidate()
+        return [found[key] for key in wanted if key in found]
+
+
+skill_catalog = SkillCatalog()
+
+
+def skill_prefix_keys(name):
+    """Normalized name and its later words, so 'learn' finds 'Machine Learning'"""
+    words = normalize_skill_name(name).split(" ")
+    return [" ".join(words[start:]) for start in range(len(words))]
+
+
+class SkillAutocomplete:
+    """
+    Prefix index of skill names ranked by popularity.
+
+    Names are kept as a sorted array of case-folded keys, so the candidates
+    for a prefix are one ``bisect`` range; the best ``limit`` of them are
+    picked by popularity, the number of jobs requiring the skill plus the
+    number of applicants listing it.
+
+    Skill saves and deletes in this process update the index in place and
+    skill m2m changes adjust the weights. The whole index is rebuilt when
+    another process changed the catalog version or after ``max_age``
+    seconds, which also corrects weights drifted by cascading deletes.
+    """
+
+    def __init__(self, max_age=300):
+        self.max_age = max_age
+        # (keys, skill ids, names by id), replaced as a whole on every change
+        # so readers never see a half updated index.
+        self._index = None
+        self._weights = {}
+        self._version = None
+        self._built_at = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def through_models():
+        from jobs.models import Jobs
+
+        return (ApplicantProfile.skills.through, Jobs.required_skills.through)
+
+    def rebuild(self):
+        version = skill_catalog.version()
+        weights = {}
+        for through in self.through_models():
+            for skill_id, count in (
+                through.objects.values_list("skill_id")
+                .annotate(count=Count("pk"))
+                .order_by()
+            ):
+                weights[skill_id] = weights.get(skill_id, 0) + count
+        names = dict(Skill.objects.values_list("id", "name"))
+        pairs = sorted(
+            (key, skill_id)
+            for skill_id, name in names.items()
+            for key in skill_prefix_keys(name)
+        )
+        with self._lock:
+            self._index = ([key for key, _ in pairs], [pk for _, pk in pairs], names)
+            self._weights = weights
+            self._version = version
+            self._built_at = time.monotonic()
+
+    def current_index(self):
+        index = self._index
+        if (
+            index is None
+            or self._version != skill_catalog.version()
+            or time.monotonic() - self._built_at > self.max_age
+        ):
+            self.rebuild()
+            index = self._index
+        return index
+
+    def complete(self, prefix, limit=10):
+        """Most popular skills with a word starting with ``prefix``"""
+        key = normalize_skill_name(prefix)
+        if not key:
+            return []
+        keys, skill_ids, names = self.current_index()
+        start = bisect.bisect_left(keys, key)
+        stop = bisect.bisect_right(keys, key + "\U0010ffff", lo=start)
+        weights = self._weights
+        best = heapq.nsmallest(
+            limit,
+            set(skill_ids[start:stop]),
+            key=lambda skill_id: (
+                -weights.get(skill_id, 0),
+                names[skill_id].casefold(),
+            ),
+        )
+        return [{"id": skill_id, "name": names[skill_id]} for skill_id in best]
+
+    def _without(self, skill_id):
+        keys, skill_ids, names = self._index
+        kept = [i for i, pk in enumerate(skill_ids) if pk != skill_id]
+        names = {pk: name for pk, name in names.items() if pk != skill_id}
+        return [keys[i] for i in kept], [skill_ids[i] for i in kept], names
+
+    def skill_saved(self, skill):
+        with self._lock:
+            if self._index is None:
+                return
+            keys, skill_ids, names = self._without(skill.pk)
+            for key in skill_prefix_keys(skill.name):
+                position = bisect.bisect_left(keys, key)
+                keys.insert(position, key)
+                skill_ids.insert(position, skill.pk)
+            names[skill.pk] = skill.name
+            self._index = (keys, skill_ids, names)
+            # The catalog bumped the version for this very write
+            self._version = skill_catalog.version()
+
+    def skill_deleted(self, skill_id):
+        with self._lock:
+            if self._index is None:
+                return
+            self._index = self._without(skill_id)
+            self._weights.pop(skill_id, None)
+            self._version = skill_catalog.version()
+
+    def adjust_weights(self, skill_ids, delta):
+        with self._lock:
+            for skill_id in skill_ids:
+                self._weights[skill_id] = max(self._weights.get(skill_id, 0) + delta, 0)
+
+    def invalidate(self):
+        self._index = None
+
+
+skill_autocomplete = SkillAutocomplete()
@@ -0,0 +1,106 @@
+import hashlib
+import os
+import re
+import tempfile
+
+from django.conf import settings
+from django.core.files.move import file_move_safe
+from django.core.files.storage import FileSystemStorage
+from django.utils.deconstruct import deconstructible
+
+BLOCK_SIZE = 64 * 1024
+BLOB_NAME_RE = re.compile(r"^(.+/)?[0-9a-f]{2}/(?P<digest>[0-9a-f]{64})(\.\w+)?$")
+
+
+def file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def digest_from_name(name):
+    """SHA-256 of a content-addressed file name, None for other names"""
+    match = BLOB_NAME_RE.match(name or "")
+    return match.group("digest") if match else None
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    FileSystemStorage that stores each distinct file once, under
+    ``<prefix>/<first two hex digits>/<sha256><ext>``.
+
+    The digest is computed while the upload is read: files already on disk
+    (temporary uploads, finished chunked uploads) are hashed in place and
+    moved, small in-memory uploads are hashed before anything is written,
+    and larger streams are spooled to a temporary file while hashing. When
+    the blob already exists nothing is written and the existing name is
+    returned, so every model row holding that name is a reference to the
+    blob. Blobs are never deleted on save; ``gc_resumes`` removes the ones
+    no row references anymore. A name never changes content, so URLs built
+    from it can be cached indefinitely.
+    """
+
+    def __init__(self, prefix="resumes", **kwargs):
+        self.prefix = prefix
+        super().__init__(**kwargs)
+
+    def blob_name(self, digest, ext=""):
+        return f"{self.prefix}/{digest[:2]}/{digest}{ext}"
+
+    def _save(self, name, content):
+        ext = os.path.splitext(name)[1].lower()
+        spooled = None
+        if hasattr(content, "temporary_file_path"):
+            source = content.temporary_file_path()
+            digest = file_digest(source)
+        elif (
+            getattr(content, "size", None) or 0
+        ) <= settings.FILE_UPLOAD_MAX_MEMORY_SIZE:
+            source = None
+            digest = hashlib.sha256()
+            for chunk in content.chunks():
+                digest.update(chunk)
+            digest = digest.hexdigest()
+        else:
+            source, digest = spooled = self._spool(content)
+
+        name = self.blob_name(digest, ext)
+        full_path = self.path(name)
+        try:
+            if os.path.exists(full_path):
+                # Refresh the mtime so gc_resumes grants the new reference
+                # its grace period before the row is committed.
+                os.utime(full_path)
+                return name
+            if source is None:
+                source, _ = spooled = self._spool(content)
+            os.makedirs(os.path.dirname(full_path), exist_ok=True)
+            try:
+                file_move_safe(source, full_path)
+            except FileExistsError:
+                # Stored concurrently by another request, same bytes
+                return name
+            spooled = None
+            if self.file_permissions_mode is not None:
+                os.chmod(full_path, self.file_permissions_mode)
+            return name
+        finally:
+            if spooled is not None:
+                os.remove(spooled[0])
+
+    def _spool(self, content):
+        """Copy ``content`` to a temporary file next to the blobs, hashing it"""
+        directory = self.path(os.path.join(self.prefix, ".tmp"))
+        os.makedirs(directory, exist_ok=True)
+        digest = hashlib.sha256()
+        with tempfile.NamedTemporaryFile(dir=directory, delete=False) as spool:
+            for chunk in content.chunks():
+                digest.update(chunk)
+                spool.write(chunk)
+        return spool.name, digest.hexdigest()
+
+
+resume_storage = ContentAddressedStorage(prefix="resumes")
@@ -0,0 +1,187 @@
+import fcntl
+import os
+
+from django.conf import settings
+from django.core.files import File
+from django.db.models import F
+from django.utils import timezone
+
+from .models import ResumeUploadSession
+
+PDF_MAGIC = b"%PDF-"
+BLOCK_SIZE = 64 * 1024
+
+
+class UploadError(Exception):
+    """Chunk rejected; ``status_code`` is the HTTP status to answer with."""
+
+    def __init__(self, message, status_code=400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class PartialFile(File):
+    """
+    Finished upload on local disk. Exposing ``temporary_file_path`` makes
+    FileSystemStorage move the file into place instead of copying it.
+    """
+
+    def __init__(self, path, name):
+        self.path = path
+        super().__init__(None, name=name)
+        self.size = os.path.getsize(path)
+
+    def temporary_file_path(self):
+        return self.path
+
+    def open(self, mode="rb"):
+        self.file = open(self.path, mode)
+        return self
+
+    def chunks(self, chunk_size=None):
+        if self.file is None:
+            self.open()
+        return super().chunks(chunk_size)
+
+
+def is_expired(session):
+    return session.created_at < timezone.now() - settings.RESUME_UPLOAD_SESSION_TTL
+
+
+def part_path(session):
+    return os.path.join(settings.RESUME_UPLOAD_TEMP_DIR, f"{session.pk}.part")
+
+
+def parse_content_range(value):
+    """'bytes <start>-<end>/<total>' -> (start, end, total)"""
+    try:
+        unit, _, spec = value.strip().partition(" ")
+        span, _, total = spec.partition("/")
+        start, _, end = span.partition("-")
+        if unit != "bytes":
+            raise ValueError(unit)
+        start, end, total = int(start), int(end), int(total)
+    except ValueError:
+        raise UploadError("Invalid Content-Range header.")
+    if not 0 <= start <= end < total:
+        raise UploadError("Invalid Content-Range header.")
+    return start, end, total
+
+
+class InvalidResume(UploadError):
+    """The uploaded data is not a PDF; the upload cannot continue."""
+
+
+def validate_pdf_header(head):
+    if not head.startswith(PDF_MAGIC):
+        raise InvalidResume("Only PDF files are allowed for the resume.")
+
+
+def write_chunk(session, stream, content_range):
+    """
+    Append the chunk read from ``stream`` to the session's partial file.
+
+    The body is copied to disk in ``BLOCK_SIZE`` blocks, so a chunk is never
+    held in memory. The first chunk must start with the PDF magic bytes.
+    Chunks must start at ``session.received``; when the connection drops
+    mid-chunk, the bytes that did arrive are kept and the client resumes
+    from the new offset. The part file is locked for the whole write; a
+    concurrent request for the same upload is rejected with 409. Returns
+    the number of bytes written.
+    """
+    start, end, total = parse_content_range(content_range)
+    if session.status != ResumeUploadSession.STATUS_UPLOADING:
+        raise UploadError("This upload is no longer accepting data.", 409)
+    if is_expired(session):
+        raise UploadError("This upload has expired.", 410)
+    if total != session.size:
+        raise UploadError("Content-Range total does not match the upload size.")
+    if start != session.received:
+        raise UploadError(f"Expected a chunk starting at byte {session.received}.", 409)
+
+    path = part_path(session)
+    if start and not os.path.exists(path):
+        ResumeUploadSession.objects.filter(pk=session.pk).update(received=0)
+        raise UploadError("Upload data was lost, restart from byte 0.", 409)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    remaining = end - start + 1
+    written = 0
+    # Opened without truncating: a retry must not clobber the part file
+    # while the request it retries is still streaming into it
+    with open(os.open(path, os.O_RDWR | os.O_CREAT, 0o600), "r+b") as part:
+        try:
+            fcntl.flock(part, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            raise UploadError("Another request is writing to this upload.", 409)
+        # The previous holder of the lock may have moved the offset
+        received = (
+            ResumeUploadSession.objects.filter(pk=session.pk)
+            .values_list("received", flat=True)
+            .get()
+        )
+        if start != received:
+            raise UploadError(f"Expected a chunk starting at byte {received}.", 409)
+
+        # Bytes past the offset are left over from a dropped request
+        part.truncate(start)
+        head = part.read(start) if start < len(PDF_MAGIC) else None
+        part.seek(start)
+        while remaining:
+            try:
+                block = stream.read(min(BLOCK_SIZE, remaining))
+            except OSError:
+                # Client went away, keep what arrived so far
+                break
+            if not block:
+                break
+            if head is not None:
+                head += block[: len(PDF_MAGIC) - len(head)]
+                if len(head) == len(PDF_MAGIC):
+                    # Checked before anything past the header reaches the disk
+                    validate_pdf_header(head)
+                    head = None
+            part.write(block)
+            written += len(block)
+            remaining -= len(block)
+        if head is not None and start + written == session.size:
+            validate_pdf_header(head)
+        part.flush()
+
+        # Moved while the lock is held, so the next writer sees the new offset
+        updated = ResumeUploadSession.objects.filter(
+            pk=session.pk, received=start, status=ResumeUploadSession.STATUS_UPLOADING
+        ).update(received=F("received") + written)
+    if not updated:
+        raise UploadError("Another request wrote to this upload.", 409)
+    session.received = start + written
+    if session.received == session.size:
+        session.status = ResumeUploadSession.STATUS_COMPLETED
+        session.save(update_fields=["status", "updated_at"])
+    return written
+
+
+def fail(session):
+    session.status = ResumeUploadSession.STATUS_FAILED
+    session.save(update_fields=["status", "updated_at"])
+    discard(session)
+
+
+def discard(session):
+    try:
+        os.remove(part_path(session))
+    except FileNotFoundError:
+        pass
+
+
+def attach(session, profile):
+    """Move the finished upload into ``profile.resume_file`` and save it"""
+    profile.resume_file.save(
+        session.filename,
+        PartialFile(part_path(session), session.filename),
+        save=False,
+    )
+    profile.save(update_fields=["resume_file", "updated_at"])
+    # Left behind when the storage already had the same content
+    discard(session)
+    session.delete()
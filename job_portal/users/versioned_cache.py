@@ -0,0 +1,67 @@
+import threading
+
+from django.core.cache import cache
+
+
+def bump_version(key):
+    """Increment the version counter at ``key`` and return the new version"""
+    if cache.add(key, 1, timeout=None):
+        return 1
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # Evicted between add() and incr()
+        cache.set(key, 1, timeout=None)
+        return 1
+
+
+class VersionedCache:
+    """
+    In-process value built from the database, such as a snapshot or an
+    index, kept current through a version counter in the shared cache.
+
+    Subclasses set ``cache_key`` and implement ``build(version)``, which
+    returns the value with a ``version`` attribute. ``invalidate()`` drops
+    the local value and bumps the version, so every process rebuilds on its
+    next ``get()``; while the value is current a read costs one cache
+    lookup. The counter needs a cache with an atomic ``incr`` shared by all
+    processes (see the users.W001 check).
+    """
+
+    cache_key = None
+
+    def __init__(self):
+        self._value = None
+        self._lock = threading.Lock()
+
+    def build(self, version):
+        raise NotImplementedError
+
+    def version(self):
+        """Version shared by all processes, None until the first write"""
+        return cache.get(self.cache_key)
+
+    def is_current(self, value, version):
+        return value is not None and value.version == version
+
+    def get(self, is_current=None):
+        """The local value, rebuilt unless ``is_current(value, version)``"""
+        is_current = is_current or self.is_current
+        version = self.version()
+        value = self._value
+        if is_current(value, version):
+            return value
+        with self._lock:
+            value = self._value
+            if not is_current(value, version):
+                value = self.build(version)
+                self._value = value
+        return value
+
+    def bump_version(self):
+        """Increment the shared version and return the new one"""
+        return bump_version(self.cache_key)
+
+    def invalidate(self):
+        self._value = None
+        self.bump_version()